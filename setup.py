@@ -45,5 +45,5 @@ setup(
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: Implementation :: CPython",
     ],
-    entry_points={"console_scripts": ["{}=in3cli.main:cli".format(get_exec_name())]},
+    entry_points={"console_scripts": ["{}=in3cli.main:main".format(get_exec_name())]},
 )
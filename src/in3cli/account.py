@@ -28,6 +28,18 @@ class In3Account:
         stored_value = self._account[ConfigAccessor.IGNORE_SSL_ERRORS_KEY]
         return to_bool(stored_value)
 
+    @property
+    def retries(self):
+        """How often to retry failed requests, or None if not set."""
+        value = self._account.get(ConfigAccessor.RETRIES_KEY)
+        return int(value) if value else None
+
+    @property
+    def retry_deadline(self):
+        """Seconds within which to stop retrying a request, or None if not set."""
+        value = self._account.get(ConfigAccessor.RETRY_DEADLINE_KEY)
+        return float(value) if value else None
+
     @property
     def has_stored_private_key(self):
         key = self._get_stored_key()
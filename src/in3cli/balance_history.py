@@ -0,0 +1,62 @@
+"""Samples the balance of an address over a range of blocks, either every so many blocks or, by
+bisecting only the steps across which the balance differs, at exactly the blocks where it moved."""
+from in3cli.parallel import map_ordered
+
+
+def get_sample_block_nums(from_block, to_block, step):
+    """Yields every `step`th block number from `from_block`, always ending with `to_block`."""
+    block_nums = range(from_block, to_block + 1, step)
+    yield from block_nums
+    if block_nums[-1] != to_block:
+        yield to_block
+
+
+def iter_samples(get_balance, from_block, to_block, step, workers):
+    """Yields `(block number, balance)` for every sampled block, in order. `get_balance` takes a
+    block number and is called from `workers` threads."""
+    block_nums = get_sample_block_nums(from_block, to_block, step)
+    return map_ordered(lambda block_num: (block_num, get_balance(block_num)), block_nums, workers)
+
+
+def iter_changes(get_balance, from_block, to_block, step, workers):
+    """Yields `(block number, balance)` for `from_block` and then for every block whose balance
+    differs from the block before it, in order.
+
+    The steps are sampled concurrently, and only steps whose ends differ are bisected, several at
+    a time, which takes about `log2(step)` requests per change. A balance that moves and moves back
+    within a single step is missed, so pick a step shorter than such round trips take.
+    """
+    samples = iter_samples(get_balance, from_block, to_block, step, workers)
+    first = next(samples)
+    yield first
+
+    def find_changes(changed_step):
+        return _bisect(get_balance, *changed_step)
+
+    for changes in map_ordered(find_changes, _get_changed_steps(first, samples), workers):
+        yield from changes
+
+
+def _get_changed_steps(first, samples):
+    previous = first
+    for sample in samples:
+        if sample[1] != previous[1]:
+            yield previous, sample
+        previous = sample
+
+
+def _bisect(get_balance, low, high):
+    """Returns the changes after the `low` sample up to and including the `high` one, whose
+    balances differ."""
+    low_block_num, low_balance = low
+    high_block_num, high_balance = high
+    if high_block_num - low_block_num == 1:
+        return [high]
+    mid_block_num = (low_block_num + high_block_num) // 2
+    mid = (mid_block_num, get_balance(mid_block_num))
+    changes = []
+    if mid[1] != low_balance:
+        changes.extend(_bisect(get_balance, low, mid))
+    if mid[1] != high_balance:
+        changes.extend(_bisect(get_balance, mid, high))
+    return changes
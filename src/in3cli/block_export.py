@@ -0,0 +1,304 @@
+"""Exports ranges of blocks, or their transactions, as rows. Large ranges can be sharded across
+processes, each with its own clients, that either get merged in order or listed in a manifest."""
+import json
+import math
+import os
+import shutil
+import tempfile
+from collections import namedtuple
+
+import in3cli.model as model
+from in3cli.export import Compression
+from in3cli.export import RowWriter
+from in3cli.export import STDOUT
+from in3cli.export import open_output
+from in3cli.parallel import map_ordered
+from in3cli.parallel import thread_local
+from in3cli.retry import Retrier
+from in3cli.util import write_file_atomically
+
+# Each process gets several shards so that a slow shard does not leave the others idle.
+SHARDS_PER_PROCESS = 4
+_FORMAT_EXTENSIONS = {"NDJSON": ".ndjson", "CSV": ".csv"}
+_COMPRESSION_EXTENSIONS = {
+    Compression.NONE: "",
+    Compression.GZIP: ".gz",
+    Compression.BZ2: ".bz2",
+    Compression.XZ: ".xz",
+}
+
+ShardTask = namedtuple(
+    "ShardTask",
+    [
+        "account_name",
+        "chain",
+        "from_block",
+        "to_block",
+        "txs",
+        "export_format",
+        "path",
+        "compression",
+        "header",
+        "workers",
+        "batch_size",
+        "retry_policy",
+        "use_header_index",
+    ],
+)
+
+
+def get_fieldnames(txs):
+    return model.TX_EXPORT_FIELDS if txs else model.BLOCK_EXPORT_FIELDS
+
+
+def iter_rows(
+    get_client,
+    from_block,
+    to_block,
+    txs,
+    workers,
+    batch_size,
+    retrier=None,
+    header_index=None,
+    chain=None,
+):
+    """Yields the rows for the blocks in the range in order, fetching blocks on `workers` threads.
+    `get_client` returns the eth client to use on the calling thread. With a `header_index`, block
+    rows come from it where it has the block, and fetched blocks are added to it."""
+    retrier = retrier or Retrier()
+
+    def fetch_rows(block_num):
+        if header_index is not None and not txs:
+            header = header_index.get(chain, block_num)
+            if header is not None:
+                return [model.create_header_export_dict(header)]
+        client = get_client()
+        block = retrier.run(
+            lambda: client.block_by_number(block_num, get_full_block=txs),
+            "block {}".format(block_num),
+        )
+        if header_index is not None:
+            header_index.put(chain, block)
+        if txs:
+            return [model.create_tx_export_dict(tx, block.number) for tx in block.transactions]
+        return [model.create_block_export_dict(block)]
+
+    block_nums = range(from_block, to_block + 1)
+    for block_rows in map_ordered(fetch_rows, block_nums, workers, batch_size):
+        yield from block_rows
+
+
+def split_range(from_block, to_block, shard_count, min_shard_size=1):
+    """Splits the range into at most `shard_count` contiguous `(from, to)` ranges."""
+    total = to_block - from_block + 1
+    shard_size = max(min_shard_size, math.ceil(total / max(1, shard_count)))
+    return [
+        (start, min(start + shard_size - 1, to_block))
+        for start in range(from_block, to_block + 1, shard_size)
+    ]
+
+
+def get_shard_path(output_path, index, export_format, compression):
+    base = output_path
+    if base.endswith(".json"):
+        base = base[: -len(".json")]
+    return "{}.part-{:05d}{}{}".format(
+        base,
+        index,
+        _FORMAT_EXTENSIONS[export_format.upper()],
+        _COMPRESSION_EXTENSIONS[compression],
+    )
+
+
+def export_shard(task):
+    """Exports one shard to its own file and returns the number of rows and of retries. Runs in a
+    worker process, so it creates its own clients."""
+    create_client = _get_client_factory(task.account_name, task.chain)
+    get_client = thread_local(lambda: create_client().eth)
+    retrier = Retrier(task.retry_policy)
+    header_index = _open_header_index() if task.use_header_index else None
+    rows = iter_rows(
+        get_client,
+        task.from_block,
+        task.to_block,
+        task.txs,
+        task.workers,
+        task.batch_size,
+        retrier,
+        header_index,
+        task.chain,
+    )
+    fieldnames = get_fieldnames(task.txs)
+    try:
+        with open_output(task.path, task.compression) as stream:
+            writer = RowWriter(stream, task.export_format, fieldnames, header=task.header)
+            return writer.write_all(rows), retrier.retries
+    finally:
+        if header_index is not None:
+            header_index.close()
+
+
+def export_sharded(
+    account_name,
+    chain,
+    from_block,
+    to_block,
+    txs,
+    export_format,
+    output_path,
+    compression,
+    processes,
+    workers,
+    batch_size,
+    manifest=False,
+    retrier=None,
+    use_header_index=False,
+):
+    """Exports the range with a pool of `processes` worker processes and returns the number of
+    rows.
+
+    Without `manifest`, shards are written uncompressed to a temporary directory and merged into
+    the output in block order as soon as each one is done. With `manifest`, every shard is a
+    complete file of its own next to `output_path`, which becomes a JSON manifest of them.
+    Retries in the workers are added to `retrier`, whose policy they use. With
+    `use_header_index`, the workers read and add to the header index.
+    """
+    retrier = retrier or Retrier()
+    ranges = split_range(from_block, to_block, processes * SHARDS_PER_PROCESS, batch_size)
+    if manifest:
+        return _export_with_manifest(
+            account_name,
+            chain,
+            ranges,
+            txs,
+            export_format,
+            output_path,
+            compression,
+            processes,
+            workers,
+            batch_size,
+            retrier,
+            use_header_index,
+        )
+
+    shard_dir = tempfile.mkdtemp(prefix=".in3-export-", dir=_get_shard_parent_dir(output_path))
+    try:
+        tasks = [
+            ShardTask(
+                account_name,
+                chain,
+                start,
+                end,
+                txs,
+                export_format,
+                os.path.join(shard_dir, "part-{:05d}".format(index)),
+                Compression.NONE,
+                False,
+                workers,
+                batch_size,
+                retrier.policy,
+                use_header_index,
+            )
+            for index, (start, end) in enumerate(ranges)
+        ]
+        row_count = 0
+        with open_output(output_path, compression) as stream:
+            RowWriter(stream, export_format, get_fieldnames(txs))
+            with _create_pool(processes) as pool:
+                for task, result in zip(tasks, pool.imap(export_shard, tasks)):
+                    with open(task.path, encoding="utf-8", newline="") as shard:
+                        shutil.copyfileobj(shard, stream)
+                    os.remove(task.path)
+                    row_count += result[0]
+                    retrier.add_retries(result[1])
+        return row_count
+    finally:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+
+
+def _export_with_manifest(
+    account_name,
+    chain,
+    ranges,
+    txs,
+    export_format,
+    output_path,
+    compression,
+    processes,
+    workers,
+    batch_size,
+    retrier,
+    use_header_index,
+):
+    tasks = [
+        ShardTask(
+            account_name,
+            chain,
+            start,
+            end,
+            txs,
+            export_format,
+            get_shard_path(output_path, index, export_format, compression),
+            compression,
+            True,
+            workers,
+            batch_size,
+            retrier.policy,
+            use_header_index,
+        )
+        for index, (start, end) in enumerate(ranges)
+    ]
+    with _create_pool(processes) as pool:
+        results = list(pool.imap(export_shard, tasks))
+    row_counts = [row_count for row_count, _ in results]
+    retrier.add_retries(sum(retries for _, retries in results))
+    data = {
+        "format": export_format.upper(),
+        "compression": compression,
+        "txs": txs,
+        "from_block": tasks[0].from_block,
+        "to_block": tasks[-1].to_block,
+        "fieldnames": list(get_fieldnames(txs)),
+        "shards": [
+            {
+                "path": os.path.basename(task.path),
+                "from_block": task.from_block,
+                "to_block": task.to_block,
+                "rows": row_count,
+            }
+            for task, row_count in zip(tasks, row_counts)
+        ],
+    }
+    write_file_atomically(output_path, json.dumps(data, indent=4))
+    return sum(row_counts)
+
+
+def _get_shard_parent_dir(output_path):
+    if output_path == STDOUT:
+        return None
+    return os.path.dirname(os.path.abspath(output_path))
+
+
+def _create_pool(processes):
+    import multiprocessing
+
+    # Spawned rather than forked workers, since forking a process that has live clients is unsafe.
+    return multiprocessing.get_context("spawn").Pool(processes)
+
+
+def _open_header_index():
+    from in3cli.header_index import HeaderIndex
+
+    try:
+        return HeaderIndex()
+    except OSError:
+        return None
+
+
+def _get_client_factory(account_name, chain):
+    from in3cli.options import CliState
+
+    state = CliState()
+    state.account_name = account_name
+    state.chain = chain
+    return state.create_client
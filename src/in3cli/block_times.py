@@ -0,0 +1,142 @@
+"""Finds the block closest to a point in time, with an interpolation search over block timestamps.
+
+Every final block number and timestamp the search learns goes into a per-chain index under
+~/.in3cli/block_times, so later searches start from a tight bracket around the time and usually
+need only one or two more requests.
+"""
+import bisect
+import json
+import os
+
+from in3cli.chain_cache import DEFAULT_FINALITY_CONFIRMATIONS
+from in3cli.chain_cache import FINALITY_CONFIRMATIONS
+from in3cli.util import get_user_project_path
+from in3cli.util import write_file_atomically
+
+
+def get_index_path(chain):
+    return os.path.join(get_user_project_path("block_times"), "{}.json".format(chain.lower()))
+
+
+class BlockTimeIndex:
+    """Final block numbers and their timestamps, sorted by number. Block timestamps only ever
+    increase, so the timestamps are sorted too."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.numbers = []
+        self.timestamps = []
+        self._added = False
+
+    @classmethod
+    def load(cls, chain):
+        index = cls(get_index_path(chain))
+        index._merge(index._read())
+        return index
+
+    def add(self, block_num, timestamp):
+        if self._merge([(block_num, timestamp)]):
+            self._added = True
+
+    def find_bracket(self, timestamp):
+        """Returns the known `(number, timestamp)` entries closest to the timestamp, at or before it
+        and after it. Either is None if there is no such entry."""
+        pos = bisect.bisect_right(self.timestamps, timestamp)
+        before = (self.numbers[pos - 1], self.timestamps[pos - 1]) if pos else None
+        after = (self.numbers[pos], self.timestamps[pos]) if pos < len(self.numbers) else None
+        return before, after
+
+    def save(self):
+        """Writes the index if anything was added, merged with what other processes saved since
+        it was loaded."""
+        if not self._added or self.path is None:
+            return
+        self._merge(self._read())
+        write_file_atomically(self.path, json.dumps(list(zip(self.numbers, self.timestamps))))
+        self._added = False
+
+    def _read(self):
+        if self.path is None:
+            return []
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return [(int(number), int(timestamp)) for number, timestamp in json.load(file)]
+        except (OSError, ValueError, TypeError):
+            return []
+
+    def _merge(self, entries):
+        """Adds the entries that are not in the index yet, and returns whether there were any."""
+        added = False
+        for block_num, timestamp in entries:
+            pos = bisect.bisect_left(self.numbers, block_num)
+            if pos < len(self.numbers) and self.numbers[pos] == block_num:
+                continue
+            self.numbers.insert(pos, block_num)
+            self.timestamps.insert(pos, timestamp)
+            added = True
+        return added
+
+
+class BlockTimeSearch:
+    """Searches for the block closest to a timestamp. `get_timestamp` takes a block number and
+    `get_head_block_num` returns the latest block number; each is a request to the node."""
+
+    def __init__(self, get_timestamp, get_head_block_num, index=None, chain=None):
+        self.get_timestamp = get_timestamp
+        self.get_head_block_num = get_head_block_num
+        self.index = index or BlockTimeIndex()
+        self.confirmations = FINALITY_CONFIRMATIONS.get(chain, DEFAULT_FINALITY_CONFIRMATIONS)
+        self.requests = 0
+        self._final_block_num = None
+
+    def find(self, timestamp):
+        """Returns the `(number, timestamp)` of the block whose timestamp is closest to the given
+        one, the earlier block on a tie."""
+        low, high = self._get_bracket(timestamp)
+        if timestamp < low[1]:
+            return low
+        if high is None:
+            return low
+        use_midpoint = False
+        while high[0] - low[0] > 1:
+            if use_midpoint:
+                guess = (low[0] + high[0]) // 2
+            else:
+                fraction = (timestamp - low[1]) / (high[1] - low[1])
+                guess = low[0] + int(fraction * (high[0] - low[0]))
+            guess = min(max(guess, low[0] + 1), high[0] - 1)
+            width = high[0] - low[0]
+            entry = (guess, self._fetch_timestamp(guess))
+            if entry[1] <= timestamp:
+                low = entry
+            else:
+                high = entry
+            # Block times vary, so when an interpolated guess fails to halve the bracket, bisect
+            # once to bound the number of requests.
+            use_midpoint = not use_midpoint and high[0] - low[0] > width // 2
+        return low if timestamp - low[1] <= high[1] - timestamp else high
+
+    def _get_bracket(self, timestamp):
+        """Returns a block at or before the timestamp, or the first block if there is none, and a
+        block after it, or None if the latest block is not after it either."""
+        low, high = self.index.find_bracket(timestamp)
+        if high is None:
+            head_block_num = self.get_head_block_num()
+            self.requests += 1
+            self._final_block_num = head_block_num - self.confirmations
+            if low is None or low[0] < head_block_num:
+                high = (head_block_num, self._fetch_timestamp(head_block_num))
+                if high[1] <= timestamp:
+                    return high, None
+        if low is None:
+            low = (0, self._fetch_timestamp(0))
+        return low, high
+
+    def _fetch_timestamp(self, block_num):
+        timestamp = self.get_timestamp(block_num)
+        self.requests += 1
+        # Without the head, the search stays below a known final block, so every block it sees is
+        # final too.
+        if self._final_block_num is None or block_num <= self._final_block_num:
+            self.index.add(block_num, timestamp)
+        return timestamp
@@ -0,0 +1,428 @@
+"""A local SQLite cache of blocks and transactions under ~/.in3cli/cache.
+
+A block's content never changes for its hash, so blocks are always served by hash. Lookups by block
+number, and transactions (whose block can change in a reorg), are only served from final entries,
+meaning blocks with at least the chain's `FINALITY_CONFIRMATIONS` on top of them. Newer entries are
+kept as provisional, and a block whose parent hash does not link up with its cached neighbours
+evicts the provisional fork it replaced.
+"""
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from in3cli.enums import Chain
+from in3cli.util import get_user_project_path
+
+DEFAULT_MAX_SIZE_MB = 256
+# The number of blocks on top of a block after which it is treated as final. The proof-of-authority
+# test chains and the Energy Web Chain reorg far less deeply than mainnet.
+FINALITY_CONFIRMATIONS = {Chain.MAINNET: 64, Chain.GOERLI: 30, Chain.KOVAN: 20, Chain.EWC: 20}
+DEFAULT_FINALITY_CONFIRMATIONS = 64
+_DB_FILE_NAME = "chain.db"
+# Bump when the schema changes. Older caches are dropped rather than migrated.
+_SCHEMA_VERSION = 3
+# After going over the maximum size, evict down to this fraction of it so that eviction does not
+# run on every insert.
+_EVICT_TO_FRACTION = 0.9
+# The number of least recently used entries looked up at a time while evicting.
+_EVICT_BATCH_SIZE = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    chain TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    parent_hash TEXT,
+    full INTEGER NOT NULL,
+    final INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (chain, hash)
+);
+CREATE INDEX IF NOT EXISTS blocks_by_number ON blocks (chain, number);
+CREATE INDEX IF NOT EXISTS blocks_by_accessed ON blocks (accessed);
+CREATE TABLE IF NOT EXISTS transactions (
+    chain TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    block_hash TEXT,
+    final INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (chain, hash)
+);
+CREATE INDEX IF NOT EXISTS transactions_by_block ON transactions (chain, block_hash);
+CREATE INDEX IF NOT EXISTS transactions_by_accessed ON transactions (accessed);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('size', 0);
+"""
+# Keeps the total size of the entries in `meta`, so that it never needs to be summed up. Triggers
+# run in the same transaction as the change, so the size stays right with many processes writing.
+_SIZE_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS {table}_size_insert AFTER INSERT ON {table} BEGIN
+    UPDATE meta SET value = value + NEW.size WHERE key = 'size';
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_size_delete AFTER DELETE ON {table} BEGIN
+    UPDATE meta SET value = value - OLD.size WHERE key = 'size';
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_size_update AFTER UPDATE OF size ON {table} BEGIN
+    UPDATE meta SET value = value - OLD.size + NEW.size WHERE key = 'size';
+END;
+"""
+
+
+def _skip_when_locked(method):
+    """Treats a database that another process keeps locked, or that fails otherwise while in use,
+    as a cache miss or a skipped write, since the cache only saves requests. The rollback happens
+    under the same lock as the failed call, so it cannot undo another thread's transaction."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            try:
+                return method(self, *args, **kwargs)
+            except sqlite3.OperationalError:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                return None
+
+    return wrapper
+
+
+def get_cache_path():
+    return os.path.join(get_user_project_path("cache"), _DB_FILE_NAME)
+
+
+def get_max_size_mb():
+    from in3cli.config import config_accessor
+
+    max_size_mb = config_accessor.cache_max_size_mb
+    return DEFAULT_MAX_SIZE_MB if max_size_mb is None else max_size_mb
+
+
+class ChainCache:
+    """Stores blocks and transactions keyed by chain and hash, and blocks by number too.
+
+    Least recently used entries are evicted once the cache grows over `max_size_mb`. A single
+    instance may be shared between threads.
+    """
+
+    def __init__(self, path=None, max_size_mb=None):
+        self.path = path or get_cache_path()
+        max_size_mb = get_max_size_mb() if max_size_mb is None else max_size_mb
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        # Re-entrant, since `_skip_when_locked` holds it around methods that take it too.
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # With WAL, this only skips the sync on each commit, such as recording a cache hit, and may
+        # lose the last commits on power loss but never corrupts the cache.
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Rows replaced by INSERT OR REPLACE only fire the delete triggers with this on.
+        self._conn.execute("PRAGMA recursive_triggers = ON")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS blocks; DROP TABLE IF EXISTS transactions; "
+                "DROP TABLE IF EXISTS meta;"
+            )
+            self._conn.execute("PRAGMA user_version = {}".format(_SCHEMA_VERSION))
+        self._conn.executescript(_SCHEMA)
+        for table in ("blocks", "transactions"):
+            self._conn.executescript(_SIZE_TRIGGERS.format(table=table))
+
+    def close(self):
+        self._conn.close()
+
+    def is_final(self, chain, block_num, head_block_num):
+        """Whether the block has enough confirmations on the chain to never change."""
+        confirmations = FINALITY_CONFIRMATIONS.get(chain, DEFAULT_FINALITY_CONFIRMATIONS)
+        return block_num <= head_block_num - confirmations
+
+    @_skip_when_locked
+    def get_block_by_hash(self, chain, block_hash, full=False):
+        return self._get_block("hash = ?", (chain, block_hash), full)
+
+    @_skip_when_locked
+    def get_block_by_number(self, chain, block_num, full=False):
+        """Returns the cached block for the number, if it was final when cached."""
+        return self._get_block("number = ? AND final = 1", (chain, block_num), full)
+
+    @_skip_when_locked
+    def get_block_number(self, chain, block_hash):
+        """Returns the number of the cached block with the hash, final or not, without loading the
+        block."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT number FROM blocks WHERE chain = ? AND hash = ?", (chain, block_hash)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    @_skip_when_locked
+    def put_block(self, chain, block, full, final, evict_forks=True):
+        """Caches the block, and its transactions if it is a full block.
+
+        Provisional blocks that do not link up with the block by parent hash are on a fork that the
+        block replaced, so they are evicted along with the provisional blocks above them that do
+        not descend from the block. Final blocks are never evicted for a fork, and a provisional
+        block that conflicts with one is on the losing fork itself, so it evicts nothing. Pass
+        `evict_forks=False` for blocks that may not be on the canonical chain at all, such as
+        blocks fetched by hash. Cached ancestors of a final block are final too.
+        """
+        data = _serialize(block)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT full, final FROM blocks WHERE chain = ? AND hash = ?", (chain, block.hash)
+            ).fetchone()
+            if row:
+                # Never lose transactions or finality that an earlier insert already recorded.
+                full = full or bool(row[0])
+                final = final or bool(row[1])
+                if not full or row[0]:
+                    data = None
+            self._conn.execute("BEGIN")
+            if evict_forks:
+                self._evict_forks(chain, block, final)
+            if data is None:
+                self._conn.execute(
+                    "UPDATE blocks SET final = ?, accessed = ? WHERE chain = ? AND hash = ?",
+                    (int(final), now, chain, block.hash),
+                )
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        chain,
+                        block.hash,
+                        block.number,
+                        block.parentHash,
+                        int(full),
+                        int(final),
+                        data,
+                        len(data),
+                        now,
+                    ),
+                )
+            if full:
+                for tx in block.transactions:
+                    if not isinstance(tx, str):
+                        self._put_transaction(chain, tx, final, now)
+            if final:
+                # The transactions of a provisional block that was already cached become final too.
+                self._conn.execute(
+                    "UPDATE transactions SET final = 1 WHERE chain = ? AND block_hash = ?",
+                    (chain, block.hash),
+                )
+                self._finalize_ancestors(chain, block)
+            self._conn.execute("COMMIT")
+            self._evict_if_needed()
+
+    @_skip_when_locked
+    def get_transaction(self, chain, tx_hash):
+        """Returns the cached transaction, if its block was final when cached."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM transactions WHERE chain = ? AND hash = ? AND final = 1",
+                (chain, tx_hash),
+            ).fetchone()
+            if row is None:
+                return None
+            self._touch("transactions", chain, tx_hash)
+        return _deserialize_transaction(json.loads(row[0]))
+
+    @_skip_when_locked
+    def put_transaction(self, chain, tx, final):
+        with self._lock:
+            self._put_transaction(chain, tx, final, time.time())
+            self._evict_if_needed()
+
+    def get_stats(self):
+        """Returns the number of blocks, provisional blocks and transactions and their size in
+        bytes, per chain."""
+        stats = {}
+        with self._lock:
+            for table in ("blocks", "transactions"):
+                rows = self._conn.execute(
+                    "SELECT chain, COUNT(*), COUNT(*) - SUM(final), COALESCE(SUM(size), 0) "
+                    "FROM {} GROUP BY chain".format(table)
+                )
+                for chain, count, provisional, size in rows:
+                    chain_stats = stats.setdefault(
+                        chain, {"blocks": 0, "provisional": 0, "transactions": 0, "size": 0}
+                    )
+                    chain_stats[table] = count
+                    chain_stats["size"] += size
+                    if table == "blocks":
+                        chain_stats["provisional"] = provisional
+        return stats
+
+    def clear(self, chain=None):
+        with self._lock:
+            for table in ("blocks", "transactions"):
+                if chain is None:
+                    self._conn.execute("DELETE FROM {}".format(table))
+                else:
+                    self._conn.execute("DELETE FROM {} WHERE chain = ?".format(table), (chain,))
+            self._conn.execute("VACUUM")
+
+    def _get_block(self, where, params, full):
+        query = "SELECT hash, full, data FROM blocks WHERE chain = ? AND {}".format(where)
+        if full:
+            query += " AND full = 1"
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            self._touch("blocks", params[0], row[0])
+        return _deserialize_block(json.loads(row[2]))
+
+    def _evict_forks(self, chain, block, final):
+        """Evicts the provisional blocks on a fork that conflicts with the block, from the lowest
+        conflicting one up, and their transactions."""
+        if not final and self._find_conflict(chain, block, "final = 1") is not None:
+            return
+        conflict = self._find_conflict(chain, block, "final = 0")
+        if conflict is None:
+            return
+        rows = self._conn.execute(
+            "SELECT hash, number, parent_hash FROM blocks "
+            "WHERE chain = ? AND number >= ? AND final = 0 ORDER BY number",
+            (chain, conflict),
+        )
+        descendants = {block.hash}
+        evicted = []
+        for entry_hash, number, parent_hash in rows.fetchall():
+            if entry_hash in descendants:
+                continue
+            if number > block.number and parent_hash in descendants:
+                descendants.add(entry_hash)
+            else:
+                evicted.append((chain, entry_hash))
+        self._conn.executemany(
+            "DELETE FROM transactions WHERE chain = ? AND block_hash = ?", evicted
+        )
+        self._conn.executemany("DELETE FROM blocks WHERE chain = ? AND hash = ?", evicted)
+
+    def _find_conflict(self, chain, block, where):
+        """Returns the lowest number of the cached blocks matching `where` that do not link up with
+        the block, or None if they all do."""
+        return self._conn.execute(
+            "SELECT MIN(number) FROM blocks WHERE chain = ? AND hash != ? AND {} AND ("
+            "(number = ? AND hash != ?) OR number = ? OR (number = ? AND parent_hash != ?))".format(
+                where
+            ),
+            (
+                chain,
+                block.hash,
+                block.number - 1,
+                block.parentHash,
+                block.number,
+                block.number + 1,
+                block.hash,
+            ),
+        ).fetchone()[0]
+
+    def _finalize_ancestors(self, chain, block):
+        parent_hash = block.parentHash
+        while parent_hash:
+            row = self._conn.execute(
+                "SELECT parent_hash FROM blocks WHERE chain = ? AND hash = ? AND final = 0",
+                (chain, parent_hash),
+            ).fetchone()
+            if row is None:
+                return
+            self._conn.execute(
+                "UPDATE blocks SET final = 1 WHERE chain = ? AND hash = ?", (chain, parent_hash)
+            )
+            self._conn.execute(
+                "UPDATE transactions SET final = 1 WHERE chain = ? AND block_hash = ?",
+                (chain, parent_hash),
+            )
+            parent_hash = row[0]
+
+    def _put_transaction(self, chain, tx, final, now):
+        data = _serialize(tx)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (chain, tx.hash, tx.blockHash, int(final), data, len(data), now),
+        )
+
+    def _touch(self, table, chain, entry_hash):
+        try:
+            self._conn.execute(
+                "UPDATE {} SET accessed = ? WHERE chain = ? AND hash = ?".format(table),
+                (time.time(), chain, entry_hash),
+            )
+        except sqlite3.OperationalError:
+            # Another process is writing; serving the hit matters more than its access time.
+            pass
+
+    def _get_size(self):
+        return self._conn.execute("SELECT value FROM meta WHERE key = 'size'").fetchone()[0]
+
+    def _evict_if_needed(self):
+        size = self._get_size()
+        if size <= self.max_size:
+            return
+        target = self.max_size * _EVICT_TO_FRACTION
+        self._conn.execute("BEGIN")
+        while size > target:
+            # Each table yields its least recently used entries from its index, and the oldest of
+            # both are evicted first.
+            entries = self._get_least_recently_used("blocks")
+            entries += self._get_least_recently_used("transactions")
+            entries = sorted(entries, key=lambda entry: entry[4])[:_EVICT_BATCH_SIZE]
+            if not entries:
+                break
+            for table, chain, entry_hash, entry_size, _ in entries:
+                if size <= target:
+                    break
+                self._conn.execute(
+                    "DELETE FROM {} WHERE chain = ? AND hash = ?".format(table), (chain, entry_hash)
+                )
+                size -= entry_size
+        self._conn.execute("COMMIT")
+
+    def _get_least_recently_used(self, table):
+        query = (
+            "SELECT '{0}', chain, hash, size, accessed FROM {0} ORDER BY accessed LIMIT ?".format(
+                table
+            )
+        )
+        return self._conn.execute(query, (_EVICT_BATCH_SIZE,)).fetchall()
+
+
+def _serialize(obj):
+    data = dict(obj.__dict__)
+    if "transactions" in data:
+        data["transactions"] = [
+            tx if isinstance(tx, str) else dict(tx.__dict__) for tx in data["transactions"]
+        ]
+    return json.dumps(data)
+
+
+def _restore(cls, data):
+    # Bypasses __init__ so that cached entries load the same across `in3` versions.
+    obj = cls.__new__(cls)
+    obj.__dict__.update(data)
+    return obj
+
+
+def _deserialize_block(data):
+    from in3.eth.model import Block
+
+    data["transactions"] = [
+        tx if isinstance(tx, str) else _deserialize_transaction(tx)
+        for tx in data.get("transactions") or []
+    ]
+    return _restore(Block, data)
+
+
+def _deserialize_transaction(data):
+    from in3.eth.model import Transaction
+
+    return _restore(Transaction, data)
@@ -1,27 +1,117 @@
+import time
+from collections import namedtuple
+
 import in3
+from in3cli import node_cache
+from in3cli import private_key
+
+# Seconds that a recovered signer is reused before the private key is read again, so that a key
+# changed by another process, such as in another terminal, is picked up by long-running shells and
+# daemons. Changes made in this process are picked up right away.
+ETH_ACCOUNT_TTL = 60
+
+SignedTransaction = namedtuple("SignedTransaction", ["raw", "hash"])
 
 
 class CliClient(in3.Client):
-    def __init__(self, account, chain=None):
+    def __init__(self, account, chain=None, node_list_ttl=None):
+        self._eth_account = None
+        self._eth_account_key_version = None
+        self._eth_account_expires_at = None
         self.account = account
         if account is None:
             ignore_ssl_errors = False
         else:
             chain = chain or account.chain
             ignore_ssl_errors = account.ignore_ssl_errors
-        config = in3.ClientConfig(transport_ignore_tls=ignore_ssl_errors)
+        # Start from the cached node list, if fresh, instead of fetching it from the registry.
+        registry_config = node_cache.get_registry_config(chain, node_list_ttl) if chain else None
+        config = in3.ClientConfig(
+            transport_ignore_tls=ignore_ssl_errors, in3_registry=registry_config
+        )
         self.chain = chain or account.chain
         super().__init__(chain=chain, in3_config=config)
 
+    @property
+    def account(self):
+        return self._account
+
+    @account.setter
+    def account(self, value):
+        self._account = value
+        self.clear_eth_account()
+
     @property
     def eth_account(self):
-        pkey = self.account.get_private_key()
-        recovered_account = self.recover_eth_account(pkey)
-        return recovered_account
+        """The signer for the account, recovered from its private key on first use and then kept
+        until the account or any stored private key changes, or for at most `ETH_ACCOUNT_TTL`
+        seconds, so that commands sending many transactions only read the key once."""
+        key_version = private_key.get_key_version()
+        if (
+            self._eth_account is None
+            or self._eth_account_key_version != key_version
+            or time.monotonic() >= self._eth_account_expires_at
+        ):
+            pkey = self.account.get_private_key()
+            self._eth_account = self.recover_eth_account(pkey)
+            self._eth_account_key_version = key_version
+            self._eth_account_expires_at = time.monotonic() + ETH_ACCOUNT_TTL
+        return self._eth_account
+
+    def clear_eth_account(self):
+        """Forgets the recovered signer, so that the next use reads the private key again."""
+        self._eth_account = None
+        self._eth_account_key_version = None
+        self._eth_account_expires_at = None
 
     def recover_eth_account(self, private_key):
         return self.eth.account.recover(private_key)
 
+    def sign_transaction(self, sender, transaction):
+        """Signs the transaction without sending it, filling in the fields it leaves out the way
+        `send_transaction()` does, so that its hash is known before it reaches any node. Send it
+        with `eth.account.send_raw_transaction()`.
+
+        Returns:
+            (SignedTransaction): The signed transaction, encoded, and its hash.
+        """
+        # in3 only signs as part of sending, so this makes the same calls to its runtime as
+        # `send_transaction()` does, minus the send.
+        runtime = self.eth.account._runtime
+        transaction.From = sender.address
+        runtime.set_signer_account(sender.secret)
+        unsigned = runtime.call("in3_prepareTx", transaction.serialize())
+        raw = runtime.call("in3_signTx", unsigned, sender.address)
+        return SignedTransaction(raw, runtime.call("web3_sha3", raw))
+
+
+class ClientPool:
+    """Keeps one client per account and chain warm for long-running processes, such as the
+    daemon, so that each command does not have to build a new one."""
+
+    def __init__(self):
+        self._clients = {}
+
+    def __len__(self):
+        return len(self._clients)
+
+    def get(self, account, chain, node_list_ttl=None):
+        key = _get_client_key(account, chain)
+        client = self._clients.get(key)
+        if client is None:
+            client = CliClient(account, chain, node_list_ttl)
+            self._clients[key] = client
+        return client
+
+    def clear(self):
+        self._clients.clear()
+
+
+def _get_client_key(account, chain):
+    if account is None:
+        return None, None, False, chain
+    return account.name, account.address, account.ignore_ssl_errors, chain
+
 
 def validate(client, private_key):
     client = CliClient(client)
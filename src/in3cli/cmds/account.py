@@ -1,7 +1,6 @@
 import click
 import in3cli.account as account_module
 from click import echo
-from in3cli.client import validate
 from in3cli.enums import Chain
 from in3cli.error import In3CliError
 from in3cli.options import address_option
@@ -151,6 +150,13 @@ def delete_all():
         echo("\nNo accounts exist. Nothing to delete.")
 
 
+def validate(in3account, private_key):
+    """Validates the private key with a client; `in3` is only imported when a key is set."""
+    from in3cli.client import validate as validate_with_client
+
+    return validate_with_client(in3account, private_key)
+
+
 def _prompt_for_allow_private_key_set(account_name):
     user_ans = does_user_agree(
         "Would you like to store or update your private key in keyring? (y/n): "
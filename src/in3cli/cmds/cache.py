@@ -0,0 +1,54 @@
+import click
+from in3cli.enums import Chain
+from in3cli.model import create_cache_stats_dict
+from in3cli.options import format_option
+from in3cli.output_formats import OutputFormatter
+
+chain_option = click.option(
+    "--chain",
+    "-c",
+    type=click.Choice(Chain.options(), case_sensitive=False),
+    help="Only this blockchain network. Defaults to every network.",
+)
+
+
+@click.group()
+def cache():
+    """Commands for managing the local block and transaction cache."""
+    pass
+
+
+@cache.command()
+@format_option
+def stats(format):
+    """Prints the number of cached blocks and transactions and their size, per chain."""
+    from in3cli.chain_cache import ChainCache
+
+    chain_cache = ChainCache()
+    stats_by_chain = chain_cache.get_stats()
+    if not stats_by_chain:
+        click.echo("The cache is empty.")
+        return
+    click.echo(
+        "Using {:.2f} of {:.0f} MB.".format(
+            sum(s["size"] for s in stats_by_chain.values()) / (1024 * 1024),
+            chain_cache.max_size / (1024 * 1024),
+        ),
+        err=True,
+    )
+    formatter = OutputFormatter(format)
+    formatter.echo(
+        [create_cache_stats_dict(chain, s) for chain, s in sorted(stats_by_chain.items())]
+    )
+
+
+@cache.command()
+@chain_option
+def clear(chain):
+    """Deletes cached blocks and transactions, and indexed block headers."""
+    from in3cli.chain_cache import ChainCache
+    from in3cli.header_index import HeaderIndex
+
+    ChainCache().clear(chain.lower() if chain else None)
+    HeaderIndex().clear(chain)
+    click.echo("Cleared the cache{}.".format(" for {}".format(chain) if chain else ""))
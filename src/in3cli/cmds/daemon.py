@@ -0,0 +1,47 @@
+import click
+import in3cli.daemon as daemon_module
+from click import echo
+from in3cli.error import In3CliError
+from in3cli.util import get_user_project_path
+
+
+@click.group()
+def daemon():
+    """For running commands through a long-running process that keeps clients warm."""
+    pass
+
+
+@daemon.command()
+def start():
+    """Run the daemon in the foreground until stopped. While it is running, `in3` forwards
+    read-only commands to it. Run it in the background with `&` or a process supervisor."""
+    get_user_project_path()  # Ensures the directory for the socket exists.
+    socket_path = daemon_module.get_socket_path()
+    if daemon_module.is_running(socket_path):
+        raise In3CliError("The daemon is already running.")
+    echo("Listening on {}.".format(socket_path))
+    daemon_module.Daemon(socket_path).serve()
+
+
+@daemon.command()
+def stop():
+    """Stop the running daemon."""
+    socket_path = daemon_module.get_socket_path()
+    if not daemon_module.is_running(socket_path):
+        raise In3CliError("The daemon is not running.")
+    daemon_module.send_request(socket_path, {"type": "stop"})
+    echo("The daemon has been stopped.")
+
+
+@daemon.command()
+def status():
+    """Show whether the daemon is running."""
+    status_response = daemon_module.is_running()
+    if not status_response:
+        echo("The daemon is not running.")
+        return
+    echo(
+        "The daemon is running (pid {}) with {} warm client(s) and has run {} command(s).".format(
+            status_response["pid"], status_response["clients"], status_response["commands_run"]
+        )
+    )
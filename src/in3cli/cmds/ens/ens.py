@@ -1,6 +1,4 @@
 import click
-from in3 import ClientException
-from in3.exception import EnsDomainFormatException
 from in3cli.cmds.ens.options import name_arg
 from in3cli.error import EnsNameFormatError
 from in3cli.error import EnsNameNotFoundError
@@ -16,7 +14,7 @@ from in3cli.output_formats import OutputFormatter
 def get_hash(state, name):
     """Convert the ENS name to its hashed version."""
     name = str(name)
-    address = _run_with_err_handling(name, lambda: state.client.ens_namehash(name))
+    address = _run_with_err_handling(name, lambda: state.offline_client.ens_namehash(name))
     click.echo(address)
 
 
@@ -69,6 +67,9 @@ def show_owner(state, name):
 
 
 def _run_with_err_handling(name, func):
+    from in3 import ClientException
+    from in3.exception import EnsDomainFormatException
+
     try:
         return func()
     except EnsDomainFormatException:
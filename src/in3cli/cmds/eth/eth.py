@@ -1,23 +1,211 @@
+import os
+
 import click
-import in3.eth
 import in3cli.model as model
 from in3cli.enums import BlockNum, Chain
 from in3cli.error import In3CliArgumentError
+from in3cli.error import In3CliError
+from in3cli.export import Compression
+from in3cli.export import ExportFormat
+from in3cli.export import RowWriter
+from in3cli.export import STDOUT
+from in3cli.export import get_compression
+from in3cli.export import open_output
+from in3cli.gas_stats import GasReport
+from in3cli.gas_stats import GasStats
+from in3cli.gas_stats import HISTOGRAM_BINS
+from in3cli.gas_stats import PERCENTILES
 from in3cli.options import block_num_option
+from in3cli.options import cache_option
 from in3cli.options import client_options
 from in3cli.options import format_option
-from in3cli.options import hash_arg
 from in3cli.options import hash_option
 from in3cli.options import address_option
+from in3cli.options import workers_option
+from in3cli.options import yes_option
 from in3cli.output_formats import OutputFormat
 from in3cli.output_formats import OutputFormatter
-from in3cli.util import run_with_timeout
+from in3cli.parallel import map_ordered
+from in3cli.parallel import map_unordered
+from in3cli.parallel import thread_local
+from in3cli.util import convert_date_str_to_timestamp
+from in3cli.util import does_user_agree
 from in3cli.util import eth_to_wei
+from in3cli.util import wei_to_eth
 
 
 to_option = click.option("--to", "-t", help="An Ethereum address to send ether to.", required=True)
-value_option = click.option("--value", "-v", help="The value in ether to send.", required=True, type=float)
+value_option = click.option("--value", "-v", help="The value in ether to send.", required=True)
 gas_option = click.option("--gas", "-g", help="The value in wei to put for gas.", type=float)
+from_block_option = click.option(
+    "--from",
+    "from_block",
+    required=True,
+    type=click.IntRange(min=0),
+    help="The first block number.",
+)
+to_block_option = click.option(
+    "--to",
+    "to_block",
+    type=click.IntRange(min=0),
+    help="The last block number. Defaults to the latest block.",
+)
+batch_size_option = click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=10,
+    help="The number of blocks each worker fetches at a time.",
+    show_default=True,
+)
+output_option = click.option(
+    "--output",
+    "-o",
+    default=STDOUT,
+    help="The file to write to, or - for stdout.",
+    show_default=True,
+)
+export_format_option = click.option(
+    "--format",
+    "-f",
+    type=click.Choice(ExportFormat.choices(), case_sensitive=False),
+    default=ExportFormat.NDJSON,
+    help="The format which to write the rows.",
+    show_default=True,
+)
+compression_option = click.option(
+    "--compression",
+    type=click.Choice(Compression.choices(), case_sensitive=False),
+    help="Compress the output on the fly. Defaults to what the extension of --output implies.",
+)
+txs_option = click.option(
+    "--txs", is_flag=True, help="Export the transactions of the blocks instead of the blocks."
+)
+tx_hashes_arg = click.argument("hashes", nargs=-1)
+tx_hash_file_option = click.option(
+    "--file",
+    "hash_file",
+    type=click.File("r"),
+    help="A file with transaction hashes, one per line.",
+)
+addresses_arg = click.argument("addresses", nargs=-1)
+address_file_option = click.option(
+    "--file",
+    "address_file",
+    type=click.File("r"),
+    help="A file with addresses, one per line.",
+)
+all_accounts_option = click.option(
+    "--all-accounts", is_flag=True, help="Include the addresses of all your accounts."
+)
+unordered_option = click.option(
+    "--unordered",
+    is_flag=True,
+    help="Print each transaction as soon as it is found rather than in input order.",
+)
+hashes_only_option = click.option(
+    "--hashes-only",
+    is_flag=True,
+    help="Only print the transaction hashes, which needs a much smaller block from the node.",
+)
+step_option = click.option(
+    "--step",
+    type=click.IntRange(min=1),
+    default=1000,
+    help="The number of blocks between samples.",
+    show_default=True,
+)
+changes_option = click.option(
+    "--changes",
+    is_flag=True,
+    help="Find the exact blocks where the balance changed, by bisecting the steps across which it "
+    "differs. Changes that revert within one step are missed.",
+)
+time_option = click.option(
+    "--time",
+    "-t",
+    required=True,
+    help="A Unix timestamp or an ISO 8601 date, such as 2026-01-01T00:00:00Z.",
+)
+block_count_option = click.option(
+    "--blocks",
+    "-n",
+    "block_count",
+    type=click.IntRange(min=1),
+    default=20,
+    help="The number of blocks to sample.",
+    show_default=True,
+)
+
+
+gas_report_option = click.option(
+    "--report",
+    type=click.Choice(GasReport.choices(), case_sensitive=False),
+    default=GasReport.PERCENTILES,
+    help="Gas price percentiles, a histogram of the share of the gas limit blocks used, or the "
+    "median gas price of each block.",
+    show_default=True,
+)
+scan_addresses_option = click.option(
+    "--address",
+    "-a",
+    "addresses",
+    multiple=True,
+    help="An Ethereum address to look for. May be given many times.",
+)
+chunk_size_option = click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=100,
+    help="The number of blocks each worker scans and checkpoints at a time.",
+    show_default=True,
+)
+checkpoint_option = click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False),
+    help="The checkpoint file. Defaults to one under ~/.in3cli/scans for these scan options.",
+)
+restart_option = click.option(
+    "--restart", is_flag=True, help="Ignore any checkpoint and scan the whole range again."
+)
+payments_file_option = click.option(
+    "--file",
+    "payments_file",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="A CSV or NDJSON file of payments.",
+)
+payments_format_option = click.option(
+    "--payments-format",
+    type=click.Choice(ExportFormat.choices(), case_sensitive=False),
+    help="The format of --file. Defaults to CSV for .csv files and NDJSON otherwise.",
+)
+journal_option = click.option(
+    "--journal",
+    type=click.Path(dir_okay=False),
+    help="The journal file. Defaults to --file with .journal appended.",
+)
+follow_option = click.option(
+    "--follow",
+    is_flag=True,
+    help="Keep printing new blocks as NDJSON as they appear, until interrupted.",
+)
+follow_txs_option = click.option(
+    "--txs", is_flag=True, help="With --follow, also print the transactions of each block."
+)
+processes_option = click.option(
+    "--processes",
+    "-p",
+    type=click.IntRange(min=1),
+    default=1,
+    help="The number of processes to shard the range across, each running --workers threads.",
+    show_default=True,
+)
+manifest_option = click.option(
+    "--manifest",
+    is_flag=True,
+    help="Leave every shard in its own file next to --output, which lists them, instead of "
+    "merging them.",
+)
 
 
 @click.command()
@@ -28,69 +216,442 @@ def show_gas_price(state):
     click.echo("{} Gwei".format(price))
 
 
+@click.command()
+@block_count_option
+@to_block_option
+@gas_report_option
+@workers_option
+@batch_size_option
+@client_options()
+@format_option
+def gas_stats(state, block_count, to_block, report, workers, batch_size, format):
+    """Prints gas price percentiles, a histogram of how full blocks are, or the median gas price
+    of each block, over the latest blocks or those up to `--to`. Blocks are fetched concurrently."""
+    if to_block is None:
+        to_block = _get_head_block_num(state)
+    from_block = max(0, to_block - block_count + 1)
+    get_client = thread_local(lambda: state.create_client().eth)
+    retrier = state.retrier
+
+    def fetch_block(block_num):
+        return _get_block_by_num(get_client(), block_num, True, retrier, state)
+
+    blocks = map_ordered(fetch_block, range(from_block, to_block + 1), workers, batch_size)
+    stats = GasStats()
+    formatter = OutputFormatter(format)
+    if report == GasReport.BLOCKS:
+        formatter.echo_stream(model.create_block_gas_dict(stats.add(block)) for block in blocks)
+        return
+    for block in blocks:
+        stats.add(block)
+    if report == GasReport.HISTOGRAM:
+        counts = stats.get_histogram()
+        rows = [model.create_gas_histogram_dict(i, HISTOGRAM_BINS, n) for i, n in enumerate(counts)]
+    else:
+        percentiles = stats.get_percentiles()
+        rows = [model.create_gas_percentile_dict(p, v) for p, v in zip(PERCENTILES, percentiles)]
+    formatter.echo(rows)
+
+
 @click.command()
 @hash_option
 @block_num_option
 @format_option
+@cache_option
+@follow_option
+@follow_txs_option
 @client_options()
-def show_block(state, hash, block_num, format):
-    """Prints a block. If not given any args, will print the latest block."""
-    client = state.client.eth
+def show_block(state, hash, block_num, format, follow, txs):
+    """Prints a block. If not given any args, will print the latest block.
+    With --follow, keeps printing new blocks as NDJSON as they appear, starting from --block-num
+    if given, until interrupted."""
     _handle_hash_and_block_num_incompat(hash, block_num)
-
-    if hash is not None:
-        block = client.block_by_hash(hash)
-    else:
-        block_num = _handle_block_num_param(block_num, client)
-        block = _get_block_by_num(client, block_num)
+    if txs and not follow:
+        raise In3CliError("--txs requires --follow.")
+    if follow:
+        if hash is not None:
+            raise In3CliArgumentError(["--hash", "--follow"])
+        if format.upper() != OutputFormat.TABLE:
+            # Followed blocks are always printed as NDJSON.
+            raise In3CliArgumentError(["--format", "--follow"])
+        _follow_blocks(state, block_num, txs)
+        return
     use_subset = format == OutputFormat.TABLE
+    header = None
+    if use_subset and hash is None and block_num is not None and block_num.isnumeric():
+        header = _get_indexed_header(state, int(block_num))
+    block = header or _get_block(state, hash, block_num)
     block_dict = model.create_block_dict(block, use_subset)
     formatter = OutputFormatter(format)
     formatter.echo([block_dict])
 
 
+@click.command()
+@from_block_option
+@to_block_option
+@workers_option
+@batch_size_option
+@format_option
+@client_options()
+def list_blocks(state, from_block, to_block, workers, batch_size, format):
+    """Prints the blocks in the given range, in order. Blocks are fetched concurrently."""
+    if to_block is None:
+        to_block = _get_head_block_num(state)
+    _handle_block_range(from_block, to_block)
+    get_client = thread_local(lambda: state.create_client().eth)
+    use_subset = format == OutputFormat.TABLE
+    retrier = state.retrier
+
+    def fetch_block_dict(block_num):
+        # The header index has every field of the table, but not of the other formats.
+        header = _get_indexed_header(state, block_num) if use_subset else None
+        if header is not None:
+            return model.create_block_dict(header, use_subset)
+        block = _get_block_by_num(get_client(), block_num, False, retrier, state)
+        return model.create_block_dict(block, use_subset)
+
+    block_nums = range(from_block, to_block + 1)
+    block_dicts = map_ordered(fetch_block_dict, block_nums, workers, batch_size)
+    formatter = OutputFormatter(format)
+    formatter.echo_stream(block_dicts)
+
+
+@click.command()
+@from_block_option
+@to_block_option
+@output_option
+@export_format_option
+@compression_option
+@txs_option
+@workers_option
+@batch_size_option
+@processes_option
+@manifest_option
+@client_options()
+def export_blocks(
+    state,
+    from_block,
+    to_block,
+    output,
+    format,
+    compression,
+    txs,
+    workers,
+    batch_size,
+    processes,
+    manifest,
+):
+    """Exports the blocks in the given range, or their transactions, as NDJSON or CSV.
+    Rows are written as the blocks arrive, so memory use stays flat for any range."""
+    import in3cli.block_export as block_export
+
+    if manifest and output == STDOUT:
+        raise In3CliError("--manifest requires --output to be a file.")
+    if to_block is None:
+        to_block = _get_head_block_num(state)
+    _handle_block_range(from_block, to_block)
+    compression = get_compression(output, compression)
+    if processes > 1 or manifest:
+        row_count = block_export.export_sharded(
+            state.account_name,
+            state.chain,
+            from_block,
+            to_block,
+            txs,
+            format,
+            output,
+            compression,
+            processes,
+            workers,
+            batch_size,
+            manifest,
+            state.retrier,
+            state.header_index is not None,
+        )
+    else:
+        get_client = thread_local(lambda: state.create_client().eth)
+        rows = block_export.iter_rows(
+            get_client,
+            from_block,
+            to_block,
+            txs,
+            workers,
+            batch_size,
+            state.retrier,
+            state.header_index,
+            state.chain,
+        )
+        fieldnames = block_export.get_fieldnames(txs)
+        with open_output(output, compression) as stream:
+            row_count = RowWriter(stream, format, fieldnames).write_all(rows)
+    if output != STDOUT:
+        click.echo("Exported {} rows to {}.".format(row_count, output), err=True)
+
+
 @click.command()
 @hash_option
 @block_num_option
+@hashes_only_option
+@cache_option
 @client_options()
 @format_option
-def list_txs(state, hash, block_num, format):
+def list_txs(state, hash, block_num, hashes_only, format):
     """Prints the transactions for the given block.
     If the block is not specified, uses the latest block number."""
-    client = state.client.eth
     _handle_hash_and_block_num_incompat(hash, block_num)
-    if hash is not None:
-        block = client.block_by_hash(hash, get_full_block=True)
+    block = _get_block(state, hash, block_num, get_full_block=not hashes_only)
+    if hashes_only and format == OutputFormat.TABLE:
+        for tx in block.transactions:
+            click.echo(_get_tx_hash(tx))
+        return
+    if hashes_only:
+        txs = ({"Hash": _get_tx_hash(tx)} for tx in block.transactions)
     else:
-        block_num = _handle_block_num_param(block_num, client)
-        block = _get_block_by_num(client, block_num)
+        txs = (model.create_tx_dict(tx) for tx in block.transactions)
     formatter = OutputFormatter(format)
-    txs = [model.create_tx_dict(tx) for tx in block.transactions]
-    formatter.echo(txs)
+    formatter.echo_stream(txs)
 
 
 @click.command()
-@hash_arg
+@tx_hashes_arg
+@tx_hash_file_option
+@workers_option
+@unordered_option
+@cache_option
 @client_options()
 @format_option
-def show_tx(state, hash, format):
-    """Prints the transaction for the given hash."""
-    client = state.client.eth
-    transaction = client.transaction_by_hash(hash)
-    trans_dict = model.create_tx_dict(transaction)
+def show_tx(state, hashes, hash_file, workers, unordered, format):
+    """Prints the transactions for the given hashes. Pass `-` to read hashes from stdin, one per
+    line. Many transactions are looked up concurrently, once per hash, and failed lookups are
+    printed as rows with an error instead of stopping the run."""
+    if len(hashes) == 1 and hashes[0] != "-" and hash_file is None:
+        transaction = _get_transaction(state, hashes[0])
+        if transaction is None:
+            raise In3CliError("Transaction {} not found.".format(hashes[0]))
+        formatter = OutputFormatter(format)
+        formatter.echo([model.create_tx_dict(transaction)])
+        return
+    if not hashes and hash_file is None:
+        raise click.UsageError("Give transaction hashes, --file or - to read them from stdin.")
+
+    tx_hashes = _dedupe(_read_args(hashes, hash_file))
+    get_client = thread_local(lambda: state.create_client().eth)
+    head_block_num = [None]
+    if state.chain_cache is not None:
+        # Looked up once, for deciding whether the blocks of the transactions are final.
+        head_block_num[0] = _get_head_block_num(state)
+
+    def look_up(tx_hash):
+        try:
+            transaction = _get_transaction(state, tx_hash, get_client(), head_block_num[0])
+        except Exception as err:
+            return model.create_tx_lookup_dict(tx_hash, error=str(err) or type(err).__name__)
+        if transaction is None:
+            return model.create_tx_lookup_dict(tx_hash, error="Transaction not found.")
+        return model.create_tx_lookup_dict(tx_hash, transaction)
+
+    if unordered:
+        rows = map_unordered(look_up, tx_hashes, workers)
+    else:
+        rows = map_ordered(look_up, tx_hashes, workers)
     formatter = OutputFormatter(format)
-    formatter.echo([trans_dict])
+    formatter.echo_stream(rows)
 
 
 @click.command()
+@addresses_arg
 @address_option
+@address_file_option
+@all_accounts_option
+@block_num_option
+@workers_option
+@client_options()
+@format_option
+def show_balance(state, addresses, address, address_file, all_accounts, block_num, workers, format):
+    """Shows the balances of the given addresses, in Wei. If not given any, shows your account
+    balance. Pass `-` to read addresses from stdin, one per line. Many balances are queried
+    concurrently, all at the same block, and failed queries are printed as rows with an error."""
+    addresses = addresses + ((address,) if address else ())
+    is_single = len(addresses) <= 1 and "-" not in addresses
+    if is_single and address_file is None and not all_accounts and format == OutputFormat.TABLE:
+        client = state.client.eth
+        address = addresses[0] if addresses else state.account.address
+        balance = client.account.balance(address, _get_balance_block_num(block_num, client))
+        click.echo(balance)
+        return
+
+    targets = _dedupe(_get_balance_targets(state, addresses, address_file, all_accounts))
+    # Pinning "latest", which is also the default, to a number makes every query see the same
+    # state of the chain.
+    at_block = _get_balance_block_num(block_num or BlockNum.LATEST, state.client.eth)
+    get_client = thread_local(lambda: state.create_client().eth)
+
+    def query_balance(target):
+        target_address, account_name = target
+        try:
+            client = get_client()
+            balance = state.retrier.run(
+                lambda: client.account.balance(target_address, at_block),
+                "the balance of {}".format(target_address),
+            )
+        except Exception as err:
+            return model.create_balance_dict(
+                target_address, account_name=account_name, error=str(err) or type(err).__name__
+            )
+        return model.create_balance_dict(target_address, balance, at_block, account_name)
+
+    rows = map_ordered(query_balance, targets, workers)
+    formatter = OutputFormatter(format)
+    formatter.echo_stream(rows)
+
+
+@click.command()
+@time_option
 @client_options()
-def show_balance(state, address=None):
-    """Shows the balance for the given address. If not given address, shows your account balance."""
+@format_option
+def block_at(state, time, format):
+    """Prints the block closest in time to the given Unix timestamp or ISO 8601 date, such as
+    2026-01-01T00:00:00Z. Dates without an offset are in UTC."""
+    from in3cli.block_times import BlockTimeIndex
+    from in3cli.block_times import BlockTimeSearch
+
+    try:
+        timestamp = convert_date_str_to_timestamp(time)
+    except ValueError as err:
+        raise click.BadParameter(str(err), param_hint="--time")
     client = state.client.eth
+    retrier = state.retrier
+    header_index = state.header_index
+
+    def get_timestamp(block_num):
+        timestamp = header_index.get_timestamp(state.chain, block_num) if header_index else None
+        if timestamp is None:
+            timestamp = _get_block_by_num(client, block_num, False, retrier, state).timestamp
+        return timestamp
+
+    index = BlockTimeIndex.load(state.chain)
+    search = BlockTimeSearch(
+        get_timestamp, lambda: _get_head_block_num(state, client), index, state.chain
+    )
+    try:
+        block_num, block_timestamp = search.find(timestamp)
+    finally:
+        index.save()
+    formatter = OutputFormatter(format)
+    formatter.echo([model.create_block_at_dict(block_num, block_timestamp)])
+
+
+@click.command()
+@address_option
+@from_block_option
+@to_block_option
+@step_option
+@changes_option
+@workers_option
+@output_option
+@export_format_option
+@client_options()
+def balance_history(state, address, from_block, to_block, step, changes, workers, output, format):
+    """Writes the balance of an address, in Wei, every `--step` blocks in the given range as
+    NDJSON or CSV. If not given an address, uses your account's. With `--changes`, writes the
+    exact blocks where the balance changed instead."""
+    import in3cli.balance_history as balance_history
+
     address = address or state.account.address
-    balance = client.account.balance(address)
-    click.echo(balance)
+    if to_block is None:
+        to_block = _get_head_block_num(state)
+    _handle_block_range(from_block, to_block)
+    get_client = thread_local(lambda: state.create_client().eth)
+    retrier = state.retrier
+
+    def get_balance(block_num):
+        client = get_client()
+        return retrier.run(
+            lambda: client.account.balance(address, block_num),
+            "the balance of {} at block {}".format(address, block_num),
+        )
+
+    iter_balances = balance_history.iter_changes if changes else balance_history.iter_samples
+    samples = iter_balances(get_balance, from_block, to_block, step, workers)
+    rows = _iter_balance_history_rows(samples)
+    with open_output(output, get_compression(output)) as stream:
+        row_count = RowWriter(stream, format, model.BALANCE_HISTORY_FIELDS).write_all(rows)
+    if output != STDOUT:
+        click.echo("Wrote {} rows to {}.".format(row_count, output), err=True)
+
+
+@click.command()
+@scan_addresses_option
+@address_file_option
+@from_block_option
+@to_block_option
+@chunk_size_option
+@checkpoint_option
+@restart_option
+@workers_option
+@client_options()
+@format_option
+def scan(
+    state,
+    addresses,
+    address_file,
+    from_block,
+    to_block,
+    chunk_size,
+    checkpoint,
+    restart,
+    workers,
+    format,
+):
+    """Prints every transaction in the given range from or to any of the given addresses. Chunks of
+    blocks are scanned concurrently. With the CSV or JSON format, each chunk is recorded in a
+    checkpoint file once its transactions are printed, so running the same scan again after an
+    interruption continues where it stopped. Tables are only printed at the end, so they are not
+    checkpointed."""
+    import in3cli.scan as scan_module
+
+    address_set = scan_module.AddressSet(_read_args(addresses, address_file))
+    if not address_set:
+        raise click.UsageError("Give at least one address with --address or --file.")
+    formatter = OutputFormatter(format)
+    is_resumable = formatter.output_format != OutputFormat.TABLE
+    if checkpoint and not is_resumable:
+        raise click.UsageError("--checkpoint needs --format CSV or JSON.")
+    # A scan up to the latest block is keyed without it, so that running it again resumes it up
+    # to the block it first resolved to.
+    scan_key = scan_module.get_scan_key(state.chain, address_set, from_block, to_block, chunk_size)
+    scan_checkpoint = None
+    if is_resumable:
+        checkpoint_path = checkpoint or scan_module.get_checkpoint_path(scan_key)
+        if restart and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        try:
+            scan_checkpoint = scan_module.Checkpoint.load(checkpoint_path, scan_key)
+        except ValueError as err:
+            raise In3CliError(str(err))
+        if scan_checkpoint.done:
+            click.echo("Resuming the scan from {}.".format(checkpoint_path), err=True)
+        if to_block is None:
+            to_block = scan_checkpoint.to_block
+    if to_block is None:
+        to_block = _get_head_block_num(state)
+        if scan_checkpoint is not None:
+            scan_checkpoint.to_block = to_block
+    _handle_block_range(from_block, to_block)
+
+    get_client = thread_local(lambda: state.create_client().eth)
+    retrier = state.retrier
+
+    def fetch_block(block_num):
+        return _get_block_by_num(get_client(), block_num, True, retrier, state)
+
+    chunks = scan_module.get_chunks(from_block, to_block, chunk_size)
+    matches = scan_module.scan(fetch_block, address_set, chunks, scan_checkpoint, workers)
+    rows = (model.create_scan_tx_dict(block, tx) for block, tx in matches)
+    # Streamed rows are written and flushed one at a time, before the next one is taken.
+    formatter.echo_stream(rows)
+    if scan_checkpoint is not None:
+        scan_checkpoint.remove()
 
 
 @click.command()
@@ -99,17 +660,170 @@ def show_balance(state, address=None):
 @gas_option
 @client_options()
 def send(state, to, value, gas=None):
+    import in3.eth
+
     etherscan_link_mask = "https://{}etherscan.io/tx/{}"
     chain = state.chain
     client = state.client.eth.account
     sender = state.client.eth_account
-    value = int(eth_to_wei(value))
+    try:
+        value = eth_to_wei(value)
+    except ValueError as err:
+        raise In3CliError(str(err))
     tx = in3.eth.NewTransaction(to=to, value=value, gasLimit=gas)
     tx_hash = client.send_transaction(sender, tx)
     chain_prefix = "{}.".format(chain.lower()) if chain != Chain.MAINNET else ""
     click.echo(etherscan_link_mask.format(chain_prefix, tx_hash))
 
 
+@click.command()
+@payments_file_option
+@payments_format_option
+@journal_option
+@workers_option
+@yes_option
+@client_options()
+@format_option
+def send_batch(state, payments_file, payments_format, journal, workers, format):
+    """Sends a payment for each row of a CSV or NDJSON file, with a `to` address, a `value` in
+    ether and an optional `gas` limit. Every payment, its nonce and the hash of its signed
+    transaction are journaled before it is sent, so running the same command after an interruption
+    sends what is left without paying anyone twice. Payments whose outcome is unknown, such as
+    sends that timed out, are looked up on the chain when the command runs again."""
+    import in3.eth
+    import in3cli.send_batch as batch
+
+    payments_format = batch.get_payments_format(payments_file, payments_format)
+    try:
+        with open(payments_file, encoding="utf-8", newline="") as file:
+            payments = batch.read_payments(file, payments_format)
+    except ValueError as err:
+        raise In3CliError(str(err))
+    journal = batch.Journal.load(journal or batch.get_journal_path(payments_file))
+    # Recovering the signer reads the private key, so it happens once for the whole batch.
+    sender = state.client.eth_account
+    account_client = state.client.eth.account
+    confirmed_nonce = account_client.transaction_count(sender.address, BlockNum.LATEST)
+    try:
+        sent, displaced = batch.reconcile(
+            journal, confirmed_nonce, lambda tx_hash: _fetch_transaction(state.client.eth, tx_hash)
+        )
+    except ValueError as err:
+        journal.close()
+        raise In3CliError(str(err))
+    if sent:
+        click.echo("{} payments were already sent.".format(len(sent)), err=True)
+    if displaced:
+        click.echo(
+            "{} payments were not sent, since other transactions used their nonces. They get new "
+            "nonces.".format(len(displaced)),
+            err=True,
+        )
+    pending_nonce = account_client.transaction_count(sender.address, BlockNum.PENDING)
+    max_journaled_nonce = journal.get_max_nonce()
+    next_nonce = pending_nonce
+    if max_journaled_nonce is not None:
+        next_nonce = max(next_nonce, max_journaled_nonce + 1)
+    try:
+        planned = batch.plan(payments, journal, batch.NonceManager(next_nonce), confirmed_nonce)
+    except ValueError as err:
+        journal.close()
+        raise In3CliError(str(err))
+    if not planned:
+        journal.close()
+        click.echo("Every payment in {} was already sent.".format(payments_file), err=True)
+        return
+    total = sum(p.payment.value for p in planned)
+    prompt = "Send {} payments of {} Eth in total from {}? (y/n): ".format(
+        len(planned), wei_to_eth(total), sender.address
+    )
+    if not does_user_agree(prompt):
+        journal.close()
+        return
+
+    for planned_payment in planned:
+        if planned_payment.is_new:
+            payment = planned_payment.payment
+            journal.write(payment, planned_payment.nonce, batch.JournalStatus.ASSIGNED)
+    get_client = thread_local(state.create_client)
+    retrier = state.retrier
+    nonce_gate = batch.NonceGate()
+
+    def send_payment(planned_payment):
+        payment, nonce, _ = planned_payment
+        if not nonce_gate.is_open(nonce):
+            # Left as journaled, so that running the command again sends it with the same nonce.
+            return model.create_payment_dict(payment, nonce, batch.JournalStatus.SKIPPED)
+        tx = in3.eth.NewTransaction(
+            to=payment.to, value=payment.value, gasLimit=payment.gas, nonce=nonce
+        )
+        client = get_client()
+        description = "payment {}".format(payment.row)
+        try:
+            signed = retrier.run(lambda: client.sign_transaction(sender, tx), description)
+        except Exception as err:
+            # Nothing reached a node yet.
+            nonce_gate.fail(nonce)
+            status = batch.JournalStatus.FAILED
+            error = str(err) or type(err).__name__
+            journal.write(payment, nonce, status, error=error)
+            return model.create_payment_dict(payment, nonce, status, error=error)
+        tx_hash = signed.hash
+        # Journaled before sending, so that running the command again can look the payment up.
+        journal.write(payment, nonce, batch.JournalStatus.ASSIGNED, tx_hash)
+        try:
+            retrier.run(lambda: client.eth.account.send_raw_transaction(signed.raw), description)
+        except Exception as err:
+            status = batch.get_failure_status(err)
+            if status == batch.JournalStatus.FAILED:
+                nonce_gate.fail(nonce)
+            error = str(err) or type(err).__name__
+            journal.write(payment, nonce, status, tx_hash, error)
+            return model.create_payment_dict(payment, nonce, status, tx_hash, error)
+        journal.write(payment, nonce, batch.JournalStatus.SENT, tx_hash)
+        return model.create_payment_dict(payment, nonce, batch.JournalStatus.SENT, tx_hash)
+
+    statuses = []
+
+    def collect_statuses(rows):
+        for row in rows:
+            statuses.append(row["Status"])
+            yield row
+
+    try:
+        rows = map_unordered(send_payment, planned, workers)
+        formatter = OutputFormatter(format)
+        formatter.echo_stream(collect_statuses(rows))
+    finally:
+        journal.close()
+    _raise_if_payments_not_sent(statuses)
+
+
+def _raise_if_payments_not_sent(statuses):
+    import in3cli.send_batch as batch
+
+    problems = []
+    failed = statuses.count(batch.JournalStatus.FAILED)
+    if failed:
+        problems.append("{} payments failed".format(failed))
+    skipped = statuses.count(batch.JournalStatus.SKIPPED)
+    if skipped:
+        problems.append("{} payments with higher nonces were not sent".format(skipped))
+    unknown = statuses.count(batch.JournalStatus.UNKNOWN)
+    if unknown:
+        problems.append("{} payments may or may not have been sent".format(unknown))
+    if problems:
+        raise In3CliError(
+            "{}. Run the same command again to reconcile them with the chain and send the rest "
+            "with the same nonces.".format("; ".join(problems))
+        )
+
+
+def _get_tx_hash(tx):
+    # Blocks fetched without their transactions only list the transaction hashes.
+    return tx if isinstance(tx, str) else tx.hash
+
+
 def _handle_block_num_param(param, client):
     if isinstance(param, str):
         if param.isnumeric():
@@ -131,9 +845,205 @@ def _handle_hash_and_block_num_incompat(hash, block_num):
         raise In3CliArgumentError(["--hash", "--block-num"])
 
 
-def _get_block_by_num(client, block_num):
-    """Fixes issue where block is not available from initial call."""
-    return run_with_timeout(lambda: client.block_by_number(block_num, get_full_block=True))
+def _handle_block_range(from_block, to_block):
+    if from_block > to_block:
+        raise In3CliError("--from ({}) must not be after --to ({}).".format(from_block, to_block))
+
+
+def _get_block_by_num(client, block_num, get_full_block=True, retrier=None, state=None):
+    """Retries, since a new block may not have reached the node yet. Pass the `state` to add the
+    block to the header index if it is final."""
+    from in3cli.retry import Retrier
+
+    retrier = retrier or Retrier()
+    block = retrier.run(
+        lambda: client.block_by_number(block_num, get_full_block=get_full_block),
+        "block {}".format(block_num),
+    )
+    if state is not None and state.header_index is not None:
+        state.header_index.put(state.chain, block)
+    return block
+
+
+def _get_head_block_num(state, client=None):
+    """Gets the latest block number, which also tells the header index which blocks are final."""
+    client = client or state.client.eth
+    head_block_num = client.block_number()
+    if state.header_index is not None:
+        state.header_index.set_head(state.chain, head_block_num)
+    return head_block_num
+
+
+def _get_indexed_header(state, block_num):
+    header_index = state.header_index
+    return header_index.get(state.chain, block_num) if header_index is not None else None
+
+
+def _follow_blocks(state, start_block_num, txs):
+    import json
+    import signal
+    from in3cli.follow import BlockFollower
+
+    client = state.client.eth
+    if start_block_num is not None:
+        start_block_num = _handle_block_num_param(start_block_num, client)
+    follower = BlockFollower(
+        client, lambda num: _get_block_by_num(client, num, txs, state.retrier), state.chain
+    )
+    # The CLI exits with an error on Ctrl-C; here it is how following is meant to stop.
+    previous_handler = signal.signal(signal.SIGINT, signal.default_int_handler)
+    try:
+        for block in follower.follow(start_block_num):
+            block_dict = model.create_block_dict(block, use_subset=False)
+            if txs:
+                block_dict["Transactions"] = [
+                    model.create_tx_export_dict(tx, block.number) for tx in block.transactions
+                ]
+            click.echo(json.dumps(block_dict))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+
+
+def _get_block(state, block_hash, block_num, get_full_block=False):
+    """Gets the block by hash, or else by number, from the local cache when it has it."""
+    client = state.client.eth
+    cache = state.chain_cache
+    if block_hash is not None:
+        return _get_block_by_hash(state, block_hash, get_full_block)
+
+    # Anything but a block number resolves to the latest block.
+    is_latest = not (isinstance(block_num, str) and block_num.isnumeric())
+    block_num = _handle_block_num_param(block_num, client)
+    head_block_num = block_num if is_latest else None
+    if head_block_num is not None and state.header_index is not None:
+        state.header_index.set_head(state.chain, head_block_num)
+    if cache is not None:
+        block = cache.get_block_by_number(state.chain, block_num, get_full_block)
+        if block is not None:
+            return block
+
+    block = _get_block_by_num(client, block_num, get_full_block, state.retrier, state)
+    if cache is not None:
+        if head_block_num is None:
+            head_block_num = _get_head_block_num(state, client)
+        final = cache.is_final(state.chain, block.number, head_block_num)
+        cache.put_block(state.chain, block, get_full_block, final)
+    return block
+
+
+def _get_block_by_hash(state, block_hash, get_full_block=False, client=None):
+    cache = state.chain_cache
+    if cache is not None:
+        block = cache.get_block_by_hash(state.chain, block_hash, get_full_block)
+        if block is not None:
+            return block
+    client = client or state.client.eth
+    block = state.retrier.run(
+        lambda: client.block_by_hash(block_hash, get_full_block=get_full_block),
+        "block {}".format(block_hash),
+    )
+    if cache is not None:
+        # Without the latest block number it is unknown whether the block is final, but its
+        # content never changes for its hash. It may be an uncle or an orphan, so it must not
+        # evict the blocks it conflicts with.
+        cache.put_block(state.chain, block, get_full_block, final=False, evict_forks=False)
+    return block
+
+
+def _get_transaction(state, tx_hash, client=None, head_block_num=None):
+    """Gets the transaction from the local cache when it has it, or None if there is no such
+    transaction. Otherwise, fetches it and caches it. Finding out whether its block is final needs
+    the block's number, which is taken from the cache when it has the block and else costs a
+    request for the block, which is cached for the other transactions in it, and one for the head
+    block. Pass a `client` to use from other threads, and the `head_block_num` if already known."""
+    client = client or state.client.eth
+    cache = state.chain_cache
+    if cache is None:
+        return _fetch_transaction(client, tx_hash)
+    transaction = cache.get_transaction(state.chain, tx_hash)
+    if transaction is not None:
+        return transaction
+
+    transaction = _fetch_transaction(client, tx_hash)
+    if transaction is not None and transaction.blockHash:
+        block_num = cache.get_block_number(state.chain, transaction.blockHash)
+        if block_num is None:
+            block_num = _get_block_by_hash(state, transaction.blockHash, client=client).number
+        if head_block_num is None:
+            head_block_num = _get_head_block_num(state, client)
+        final = cache.is_final(state.chain, block_num, head_block_num)
+        cache.put_transaction(state.chain, transaction, final)
+    return transaction
+
+
+def _fetch_transaction(client, tx_hash):
+    """Returns the transaction, or None if the node does not know it. in3 raises a
+    `ClientException` for that rather than returning None."""
+    from in3.exception import ClientException
+
+    try:
+        return client.transaction_by_hash(tx_hash)
+    except ClientException as err:
+        if "not found" in str(err).lower():
+            return None
+        raise
+
+
+def _read_args(args, file):
+    """Yields the args, with `-` replaced by the lines from stdin, and then the lines of the
+    file."""
+    for arg in args:
+        if arg == "-":
+            yield from _read_lines(click.get_text_stream("stdin"))
+        else:
+            yield arg
+    if file is not None:
+        yield from _read_lines(file)
+
+
+def _read_lines(file):
+    for line in file:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def _get_balance_targets(state, addresses, address_file, all_accounts):
+    """Yields `(address, account name)` pairs, with no account name for given addresses."""
+    for address in _read_args(addresses, address_file):
+        yield address, ""
+    if all_accounts:
+        from in3cli.account import get_all_accounts
+
+        for account in get_all_accounts():
+            yield account.address, account.name
+    elif not addresses and address_file is None:
+        yield state.account.address, state.account.name
+
+
+def _get_balance_block_num(block_num, client):
+    if block_num is None:
+        return BlockNum.LATEST
+    if block_num in (BlockNum.EARLIEST, BlockNum.PENDING):
+        return block_num
+    return _handle_block_num_param(block_num, client)
+
+
+def _iter_balance_history_rows(samples):
+    previous_balance = None
+    for block_num, balance in samples:
+        yield model.create_balance_history_dict(block_num, balance, previous_balance)
+        previous_balance = balance
+
+
+def _dedupe(items):
+    seen = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
 
 
 @click.group()
@@ -143,8 +1053,15 @@ def eth():
 
 
 eth.add_command(show_gas_price)
+eth.add_command(gas_stats)
 eth.add_command(show_block)
+eth.add_command(block_at)
+eth.add_command(list_blocks)
+eth.add_command(export_blocks)
 eth.add_command(list_txs)
 eth.add_command(show_tx)
 eth.add_command(show_balance)
+eth.add_command(balance_history)
+eth.add_command(scan)
 eth.add_command(send)
+eth.add_command(send_batch)
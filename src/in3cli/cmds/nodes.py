@@ -0,0 +1,65 @@
+import click
+import in3cli.node_probe as node_probe
+from in3cli import node_cache
+from in3cli.model import create_node_probe_dict
+from in3cli.options import client_options
+from in3cli.options import format_option
+from in3cli.options import refresh_option
+from in3cli.output_formats import OutputFormatter
+
+samples_option = click.option(
+    "--samples",
+    "-n",
+    type=click.IntRange(min=1),
+    default=node_probe.DEFAULT_SAMPLES,
+    help="The number of RPC requests to send to each node.",
+    show_default=True,
+)
+workers_option = click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=node_probe.DEFAULT_WORKERS,
+    help="The maximum number of nodes to probe at the same time.",
+    show_default=True,
+)
+timeout_option = click.option(
+    "--timeout",
+    type=click.FloatRange(min=0.1),
+    default=node_probe.DEFAULT_TIMEOUT,
+    help="Seconds to wait for each connection or request.",
+    show_default=True,
+)
+save_option = click.option(
+    "--save/--no-save",
+    default=True,
+    help="Save the results so that new clients prefer the fastest healthy nodes.",
+    show_default=True,
+)
+
+
+@click.group()
+def nodes():
+    """Commands for inspecting In3 nodes."""
+    pass
+
+
+@nodes.command()
+@samples_option
+@workers_option
+@timeout_option
+@save_option
+@refresh_option
+@format_option
+@client_options()
+def probe(state, samples, workers, timeout, save, refresh, format):
+    """Measures the connect time, RPC latency and error rate of every node and ranks them."""
+    node_list = node_cache.get_node_list(state.client, state.chain, refresh)
+    urls = [node.url for node in node_list.nodes]
+    account = state.client.account
+    ignore_ssl_errors = account.ignore_ssl_errors if account is not None else False
+    results = node_probe.probe_nodes(urls, samples, timeout, workers, ignore_ssl_errors)
+    if save:
+        node_probe.save_results(state.chain, results)
+    formatter = OutputFormatter(format)
+    formatter.echo([create_node_probe_dict(r, rank) for rank, r in enumerate(results, 1)])
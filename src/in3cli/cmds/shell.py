@@ -0,0 +1,19 @@
+import os
+
+import click
+from in3cli.options import CliState
+from in3cli.shell import Shell
+from in3cli.util import get_user_project_path
+
+
+@click.command()
+def shell():
+    """Start an interactive shell that keeps the client warm between commands. Supports history
+    and tab completion; type 'exit' or press Ctrl-D to leave."""
+    from in3cli.client import ClientPool
+    from in3cli.main import cli
+
+    history_path = os.path.join(get_user_project_path(), "shell_history")
+    state = CliState(client_pool=ClientPool())
+    click.echo("Type a command without the 'in3' prefix, such as 'eth show-block'.")
+    Shell(cli, state, history_path).run()
@@ -1,8 +1,11 @@
+import json
 import os
 from configparser import ConfigParser
 
 from in3cli.enums import Chain
+from in3cli.error import In3CliError
 from in3cli.util import get_user_project_path
+from in3cli.util import write_file_atomically
 
 
 class NoConfigAccountError(Exception):
@@ -21,20 +24,23 @@ class ConfigAccessor:
     # Internal keys
     _INTERNAL_SECTION = "Internal"
     DEFAULT_ACCOUNT_KEY = "default_account"
+    NODE_LIST_TTL_KEY = "node_list_ttl"
+    CACHE_MAX_SIZE_MB_KEY = "cache_max_size_mb"
 
     # Keys
     ADDRESS_KEY = "address"  # Wallet Address (Public)
     IGNORE_SSL_ERRORS_KEY = "ignore-ssl-errors"
     CHAIN_KEY = "chain"
+    RETRIES_KEY = "retries"
+    RETRY_DEADLINE_KEY = "retry-deadline"
 
-    def __init__(self, parser):
+    def __init__(self, parser, path=None):
         self.parser = parser
-        file_name = "config.cfg"
-        self.path = os.path.join(get_user_project_path(), file_name)
+        self.path = path or get_config_path()
         if not os.path.exists(self.path):
             self._create_internal_section()
             self._save()
-        else:
+        elif not self.parser.sections():
             self.parser.read(self.path)
 
     @property
@@ -53,6 +59,34 @@ class ConfigAccessor:
     def default_account(self, value):
         self._internal[self.DEFAULT_ACCOUNT_KEY] = value
 
+    @property
+    def node_list_ttl(self):
+        """Seconds that a cached node list stays valid, or None if not set."""
+        return self._get_count(self.NODE_LIST_TTL_KEY)
+
+    @property
+    def cache_max_size_mb(self):
+        """The size in megabytes that the block and transaction cache may grow to, or None if
+        not set."""
+        return self._get_count(self.CACHE_MAX_SIZE_MB_KEY)
+
+    def _get_count(self, key):
+        """Returns the setting as a non-negative integer, or None if not set."""
+        value = self._internal.get(key)
+        if not value:
+            return None
+        try:
+            count = int(value)
+        except ValueError:
+            count = -1
+        if count < 0:
+            raise In3CliError(
+                "Invalid {} '{}' in {}: expected a whole number of 0 or more.".format(
+                    key, value, self.path
+                )
+            )
+        return count
+
     def get_account(self, name=None):
         """Returns the account with the given name.
         If name is None, returns the default account.
@@ -165,4 +199,103 @@ class ConfigAccessor:
             self.switch_default_account(account.name)
 
 
-config_accessor = ConfigAccessor(ConfigParser())
+def get_config_path():
+    return os.path.join(get_user_project_path(), "config.cfg")
+
+
+def _get_snapshot_path(path):
+    return "{}.snapshot.json".format(path)
+
+
+def _get_file_key(path):
+    """Identifies a version of the config file by its modification time and size."""
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _get_file_key_if_exists(path):
+    try:
+        return _get_file_key(path)
+    except OSError:
+        return None
+
+
+def _write_snapshot(path, parser):
+    """Saves the parsed sections next to the config file so later processes can skip parsing."""
+    try:
+        snapshot = {
+            "key": _get_file_key(path),
+            "sections": {name: dict(parser[name]) for name in parser.sections()},
+        }
+        # Written atomically, since other processes may read it at any time.
+        write_file_atomically(_get_snapshot_path(path), json.dumps(snapshot))
+    except OSError:
+        # The snapshot is only an optimization; the config file is the source of truth.
+        pass
+
+
+def _read_snapshot(path, key):
+    try:
+        with open(_get_snapshot_path(path), encoding="utf-8") as file:
+            snapshot = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("key") != key:
+        return None
+    return snapshot.get("sections")
+
+
+def load_config_parser(path):
+    """Returns a `ConfigParser` for the config file at the given path, using the snapshot from a
+    previous run when the file has not changed since."""
+    parser = ConfigParser()
+    try:
+        key = _get_file_key(path)
+    except OSError:
+        return parser
+    sections = _read_snapshot(path, key)
+    if sections is not None:
+        parser.read_dict(sections)
+    else:
+        parser.read(path)
+        _write_snapshot(path, parser)
+    return parser
+
+
+class _LazyConfigAccessor:
+    """Stands in for the `ConfigAccessor` so that nothing touches the config file until a
+    command actually needs it. The real accessor is then created once per process."""
+
+    def __init__(self):
+        self._accessor = None
+        self._file_key = None
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    @property
+    def is_loaded(self):
+        return self._accessor is not None
+
+    def get(self):
+        if self._accessor is None:
+            path = get_config_path()
+            self._accessor = ConfigAccessor(load_config_parser(path), path)
+            self._file_key = _get_file_key_if_exists(path)
+        return self._accessor
+
+    def clear(self):
+        """Drops the cached accessor so the next access reloads the config file."""
+        self._accessor = None
+        self._file_key = None
+
+    def clear_if_changed(self):
+        """For long-running processes: drops the cached accessor if another process has changed
+        the config file since it was loaded."""
+        if self._accessor is None:
+            return
+        if _get_file_key_if_exists(self._accessor.path) != self._file_key:
+            self.clear()
+
+
+config_accessor = _LazyConfigAccessor()
@@ -0,0 +1,319 @@
+"""A long-running process that keeps clients warm and runs commands forwarded by the `in3`
+executable over a local Unix socket."""
+import io
+import json
+import os
+import sys
+import threading
+from os import path
+
+from in3cli import __PRODUCT_NAME__
+
+NO_DAEMON_ENV_VAR = "IN3CLI_NO_DAEMON"
+_SOCKET_FILE_NAME = "daemon.sock"
+# Status and stop requests are answered right away. Forwarded commands have no overall timeout,
+# since their output is sent back as it is written.
+_CONTROL_TIMEOUT = 5
+_CONNECT_TIMEOUT = 5
+# Environment variables of the calling process that commands in the daemon run with.
+_FORWARDED_ENV_PREFIX = "IN3CLI_"
+_POLL_INTERVAL = 0.5
+
+# Commands that prompt, change settings, manage the daemon or write files or binary output always
+# run in the calling process.
+_LOCAL_ONLY_COMMANDS = [
+    ("account",),
+    ("daemon",),
+    ("eth", "send"),
+    ("eth", "send-batch"),
+    ("eth", "export-blocks"),
+    ("eth", "balance-history"),
+    ("eth", "scan"),
+    ("shell",),
+]
+# Options that make a command stream output for a long time, which the daemon could only send
+# back once the command is done.
+_LOCAL_ONLY_OPTIONS = ("--follow",)
+
+
+def get_socket_path():
+    """The path to the daemon socket. Unlike `util.get_user_project_path()`, this does not create
+    any directories, so that checking for a daemon stays cheap."""
+    hidden_package_name = ".{}".format(__PRODUCT_NAME__)
+    return path.join(path.expanduser("~"), hidden_package_name, _SOCKET_FILE_NAME)
+
+
+def forward(args):
+    """Runs the command in the daemon if one is running.
+
+    Returns:
+        (int): The exit code of the command, or None if it should run in this process instead.
+    """
+    if os.environ.get(NO_DAEMON_ENV_VAR) or _is_completing() or "-" in args:
+        # Shell completion and commands reading from stdin cannot be forwarded.
+        return None
+    socket_path = get_socket_path()
+    if not path.exists(socket_path):
+        return None
+    # Taken before the daemon can start writing, in case it runs in this process.
+    streams = {"stdout": sys.stdout, "stderr": sys.stderr}
+    env = {n: v for n, v in os.environ.items() if n.startswith(_FORWARDED_ENV_PREFIX)}
+    request = {"type": "run", "args": args, "cwd": os.getcwd(), "env": env}
+    try:
+        sock = _connect(socket_path, _CONNECT_TIMEOUT)
+    except OSError:
+        return None
+    with sock:
+        try:
+            _send(sock, request)
+        except OSError:
+            return None
+        try:
+            # The daemon may already be running the command, so running it here as well could run
+            # it twice.
+            response = _receive_output(sock, streams)
+        except (OSError, ValueError) as ex:
+            sys.stderr.write("Error: The daemon did not finish the command: {}\n".format(ex))
+            return 1
+    if not response.get("handled"):
+        return None
+    return response["exit_code"]
+
+
+def _receive_output(sock, streams):
+    """Writes the command's output to the given streams as the daemon sends it and returns the
+    final response."""
+    sock.settimeout(None)
+    with sock.makefile("rb") as reader:
+        for line in reader:
+            message = json.loads(line.decode("utf-8"))
+            name = next((n for n in streams if n in message), None)
+            if name is None:
+                return message
+            streams[name].write(message[name])
+            streams[name].flush()
+    raise ValueError("The daemon closed the connection without responding.")
+
+
+def _is_completing():
+    prog_name = path.basename(sys.argv[0]).replace("-", "_").upper()
+    return "_{}_COMPLETE".format(prog_name) in os.environ
+
+
+def send_request(socket_path, request, timeout=_CONTROL_TIMEOUT):
+    """Sends a single request to the daemon and returns its response."""
+    with _connect(socket_path, min(timeout, _CONNECT_TIMEOUT)) as sock:
+        _send(sock, request)
+        return _receive(sock, timeout)
+
+
+def _connect(socket_path, timeout):
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix sockets are not supported on this platform.")
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _send(sock, request):
+    sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+
+def _receive(sock, timeout):
+    sock.settimeout(timeout)
+    with sock.makefile("rb") as reader:
+        line = reader.readline()
+    if not line:
+        raise ValueError("The daemon closed the connection without responding.")
+    return json.loads(line.decode("utf-8"))
+
+
+def is_running(socket_path=None):
+    try:
+        return send_request(socket_path or get_socket_path(), {"type": "status"})
+    except (OSError, ValueError):
+        return None
+
+
+def get_command_path(command, args):
+    """Returns the names of the (sub)commands that the given arguments invoke."""
+    from in3cli.util import get_invoked_commands
+
+    return tuple(name for name, _ in get_invoked_commands(command, args))
+
+
+def _is_local_only(command_path, args=()):
+    if any(arg in _LOCAL_ONLY_OPTIONS for arg in args):
+        return True
+    return any(command_path[: len(local)] == local for local in _LOCAL_ONLY_COMMANDS)
+
+
+class Daemon:
+    """Serves forwarded commands, sharing a pool of clients between them."""
+
+    def __init__(self, socket_path=None, client_pool=None):
+        if client_pool is None:
+            from in3cli.client import ClientPool
+
+            client_pool = ClientPool()
+        self.socket_path = socket_path or get_socket_path()
+        self.client_pool = client_pool
+        self.commands_run = 0
+        self._stopped = False
+        self._run_lock = threading.Lock()
+
+    def serve(self):
+        """Listens on the socket until stopped, handling each connection on its own thread so that
+        status and stop requests are answered while a command runs."""
+        import socketserver
+
+        daemon = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                send_lock = threading.Lock()
+
+                def send(message):
+                    with send_lock:
+                        self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+
+                request = json.loads(self.rfile.readline().decode("utf-8"))
+                try:
+                    send(daemon.handle_request(request, send))
+                except OSError:
+                    # The caller went away, such as when it was interrupted.
+                    pass
+
+        class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        if path.exists(self.socket_path):
+            # Left behind by a daemon that did not shut down cleanly.
+            os.remove(self.socket_path)
+        # Create the socket private to the user, rather than restricting it after it is bound.
+        previous_umask = os.umask(0o077)
+        try:
+            server = _Server(self.socket_path, _Handler)
+        finally:
+            os.umask(previous_umask)
+        try:
+            server.timeout = _POLL_INTERVAL
+            while not self._stopped:
+                server.handle_request()
+        finally:
+            server.server_close()
+            if path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def stop(self):
+        self._stopped = True
+
+    def handle_request(self, request, send=None):
+        request_type = request.get("type")
+        if request_type == "run":
+            return self.run(request.get("args", []), request.get("cwd"), request.get("env"), send)
+        if request_type == "stop":
+            self.stop()
+            return {"handled": True}
+        if request_type == "status":
+            return {
+                "handled": True,
+                "pid": os.getpid(),
+                "clients": len(self.client_pool),
+                "commands_run": self.commands_run,
+            }
+        return {"handled": False}
+
+    def run(self, args, cwd=None, env=None, send=None):
+        """Runs the command in this process and returns its exit code. Commands run one at a time
+        because they share the process's stdout, stderr, environment and working directory, so
+        while one runs, others are handed back to the caller to run itself instead of waiting.
+
+        With `send`, output is passed to it as `{"stdout": text}` and `{"stderr": text}` messages
+        as it is written, so that long commands stream and do not hold their output in memory.
+        Otherwise, the output is returned with the exit code."""
+        from in3cli.main import cli
+
+        if _is_local_only(get_command_path(cli, args), args):
+            return {"handled": False}
+        if not self._run_lock.acquire(blocking=False):
+            return {"handled": False, "busy": True}
+        try:
+            return self._run(args, cwd, env, send)
+        finally:
+            self._run_lock.release()
+
+    def _run(self, args, cwd, env, send):
+        from contextlib import redirect_stderr
+        from contextlib import redirect_stdout
+
+        from in3cli.config import config_accessor
+        from in3cli.main import cli
+        from in3cli.options import CliState
+
+        config_accessor.clear_if_changed()
+        state = CliState(client_pool=self.client_pool)
+        if send is None:
+            stdout = io.StringIO()
+            stderr = io.StringIO()
+        else:
+            stdout = _OutputStream("stdout", send)
+            stderr = _OutputStream("stderr", send)
+        exit_code = 0
+        previous_cwd = os.getcwd()
+        previous_env = _replace_forwarded_env(env or {})
+        try:
+            if cwd:
+                os.chdir(cwd)
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                cli.main(args=args, prog_name="in3", obj=state)
+        except SystemExit as ex:
+            exit_code = ex.code if isinstance(ex.code, int) else int(ex.code is not None)
+        except Exception as ex:
+            stderr.write("Error: {}\n".format(ex))
+            exit_code = 1
+        finally:
+            os.chdir(previous_cwd)
+            _replace_forwarded_env(previous_env)
+        self.commands_run += 1
+        response = {"handled": True, "exit_code": exit_code}
+        if send is None:
+            response.update(stdout=stdout.getvalue(), stderr=stderr.getvalue())
+        return response
+
+
+def _replace_forwarded_env(env):
+    """Replaces the forwarded environment variables of this process with the given ones and
+    returns the ones it replaced."""
+    previous = {n: v for n, v in os.environ.items() if n.startswith(_FORWARDED_ENV_PREFIX)}
+    for name in previous:
+        del os.environ[name]
+    os.environ.update(env)
+    return previous
+
+
+class _OutputStream(io.TextIOBase):
+    """A text stream that sends what is written to it to the caller right away."""
+
+    def __init__(self, name, send):
+        super().__init__()
+        self._name = name
+        self._send = send
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if not isinstance(text, str):
+            raise TypeError("write() argument must be str, not {}".format(type(text).__name__))
+        if text:
+            self._send({self._name: text})
+        return len(text)
@@ -1,8 +1,9 @@
 import difflib
+import importlib
 import re
+import sys
 
 import click
-from in3.exception import IN3BaseException
 
 _DIFFLIB_CUT_OFF = 0.6
 
@@ -21,9 +22,15 @@ class In3CliArgumentError(In3CliError):
 
 
 class In3CliChainTimeoutError(In3CliError):
-    def __init__(self, waiting_for):
-        err_text = "Timed out waiting for {}. Please try again.".format(waiting_for)
-        super().__init__(err_text)
+    def __init__(self, waiting_for, attempts=None, last_error=None):
+        err_text = "Timed out waiting for {}".format(waiting_for)
+        if attempts:
+            err_text += " after {} attempt{}".format(attempts, "" if attempts == 1 else "s")
+        if last_error:
+            err_text += " (last error: {})".format(last_error)
+        super().__init__("{}. Please try again.".format(err_text))
+        # Keeps the error picklable, for errors raised in worker processes.
+        self.args = (waiting_for, attempts, str(last_error) if last_error else None)
 
 
 # TODO: Get rid of these and use ones from in3-c
@@ -52,11 +59,40 @@ def _print_error(err):
     click.echo("Error: {}".format(str(err)), err=True)
 
 
+def _is_in3_error(err):
+    """Checks for an `in3` exception without importing `in3`; if it was never imported, the
+    error cannot have come from it."""
+    in3_exception = sys.modules.get("in3.exception")
+    return in3_exception is not None and isinstance(err, in3_exception.IN3BaseException)
+
+
 class _ErrorHandlingGroup(click.Group):
-    """Custom click.Group subclass to add custom exception handling."""
+    """Custom click.Group subclass to add custom exception handling.
+
+    Subcommands may also be given as a `lazy_commands` registry mapping command names to
+    `"module.path:attribute"` strings. Those modules only get imported once the command is
+    looked up, so running one command does not pay the import cost of all the others.
+    """
 
     _original_args = None
 
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx):
+        return sorted(set(self.commands) | set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            self.add_command(self._load_lazy_command(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_lazy_command(self, cmd_name):
+        module_path, attr_name = self.lazy_commands[cmd_name].split(":")
+        module = importlib.import_module(module_path)
+        return getattr(module, attr_name)
+
     def make_context(self, info_name, args, parent=None, **extra):
         # grab the original command line arguments for logging purposes
         self._original_args = " ".join(args)
@@ -67,15 +103,6 @@ class _ErrorHandlingGroup(click.Group):
             return super().invoke(ctx)
         except click.UsageError as err:
             self._suggest_cmd(err)
-        except IN3BaseException as err:
-            if "CERTIFICATE_VERIFY_FAILED" in str(err):
-                _print_error(
-                    "SSL Verification Failure. "
-                    "Try trusting the certificate or create an in3cli account using:\n"
-                    "\tin3 account create --disable-ssl-errors"
-                )
-            else:
-                _print_error(err)
         except In3CliError as err:
             _print_error(err)
         except click.ClickException:
@@ -85,7 +112,16 @@ class _ErrorHandlingGroup(click.Group):
         except OSError:
             raise
         except Exception as ex:
-            click.echo(str(ex))
+            if not _is_in3_error(ex):
+                click.echo(str(ex))
+            elif "CERTIFICATE_VERIFY_FAILED" in str(ex):
+                _print_error(
+                    "SSL Verification Failure. "
+                    "Try trusting the certificate or create an in3cli account using:\n"
+                    "\tin3 account create --disable-ssl-errors"
+                )
+            else:
+                _print_error(ex)
 
     @staticmethod
     def _suggest_cmd(usage_err):
@@ -94,7 +130,8 @@ class _ErrorHandlingGroup(click.Group):
             match = re.match("No such command '(.*)'.", usage_err.message)
             if match:
                 bad_arg = match.groups()[0]
-                available_commands = list(usage_err.ctx.command.commands.keys())
+                ctx = usage_err.ctx
+                available_commands = list(ctx.command.list_commands(ctx))
                 suggested_commands = difflib.get_close_matches(
                     bad_arg, available_commands, cutoff=_DIFFLIB_CUT_OFF
                 )
@@ -0,0 +1,160 @@
+"""Streams rows to a file or stdout as NDJSON or CSV, optionally compressed, with flat memory use
+no matter how many rows there are."""
+import contextlib
+import csv
+import importlib
+import io
+import json
+import os
+import stat
+import tempfile
+
+import click
+from in3cli.util import get_attribute_keys_from_class
+
+STDOUT = "-"
+DEFAULT_FLUSH_ROWS = 1000
+# Compression modules are only imported when used, to keep them out of every command's startup.
+_COMPRESSION_MODULES = {"gzip": "gzip", "bz2": "bz2", "xz": "lzma"}
+_EXTENSIONS = {".gz": "gzip", ".gzip": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+
+class ExportFormat:
+    NDJSON = "NDJSON"
+    CSV = "CSV"
+
+    @staticmethod
+    def choices():
+        return get_attribute_keys_from_class(ExportFormat)
+
+
+class Compression:
+    NONE = "none"
+    GZIP = "gzip"
+    BZ2 = "bz2"
+    XZ = "xz"
+
+    @staticmethod
+    def choices():
+        return get_attribute_keys_from_class(Compression)
+
+
+def get_compression(output_path, compression=None):
+    """Returns the given compression, or else the one that the file extension implies."""
+    if compression:
+        return compression.lower()
+    if output_path == STDOUT:
+        return Compression.NONE
+    extension = os.path.splitext(output_path)[1].lower()
+    return _EXTENSIONS.get(extension, Compression.NONE)
+
+
+@contextlib.contextmanager
+def open_output(output_path, compression=Compression.NONE):
+    """Opens a text stream to the file, or to stdout for `-`, that compresses on the fly.
+
+    A regular file is written through a temporary file that only replaces it once everything has
+    been written, so a failed export never leaves a truncated file behind. Anything else, such as
+    `/dev/stdout` or a named pipe, and an existing file in a directory that the user cannot create
+    files in, is written directly.
+    """
+    if output_path == STDOUT:
+        if compression == Compression.NONE:
+            yield click.get_text_stream("stdout")
+            return
+        stream = _open_text(_open_compressed(click.get_binary_stream("stdout"), compression))
+        try:
+            yield stream
+        finally:
+            stream.close()
+        return
+
+    temp_path = None
+    if _is_regular_file_or_missing(output_path):
+        directory = os.path.dirname(os.path.abspath(output_path))
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        except PermissionError:
+            if not os.path.exists(output_path):
+                raise
+    if temp_path is None:
+        with open(output_path, "wb") as file, _open_file_text(file, compression) as stream:
+            yield stream
+        return
+
+    try:
+        with os.fdopen(fd, "wb") as file, _open_file_text(file, compression) as stream:
+            yield stream
+        # Temporary files are private to the user; give the export the usual mode for new files.
+        os.chmod(temp_path, 0o666 & ~_get_umask())
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _is_regular_file_or_missing(output_path):
+    try:
+        return stat.S_ISREG(os.stat(output_path).st_mode)
+    except FileNotFoundError:
+        return True
+
+
+@contextlib.contextmanager
+def _open_file_text(file, compression):
+    binary = file
+    if compression != Compression.NONE:
+        # Closing a compressor that wraps a file object leaves the file itself open.
+        binary = _open_compressed(file, compression)
+    with _open_text(binary) as stream:
+        yield stream
+
+
+def _get_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+class RowWriter:
+    """Writes dict rows with a fixed set of fields, flushing every `flush_rows` rows. Pass
+    `header=False` for output that continues another writer's."""
+
+    def __init__(
+        self, stream, export_format, fieldnames, flush_rows=DEFAULT_FLUSH_ROWS, header=True
+    ):
+        self.stream = stream
+        self.export_format = export_format.upper()
+        self.flush_rows = flush_rows
+        self.row_count = 0
+        self._csv_writer = None
+        if self.export_format == ExportFormat.CSV:
+            self._csv_writer = csv.DictWriter(stream, fieldnames=fieldnames, extrasaction="ignore")
+            if header:
+                self._csv_writer.writeheader()
+
+    def write(self, row):
+        if self._csv_writer is not None:
+            self._csv_writer.writerow(row)
+        else:
+            self.stream.write(json.dumps(row))
+            self.stream.write("\n")
+        self.row_count += 1
+        if self.row_count % self.flush_rows == 0:
+            self.stream.flush()
+
+    def write_all(self, rows):
+        for row in rows:
+            self.write(row)
+        self.stream.flush()
+        return self.row_count
+
+
+def _open_compressed(binary, compression):
+    return importlib.import_module(_COMPRESSION_MODULES[compression]).open(binary, "wb")
+
+
+def _open_text(binary):
+    # CSV rows end in "\r\n" on their own, so newlines are written untranslated.
+    return io.TextIOWrapper(binary, encoding="utf-8", newline="")
@@ -0,0 +1,68 @@
+"""Follows the head of a chain, polling for new blocks at the pace the chain produces them."""
+import time
+
+from in3cli.enums import Chain
+
+# Typical seconds between blocks, used until enough blocks have been seen to measure it.
+DEFAULT_BLOCK_TIMES = {Chain.MAINNET: 13.0, Chain.GOERLI: 15.0, Chain.KOVAN: 4.0, Chain.EWC: 5.0}
+DEFAULT_BLOCK_TIME = 13.0
+MIN_POLL_INTERVAL = 0.5
+# Blocks reach nodes a little after their timestamp, so polling right when one is due would
+# usually just miss it.
+PROPAGATION_DELAY = 1.0
+# How much each newly observed block time moves the estimate.
+_SMOOTHING = 0.2
+# While a block is overdue, poll this many times per expected block time.
+_POLLS_PER_BLOCK_WHEN_LATE = 4
+
+
+class BlockFollower:
+    """Yields every new block in order as it appears.
+
+    Instead of polling `block_number()` at a fixed rate, it estimates the chain's block time from
+    the timestamps of the blocks it has seen, sleeps until the next block is due, and only then
+    polls more often until it arrives.
+    """
+
+    def __init__(self, client, get_block, chain=None, clock=time.time, sleep=time.sleep):
+        self.client = client
+        self.get_block = get_block
+        self.block_time = DEFAULT_BLOCK_TIMES.get(chain, DEFAULT_BLOCK_TIME)
+        self.polls = 0
+        self._clock = clock
+        self._sleep = sleep
+        self._last_timestamp = None
+
+    def follow(self, start_block_num=None):
+        """Yields blocks from `start_block_num`, or else from the latest block, forever."""
+        head_block_num = self._poll()
+        next_block_num = head_block_num if start_block_num is None else start_block_num
+        while True:
+            while next_block_num <= head_block_num:
+                block = self.get_block(next_block_num)
+                self._observe(block)
+                yield block
+                next_block_num += 1
+            self._sleep(self.get_poll_interval())
+            head_block_num = max(head_block_num, self._poll())
+
+    def get_poll_interval(self):
+        """Seconds until the next block is due, or a fraction of the block time if it is late."""
+        late_interval = max(MIN_POLL_INTERVAL, self.block_time / _POLLS_PER_BLOCK_WHEN_LATE)
+        if self._last_timestamp is None:
+            return late_interval
+        due = self._last_timestamp + self.block_time + PROPAGATION_DELAY
+        until_due = due - self._clock()
+        return max(late_interval, min(until_due, self.block_time))
+
+    def _poll(self):
+        self.polls += 1
+        return self.client.block_number()
+
+    def _observe(self, block):
+        timestamp = block.timestamp
+        if self._last_timestamp is not None and timestamp > self._last_timestamp:
+            observed = timestamp - self._last_timestamp
+            self.block_time += _SMOOTHING * (observed - self.block_time)
+        if self._last_timestamp is None or timestamp > self._last_timestamp:
+            self._last_timestamp = timestamp
@@ -0,0 +1,90 @@
+"""Gas price and gas usage statistics over a range of blocks.
+
+The numbers are crunched with NumPy when it is installed and otherwise with compact `array`s and
+plain sorting. Both give exactly the same results.
+"""
+from array import array
+from collections import namedtuple
+
+from in3cli.util import get_attribute_keys_from_class
+from in3cli.util import get_percentile
+
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+HISTOGRAM_BINS = 10
+
+BlockGasStats = namedtuple(
+    "BlockGasStats", ["number", "tx_count", "gas_used_ratio", "median_gas_price"]
+)
+
+
+class GasReport:
+    PERCENTILES = "percentiles"
+    HISTOGRAM = "histogram"
+    BLOCKS = "blocks"
+
+    @staticmethod
+    def choices():
+        return get_attribute_keys_from_class(GasReport)
+
+
+def get_numpy():
+    """Returns the `numpy` module, or None if it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class GasStats:
+    """Collects the gas prices of the transactions and the gas used ratios of the blocks added to
+    it. Pass `use_numpy=False` to take the pure Python path even when NumPy is installed."""
+
+    def __init__(self, use_numpy=True):
+        self.numpy = get_numpy() if use_numpy else None
+        # Gas prices in Wei stay exact as doubles up to about 9 million Gwei.
+        self.gas_prices = array("d")
+        self.gas_used_ratios = array("d")
+
+    @property
+    def block_count(self):
+        return len(self.gas_used_ratios)
+
+    @property
+    def tx_count(self):
+        return len(self.gas_prices)
+
+    def add(self, block):
+        """Adds a full block and returns its own stats."""
+        gas_prices = sorted(tx.gasPrice for tx in block.transactions)
+        gas_used_ratio = block.gasUsed / block.gasLimit if block.gasLimit else 0.0
+        self.gas_prices.extend(gas_prices)
+        self.gas_used_ratios.append(gas_used_ratio)
+        return BlockGasStats(
+            block.number, len(gas_prices), gas_used_ratio, get_percentile(gas_prices, 50)
+        )
+
+    def get_percentiles(self, percents=PERCENTILES):
+        """Returns the nearest-rank percentiles of the gas prices, or Nones if there are none."""
+        if not self.gas_prices:
+            return [None] * len(percents)
+        if self.numpy is None:
+            sorted_prices = sorted(self.gas_prices)
+            return [get_percentile(sorted_prices, percent) for percent in percents]
+        np = self.numpy
+        sorted_prices = np.sort(np.frombuffer(self.gas_prices, dtype=np.float64))
+        ranks = np.ceil(np.array(percents, dtype=np.float64) / 100.0 * len(sorted_prices))
+        return sorted_prices[np.maximum(ranks.astype(np.int64), 1) - 1].tolist()
+
+    def get_histogram(self, bins=HISTOGRAM_BINS):
+        """Returns the number of blocks in each of `bins` equal ranges of gas used ratio, with full
+        blocks in the last one."""
+        if self.numpy is None:
+            counts = [0] * bins
+            for ratio in self.gas_used_ratios:
+                counts[min(int(ratio * bins), bins - 1)] += 1
+            return counts
+        np = self.numpy
+        ratios = np.frombuffer(self.gas_used_ratios, dtype=np.float64)
+        indexes = np.minimum((ratios * bins).astype(np.int64), bins - 1)
+        return np.bincount(indexes, minlength=bins).tolist()
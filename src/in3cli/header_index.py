@@ -0,0 +1,218 @@
+"""A compact on-disk index of final block headers under ~/.in3cli/headers.
+
+Each chain has a directory of segment files with one fixed-width binary record per block number,
+read and written through `mmap`. Looking up the header, hash or timestamp of a block number is a
+single read at a computed offset, with no parsing. Segment files are sparse, so blocks that were
+never indexed take no disk space.
+
+Only blocks that are final relative to the latest block the index has heard of are written, so
+records never need to be evicted for reorgs.
+"""
+import mmap
+import os
+import shutil
+import struct
+import threading
+from collections import namedtuple
+
+from in3cli.chain_cache import DEFAULT_FINALITY_CONFIRMATIONS
+from in3cli.chain_cache import FINALITY_CONFIRMATIONS
+from in3cli.util import get_user_project_path
+from in3cli.util import write_file_atomically
+
+SEGMENT_SIZE = 100000  # Blocks per segment file
+_HEAD_FILE_NAME = "head"
+_PRESENT = 1
+# The present flag, hash, parent hash, miner, author, timestamp, gas limit, gas used, size,
+# transaction count, difficulty and total difficulty, padded to 256 bytes.
+_RECORD = struct.Struct("<B32s32s20s20sQQQQI32s32s51x")
+
+# The fields are in the order of `model.BLOCK_EXPORT_FIELDS`, and named like the `Block` attributes
+# so that a header can stand in for a block where only these fields are read.
+BlockHeader = namedtuple(
+    "BlockHeader",
+    [
+        "number",
+        "hash",
+        "parentHash",
+        "timestamp",
+        "miner",
+        "difficulty",
+        "totalDifficulty",
+        "size",
+        "gasLimit",
+        "gasUsed",
+        "tx_count",
+        "author",
+    ],
+)
+
+
+def get_index_dir():
+    return get_user_project_path("headers")
+
+
+class HeaderIndex:
+    """Block headers by chain and number. A single instance may be shared between threads, and
+    the files between processes."""
+
+    def __init__(self, path=None):
+        self.path = path or get_index_dir()
+        self._lock = threading.Lock()
+        self._segments = {}
+        self._heads = {}
+
+    def close(self):
+        with self._lock:
+            for file, segment in self._segments.values():
+                segment.close()
+                file.close()
+            self._segments = {}
+
+    def clear(self, chain=None):
+        """Deletes the index of the chain, or of every chain."""
+        self.close()
+        self._heads = {}
+        if not os.path.isdir(self.path):
+            return
+        chains = [chain.lower()] if chain else os.listdir(self.path)
+        for chain_dir in chains:
+            shutil.rmtree(os.path.join(self.path, chain_dir), ignore_errors=True)
+
+    def get(self, chain, block_num):
+        """Returns the `BlockHeader` for the block number, or None if it is not indexed."""
+        segment = self._get_segment(chain, block_num // SEGMENT_SIZE, create=False)
+        if segment is None:
+            return None
+        offset = (block_num % SEGMENT_SIZE) * _RECORD.size
+        values = _RECORD.unpack_from(segment, offset)
+        if values[0] != _PRESENT:
+            return None
+        return _to_header(block_num, values)
+
+    def get_timestamp(self, chain, block_num):
+        header = self.get(chain, block_num)
+        return header.timestamp if header is not None else None
+
+    def put(self, chain, block):
+        """Indexes the block if it is final, and returns whether it did. Blocks with values that do
+        not fit a record, which no real block has, are skipped."""
+        head_block_num = max(self.get_head(chain), block.number)
+        confirmations = FINALITY_CONFIRMATIONS.get(chain, DEFAULT_FINALITY_CONFIRMATIONS)
+        if block.number > head_block_num - confirmations:
+            return False
+        try:
+            record = _RECORD.pack(_PRESENT, *_to_values(block))
+        except (ValueError, TypeError, OverflowError, AttributeError, struct.error):
+            return False
+        segment = self._get_segment(chain, block.number // SEGMENT_SIZE, create=True)
+        offset = (block.number % SEGMENT_SIZE) * _RECORD.size
+        # The flag goes last so that readers in other processes never see half a record.
+        segment[offset + 1 : offset + _RECORD.size] = record[1:]
+        segment[offset] = _PRESENT
+        return True
+
+    def get_head(self, chain):
+        """The latest block number the index has heard of for the chain, or -1."""
+        if chain not in self._heads:
+            try:
+                with open(self._get_head_path(chain), encoding="utf-8") as file:
+                    self._heads[chain] = int(file.read())
+            except (OSError, ValueError):
+                self._heads[chain] = -1
+        return self._heads[chain]
+
+    def set_head(self, chain, block_num):
+        """Records a latest block number, which decides which blocks are final."""
+        if block_num <= self.get_head(chain):
+            return
+        self._heads[chain] = block_num
+        os.makedirs(self._get_chain_dir(chain), exist_ok=True)
+        write_file_atomically(self._get_head_path(chain), str(block_num))
+
+    def _get_chain_dir(self, chain):
+        return os.path.join(self.path, chain.lower())
+
+    def _get_head_path(self, chain):
+        return os.path.join(self._get_chain_dir(chain), _HEAD_FILE_NAME)
+
+    def _get_segment(self, chain, segment_num, create):
+        key = (chain, segment_num)
+        entry = self._segments.get(key)
+        if entry is not None:
+            return entry[1]
+        path = os.path.join(self._get_chain_dir(chain), "{:06d}.idx".format(segment_num))
+        with self._lock:
+            if key in self._segments:
+                return self._segments[key][1]
+            if not os.path.exists(path):
+                if not create:
+                    return None
+                os.makedirs(self._get_chain_dir(chain), exist_ok=True)
+                with open(path, "ab") as file:
+                    # Extending with truncate() leaves a sparse file on most file systems.
+                    file.truncate(SEGMENT_SIZE * _RECORD.size)
+            file = open(path, "r+b")
+            segment = mmap.mmap(file.fileno(), SEGMENT_SIZE * _RECORD.size)
+            self._segments[key] = (file, segment)
+            return segment
+
+
+def _to_values(block):
+    return (
+        _from_hex(block.hash, 32),
+        _from_hex(block.parentHash, 32),
+        _from_hex(block.miner, 20),
+        _from_hex(block.author, 20),
+        block.timestamp,
+        block.gasLimit,
+        block.gasUsed,
+        block.size,
+        len(block.transactions),
+        block.difficulty.to_bytes(32, "big"),
+        block.totalDifficulty.to_bytes(32, "big"),
+    )
+
+
+def _to_header(block_num, values):
+    (
+        _,
+        block_hash,
+        parent_hash,
+        miner,
+        author,
+        timestamp,
+        gas_limit,
+        gas_used,
+        size,
+        tx_count,
+        difficulty,
+        total_difficulty,
+    ) = values
+    return BlockHeader(
+        block_num,
+        _to_hex(block_hash),
+        _to_hex(parent_hash),
+        timestamp,
+        _to_hex(miner),
+        int.from_bytes(difficulty, "big"),
+        int.from_bytes(total_difficulty, "big"),
+        size,
+        gas_limit,
+        gas_used,
+        tx_count,
+        _to_hex(author),
+    )
+
+
+def _from_hex(value, length):
+    if not value:
+        return bytes(length)
+    data = bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    if len(data) != length:
+        raise ValueError("Expected {} bytes, got {}.".format(length, len(data)))
+    return data
+
+
+def _to_hex(value):
+    return "0x" + value.hex()
@@ -1,14 +1,16 @@
+import os
 import signal
 import sys
 
 import click
-from in3cli.cmds.account import account
-from in3cli.cmds.ens.ens import ens
-from in3cli.cmds.eth.eth import eth
+from in3cli import node_cache
+from in3cli import private_key
+from in3cli.daemon import forward
 from in3cli.error import _ErrorHandlingGroup
 from in3cli.model import create_node_dict
 from in3cli.options import client_options
 from in3cli.options import format_option
+from in3cli.options import refresh_option
 from in3cli.output_formats import OutputFormatter
 
 
@@ -23,11 +25,12 @@ signal.signal(signal.SIGINT, exit_on_interrupt)
 
 @click.command()
 @format_option
+@refresh_option
 @client_options()
-def list_nodes(state, format):
+def list_nodes(state, format, refresh):
     """Lists In3 node information."""
     _format = format.upper()
-    node_list = state.client.refresh_node_list()
+    node_list = node_cache.get_node_list(state.client, state.chain, refresh)
     node_dicts = [create_node_dict(n) for n in node_list.nodes]
     formatter = OutputFormatter(_format)
     formatter.echo(node_dicts)
@@ -38,14 +41,52 @@ _CONTEXT_SETTINGS = {
     "max_content_width": 200,
 }
 
+# Command groups that live in their own modules are only imported when invoked.
+_LAZY_COMMANDS = {
+    "account": "in3cli.cmds.account:account",
+    "cache": "in3cli.cmds.cache:cache",
+    "daemon": "in3cli.cmds.daemon:daemon",
+    "ens": "in3cli.cmds.ens.ens:ens",
+    "eth": "in3cli.cmds.eth.eth:eth",
+    "nodes": "in3cli.cmds.nodes:nodes",
+    "shell": "in3cli.cmds.shell:shell",
+}
+
 
-@click.group(cls=_ErrorHandlingGroup, context_settings=_CONTEXT_SETTINGS)
+@click.group(
+    cls=_ErrorHandlingGroup,
+    context_settings=_CONTEXT_SETTINGS,
+    lazy_commands=_LAZY_COMMANDS,
+)
 @client_options(hidden=True)
 def cli(state):
-    pass
+    click.get_current_context().call_on_close(lambda: _report_retries(state))
+    if os.environ.get(private_key.KEYRING_TIMING_ENV_VAR):
+        click.get_current_context().call_on_close(_report_keyring_time)
+
+
+def _report_retries(state):
+    if state.retry_count:
+        count = state.retry_count
+        click.echo("Retried {} request{}.".format(count, "" if count == 1 else "s"), err=True)
+
+
+def _report_keyring_time():
+    timer = private_key.keyring_timer
+    click.echo(
+        "Keyring lookups: {} in {:.1f} ms.".format(timer.lookups, timer.seconds * 1000), err=True
+    )
+    # The shell and the daemon run many commands in one process, so each reports its own.
+    timer.reset()
 
 
-cli.add_command(eth)
 cli.add_command(list_nodes)
-cli.add_command(ens)
-cli.add_command(account)
+
+
+def main():
+    """The entry point for the `in3` executable. Forwards the command to `in3 daemon` when it is
+    running and otherwise runs it in this process."""
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+    cli()
@@ -46,6 +46,100 @@ def create_tx_dict(tx):
     )
 
 
+def create_scan_tx_dict(block, tx):
+    """The transaction with the number of its block, which `create_tx_dict` leaves out."""
+    tx_dict = create_tx_dict(tx)
+    tx_dict.update({"Block Number": block.number, "Hash": tx.hash})
+    return _ordered_dict(tx_dict)
+
+
+def create_tx_lookup_dict(tx_hash, tx=None, error=None):
+    """A row for one of many looked up transactions, with the same fields whether or not the
+    lookup failed."""
+    row = {"Hash": tx_hash, "Amount": "", "Block Hash": "", "From": "", "To": "", "Error": ""}
+    if tx is not None:
+        row.update(create_tx_dict(tx))
+    if error:
+        row["Error"] = error
+    return _ordered_dict(row)
+
+
+def create_balance_dict(address, balance=None, block_num=None, account_name="", error=None):
+    has_balance = balance is not None
+    return _ordered_dict(
+        {
+            "Account": account_name,
+            "Address": address,
+            "Balance (Wei)": balance if has_balance else "",
+            "Balance (Eth)": util.wei_to_eth(balance) if has_balance else "",
+            "Block": block_num if has_balance else "",
+            "Error": error or "",
+        }
+    )
+
+
+def create_block_at_dict(block_num, timestamp):
+    return _ordered_dict(
+        {
+            "Number": block_num,
+            "Timestamp": timestamp,
+            "Date": util.convert_timestamp_to_date_str(timestamp),
+        }
+    )
+
+
+def create_gas_percentile_dict(percent, gas_price):
+    return _ordered_dict(
+        {
+            "Percentile": "P{}".format(percent),
+            "Gas Price (Gwei)": "" if gas_price is None else util.wei_to_gwei(gas_price),
+        }
+    )
+
+
+def create_gas_histogram_dict(bin_index, bins, block_count):
+    low = 100 * bin_index // bins
+    high = 100 * (bin_index + 1) // bins
+    return _ordered_dict({"Gas Used": "{}-{}%".format(low, high), "Blocks": block_count})
+
+
+def create_block_gas_dict(block_gas_stats):
+    median_gas_price = block_gas_stats.median_gas_price
+    return _ordered_dict(
+        {
+            "Number": block_gas_stats.number,
+            "Transactions": block_gas_stats.tx_count,
+            "Gas Used (%)": round(100 * block_gas_stats.gas_used_ratio, 2),
+            "Median Gas Price (Gwei)": ""
+            if median_gas_price is None
+            else util.wei_to_gwei(median_gas_price),
+        }
+    )
+
+
+BALANCE_HISTORY_FIELDS = ("Block", "Balance (Wei)", "Change (Wei)")
+
+
+def create_balance_history_dict(block_num, balance, previous_balance=None):
+    """A row with the fixed `BALANCE_HISTORY_FIELDS`. The first row has no change."""
+    change = "" if previous_balance is None else balance - previous_balance
+    return OrderedDict(zip(BALANCE_HISTORY_FIELDS, (block_num, balance, change)))
+
+
+def create_payment_dict(payment, nonce, status, tx_hash=None, error=None):
+    return _ordered_dict(
+        {
+            "Row": payment.row,
+            "To": payment.to,
+            "Value (Eth)": util.wei_to_eth(payment.value),
+            "Nonce": nonce,
+            "Status": status,
+            "Tx Hash": tx_hash or "",
+            "Error": error or "",
+        }
+    )
+
+
 def create_node_dict(node):
     return _ordered_dict(
         {
@@ -64,3 +158,103 @@ def create_resolved_ens_domain_name_dict(hashed_name, address, owner, resolver):
     return _ordered_dict(
         {"Hash": hashed_name, "Address": address, "Owner": owner, "Resolver": resolver}
     )
+
+
+def _round_ms(value):
+    return round(value, 1) if value is not None else None
+
+
+def create_node_probe_dict(result, rank):
+    return _ordered_dict(
+        {
+            "Rank": rank,
+            "URL": result.url,
+            "Connect (ms)": _round_ms(result.connect_ms),
+            "p50 (ms)": _round_ms(result.get_latency_percentile(50)),
+            "p90 (ms)": _round_ms(result.get_latency_percentile(90)),
+            "p99 (ms)": _round_ms(result.get_latency_percentile(99)),
+            "Error Rate": "{:.0%}".format(result.error_rate),
+        }
+    )
+
+
+def create_cache_stats_dict(chain, stats):
+    return _ordered_dict(
+        {
+            "Chain": chain,
+            "Blocks": stats["blocks"],
+            "Provisional Blocks": stats["provisional"],
+            "Transactions": stats["transactions"],
+            "Size (MB)": round(stats["size"] / (1024 * 1024), 2),
+        }
+    )
+
+
+BLOCK_EXPORT_FIELDS = (
+    "Number",
+    "Hash",
+    "Parent Hash",
+    "Timestamp",
+    "Miner",
+    "Difficulty",
+    "Total Difficulty",
+    "Size",
+    "Gas Limit",
+    "Gas Used",
+    "Transaction Count",
+)
+TX_EXPORT_FIELDS = (
+    "Block Number",
+    "Block Hash",
+    "Transaction Index",
+    "Hash",
+    "From",
+    "To",
+    "Value (Wei)",
+    "Gas",
+    "Gas Price",
+    "Nonce",
+    "Input",
+)
+
+
+def create_block_export_dict(block):
+    """The block as a row with the fixed `BLOCK_EXPORT_FIELDS`, keeping raw values for machines."""
+    values = (
+        block.number,
+        block.hash,
+        block.parentHash,
+        block.timestamp,
+        block.miner,
+        block.difficulty,
+        block.totalDifficulty,
+        block.size,
+        block.gasLimit,
+        block.gasUsed,
+        len(block.transactions),
+    )
+    return OrderedDict(zip(BLOCK_EXPORT_FIELDS, values))
+
+
+def create_header_export_dict(header):
+    """The `header_index.BlockHeader` as a row like `create_block_export_dict` gives for its
+    block."""
+    return OrderedDict(zip(BLOCK_EXPORT_FIELDS, header))
+
+
+def create_tx_export_dict(tx, block_number):
+    """The transaction as a row with the fixed `TX_EXPORT_FIELDS`."""
+    values = (
+        block_number,
+        tx.blockHash,
+        tx.transactionIndex,
+        tx.hash,
+        tx.From,
+        tx.to,
+        tx.value,
+        tx.gas,
+        tx.gasPrice,
+        tx.nonce,
+        tx.input,
+    )
+    return OrderedDict(zip(TX_EXPORT_FIELDS, values))
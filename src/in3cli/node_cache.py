@@ -0,0 +1,155 @@
+"""A per-chain cache of the In3 node list under ~/.in3cli/nodes, so that short-lived commands do not
+have to fetch the node list from the registry each time."""
+import json
+import os
+import time
+
+from in3cli.util import get_user_project_path
+from in3cli.util import write_file_atomically
+
+DEFAULT_NODE_LIST_TTL = 3600  # Seconds
+
+
+def get_node_list_ttl():
+    """The number of seconds a cached node list stays valid, from the `node_list_ttl` setting."""
+    from in3cli.config import config_accessor
+
+    ttl = config_accessor.node_list_ttl
+    return DEFAULT_NODE_LIST_TTL if ttl is None else ttl
+
+
+def get_cache_path(chain):
+    return os.path.join(get_user_project_path("nodes"), "{}.json".format(chain.lower()))
+
+
+def save_node_list(chain, node_list):
+    """Saves the node list for the given chain, replacing any cached one atomically so readers
+    never see a partial file."""
+    data = {
+        "saved_at": time.time(),
+        "contract": _get_address(node_list.contract),
+        "registry_id": node_list.registryId,
+        "last_block_number": node_list.lastBlockNumber,
+        "total_servers": node_list.totalServers,
+        "nodes": [_node_to_dict(node) for node in node_list.nodes],
+    }
+    write_file_atomically(get_cache_path(chain), json.dumps(data))
+
+
+def load_cached_data(chain, ttl=None):
+    """Returns the cached node list data for the chain, or None if there is none or it has
+    expired."""
+    ttl = get_node_list_ttl() if ttl is None else ttl
+    try:
+        with open(get_cache_path(chain), encoding="utf-8") as file:
+            data = json.load(file)
+        saved_at = float(data["saved_at"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(data.get("nodes"), list) or time.time() - saved_at > ttl:
+        return None
+    return data
+
+
+def load_node_list(chain, ttl=None):
+    """Returns the cached `in3.NodeList` for the chain, or None if there is none or it has
+    expired."""
+    data = load_cached_data(chain, ttl)
+    if data is None:
+        return None
+
+    from in3 import NodeList
+    from in3.eth.model import Account
+    from in3.model import In3Node
+
+    nodes = [
+        In3Node(
+            node["url"],
+            Account(node["address"], node.get("chain_id")),
+            node.get("index"),
+            node.get("deposit"),
+            node.get("props"),
+            node.get("timeout"),
+            node.get("register_time"),
+            node.get("weight"),
+        )
+        for node in data["nodes"]
+    ]
+    contract = Account(data["contract"], None) if data.get("contract") else None
+    return NodeList(
+        nodes,
+        contract,
+        data.get("registry_id"),
+        data.get("last_block_number"),
+        data.get("total_servers"),
+    )
+
+
+def get_node_list(client, chain, refresh=False):
+    """Returns the cached node list for the chain, fetching and caching it when there is no fresh
+    one or when `refresh` is set."""
+    node_list = None if refresh else load_node_list(chain)
+    if node_list is None:
+        node_list = client.refresh_node_list()
+        save_node_list(chain, node_list)
+    return node_list
+
+
+def get_registry_config(chain, ttl=None):
+    """Returns the `in3.ClientConfig` node registry settings that seed a client with the cached
+    node list, or None if there is no fresh cached list. Nodes that did not respond to the latest
+    `in3 nodes probe` are left out. in3 picks nodes at random, weighted by the response times it
+    measures itself, so their order in the list does not matter and it takes no weights for
+    them."""
+    ttl = get_node_list_ttl() if ttl is None else ttl
+    data = load_cached_data(chain, ttl)
+    if not data or not data["nodes"]:
+        return None
+    nodes = _leave_out_failed_nodes(chain, data["nodes"], ttl)
+    node_list = [
+        {"url": node["url"], "address": node["address"], "props": node.get("props") or 0}
+        for node in nodes
+    ]
+    config = {"needsUpdate": False, "nodeList": node_list}
+    if data.get("contract"):
+        config["contract"] = data["contract"]
+    if data.get("registry_id"):
+        config["registryId"] = data["registry_id"]
+    return config
+
+
+def _leave_out_failed_nodes(chain, nodes, ttl):
+    from in3cli.node_probe import load_results
+
+    results = load_results(chain, ttl)
+    if not results:
+        return nodes
+    failed_urls = {r.url for r in results if not r.is_healthy}
+    healthy_nodes = [n for n in nodes if n["url"] not in failed_urls]
+    # Never leave the client without nodes, even if none of them responded to the probe.
+    return healthy_nodes or nodes
+
+
+def clear(chain):
+    try:
+        os.remove(get_cache_path(chain))
+    except FileNotFoundError:
+        pass
+
+
+def _node_to_dict(node):
+    return {
+        "url": node.url,
+        "address": _get_address(node.address),
+        "chain_id": getattr(node.address, "chain_id", None),
+        "index": node.index,
+        "deposit": node.deposit,
+        "props": node.props,
+        "timeout": node.timeout,
+        "register_time": node.registerTime,
+        "weight": node.weight,
+    }
+
+
+def _get_address(account):
+    return getattr(account, "address", account)
@@ -0,0 +1,177 @@
+"""Measures how fast and how reliable In3 nodes are, so that clients can prefer the best ones."""
+import json
+import os
+import time
+
+from in3cli.util import get_percentile
+from in3cli.util import get_user_project_path
+from in3cli.util import write_file_atomically
+
+DEFAULT_SAMPLES = 5
+DEFAULT_TIMEOUT = 5  # Seconds
+DEFAULT_WORKERS = 16
+_BLOCK_NUMBER_REQUEST = json.dumps(
+    {"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber", "params": []}
+).encode("utf-8")
+
+
+class NodeProbeResult:
+    def __init__(self, url, connect_ms=None, latencies_ms=None, errors=0, last_error=None):
+        self.url = url
+        self.connect_ms = connect_ms
+        self.latencies_ms = sorted(latencies_ms or [])
+        self.errors = errors
+        self.last_error = last_error
+
+    @property
+    def attempts(self):
+        return len(self.latencies_ms) + self.errors
+
+    @property
+    def error_rate(self):
+        return self.errors / self.attempts if self.attempts else 1.0
+
+    @property
+    def is_healthy(self):
+        return bool(self.latencies_ms)
+
+    def get_latency_percentile(self, percent):
+        return get_percentile(self.latencies_ms, percent)
+
+    def to_dict(self):
+        return {
+            "url": self.url,
+            "connect_ms": self.connect_ms,
+            "latencies_ms": self.latencies_ms,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["url"],
+            data.get("connect_ms"),
+            data.get("latencies_ms"),
+            data.get("errors", 0),
+            data.get("last_error"),
+        )
+
+
+def probe_node(url, samples=DEFAULT_SAMPLES, timeout=DEFAULT_TIMEOUT, ignore_ssl_errors=False):
+    """Measures the TCP connect time of the node and the latency of `samples` RPC requests."""
+    result = NodeProbeResult(url)
+    try:
+        result.connect_ms = _measure_connect_ms(url, timeout)
+    except (OSError, ValueError) as err:
+        result.errors = samples
+        result.last_error = str(err)
+        return result
+
+    context = _create_ssl_context(ignore_ssl_errors)
+    latencies_ms = []
+    for _ in range(samples):
+        try:
+            latencies_ms.append(_measure_rpc_ms(url, timeout, context))
+        except (OSError, ValueError) as err:
+            result.errors += 1
+            result.last_error = str(err)
+    result.latencies_ms = sorted(latencies_ms)
+    return result
+
+
+def probe_nodes(
+    urls,
+    samples=DEFAULT_SAMPLES,
+    timeout=DEFAULT_TIMEOUT,
+    workers=DEFAULT_WORKERS,
+    ignore_ssl_errors=False,
+):
+    """Probes the nodes concurrently with at most `workers` threads and returns their results,
+    fastest healthy nodes first."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls)))) as executor:
+        results = list(
+            executor.map(lambda u: probe_node(u, samples, timeout, ignore_ssl_errors), urls)
+        )
+    return rank_results(results)
+
+
+def rank_results(results):
+    """Sorts healthy nodes before unhealthy ones, then by error rate and median latency."""
+
+    def sort_key(result):
+        median = result.get_latency_percentile(50)
+        return (
+            not result.is_healthy,
+            result.error_rate,
+            median if median is not None else float("inf"),
+        )
+
+    return sorted(results, key=sort_key)
+
+
+def get_results_path(chain):
+    return os.path.join(get_user_project_path("nodes"), "{}.probe.json".format(chain.lower()))
+
+
+def save_results(chain, results):
+    data = {"saved_at": time.time(), "results": [r.to_dict() for r in results]}
+    write_file_atomically(get_results_path(chain), json.dumps(data))
+
+
+def load_results(chain, ttl):
+    """Returns the saved results for the chain, ranked, or None if there are none or they are
+    older than `ttl` seconds. Every client creation loads them, so the networking modules used for
+    probing are only imported when probing."""
+    try:
+        with open(get_results_path(chain), encoding="utf-8") as file:
+            data = json.load(file)
+        if time.time() - float(data["saved_at"]) > ttl:
+            return None
+        return rank_results([NodeProbeResult.from_dict(r) for r in data["results"]])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _measure_connect_ms(url, timeout):
+    import socket
+    from urllib.parse import urlparse
+
+    parsed = urlparse(url)
+    if not parsed.hostname:
+        raise ValueError("Invalid node URL '{}'.".format(url))
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    start = time.perf_counter()
+    with socket.create_connection((parsed.hostname, port), timeout=timeout):
+        return (time.perf_counter() - start) * 1000
+
+
+def _measure_rpc_ms(url, timeout, context):
+    import urllib.request
+
+    request = urllib.request.Request(
+        url, data=_BLOCK_NUMBER_REQUEST, headers={"Content-Type": "application/json"}
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=timeout, context=context) as response:
+        body = json.loads(response.read().decode("utf-8"))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if not isinstance(body, dict) or "result" not in body:
+        error = body.get("error") if isinstance(body, dict) else body
+        raise ValueError("Bad RPC response: {}".format(error))
+    return elapsed_ms
+
+
+def _create_ssl_context(ignore_ssl_errors):
+    import ssl
+
+    context = ssl.create_default_context()
+    if ignore_ssl_errors:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
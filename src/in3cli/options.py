@@ -1,7 +1,6 @@
 import click
 
 from in3cli.account import get_account
-from in3cli.client import CliClient
 from in3cli.enums import Chain
 from in3cli.error import In3CliError
 from in3cli.output_formats import OutputFormat
@@ -25,24 +24,57 @@ format_option = click.option(
     default=OutputFormat.TABLE,
 )
 address_option = click.option("--address", "-a", help="An Ethereum address.")
+workers_option = click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=8,
+    help="The maximum number of requests to run at the same time.",
+    show_default=True,
+)
+refresh_option = click.option(
+    "--refresh",
+    is_flag=True,
+    help="Fetch the node list from the registry even if a cached one has not expired yet.",
+)
+
+cache_option = click.option(
+    "--no-cache",
+    is_flag=True,
+    expose_value=False,
+    callback=lambda ctx, param, value: _set_no_cache(ctx, value),
+    help="Always fetch from the network, without reading or writing the local block cache.",
+)
 
 
 class CliState:
-    def __init__(self):
-        try:
-            self._account = get_account()
-        except In3CliError:
-            self._account = None
+    """Global state for a command. The account, chain and client are only resolved when a command
+    first uses them, so commands that do not need them do no config or keyring I/O."""
+
+    def __init__(self, client_pool=None):
+        self._client_pool = client_pool
+        self._account_name = None
+        self._account = None
         self._client = None
         self.search_filters = []
         self.assume_yes = False
-        self._chain = self._account.chain
+        self.use_cache = True
+        self.retries = None
+        self.retry_deadline = None
+        self._chain = None
+        self._chain_cache = None
+        self._header_index = None
+        self._retrier = None
+        self._node_list_ttl = None
 
     def __call__(self, *args, **kwargs):
         return self.client
 
     @property
     def chain(self):
+        if self._chain is None:
+            account = self._get_account_if_exists()
+            return account.chain if account is not None else Chain.MAINNET
         return self._chain
 
     @chain.setter
@@ -51,10 +83,21 @@ class CliState:
             self._chain = value.lower()
             self._client = None
 
+    @property
+    def account_name(self):
+        return self._account_name
+
+    @account_name.setter
+    def account_name(self, value):
+        """Sets which account to use without loading it yet."""
+        self._account_name = value
+        self._account = None
+        self._client = None
+
     @property
     def account(self):
         if self._account is None:
-            self._account = get_account()
+            self._account = get_account(self._account_name)
         return self._account
 
     @account.setter
@@ -64,18 +107,138 @@ class CliState:
     @property
     def client(self):
         if self._client is None:
-            self._client = CliClient(self._account, self.chain)
+            account = self._get_account_if_exists()
+            if self._client_pool is not None:
+                self._client = self._client_pool.get(account, self.chain, self.node_list_ttl)
+            else:
+                from in3cli.client import CliClient
+
+                self._client = CliClient(account, self.chain, self.node_list_ttl)
         return self._client
 
+    def create_client(self):
+        """Creates a new client for the same account and chain, for work that runs in other
+        threads, since clients are not thread-safe."""
+        from in3cli.client import CliClient
+
+        return CliClient(self._get_account_if_exists(), self.chain, self.node_list_ttl)
+
+    @property
+    def offline_client(self):
+        """A client for commands that only compute values locally, such as hashing, and so do
+        not need any account settings."""
+        if self._client is not None:
+            return self._client
+        from in3cli.client import CliClient
+
+        return CliClient(None, self._chain or Chain.MAINNET, self.node_list_ttl)
+
+    @property
+    def node_list_ttl(self):
+        """The `node_list_ttl` setting, read once per command so that creating clients, such as
+        one per worker thread, does not read the config again."""
+        if self._node_list_ttl is None:
+            from in3cli.node_cache import get_node_list_ttl
+
+            self._node_list_ttl = get_node_list_ttl()
+        return self._node_list_ttl
+
+    @property
+    def chain_cache(self):
+        """The local block and transaction cache, or None if `--no-cache` was given or the cache
+        cannot be opened."""
+        if not self.use_cache:
+            return None
+        if self._chain_cache is None:
+            import sqlite3
+            from in3cli.chain_cache import ChainCache
+
+            try:
+                self._chain_cache = ChainCache()
+            except sqlite3.Error:
+                # The cache only saves requests, so commands still work without it.
+                self.use_cache = False
+                return None
+        return self._chain_cache
+
+    @property
+    def header_index(self):
+        """The local index of final block headers, or None if `--no-cache` was given or the index
+        cannot be opened."""
+        if not self.use_cache:
+            return None
+        if self._header_index is None:
+            from in3cli.header_index import HeaderIndex
+
+            try:
+                self._header_index = HeaderIndex()
+            except OSError:
+                self.use_cache = False
+                return None
+        return self._header_index
+
+    @property
+    def retrier(self):
+        """Retries requests for this command with the policy from the --retries and
+        --retry-deadline options, else the account's settings, else the defaults."""
+        if self._retrier is None:
+            from in3cli.retry import DEFAULT_DEADLINE
+            from in3cli.retry import DEFAULT_MAX_ATTEMPTS
+            from in3cli.retry import Retrier
+            from in3cli.retry import RetryPolicy
+
+            account = self._get_account_if_exists()
+            retries = _first_set(self.retries, account and account.retries)
+            deadline = _first_set(self.retry_deadline, account and account.retry_deadline)
+            policy = RetryPolicy(
+                max_attempts=DEFAULT_MAX_ATTEMPTS if retries is None else retries + 1,
+                deadline=DEFAULT_DEADLINE if deadline is None else deadline,
+            )
+            self._retrier = Retrier(policy)
+        return self._retrier
+
+    @property
+    def retry_count(self):
+        """The number of requests this command retried."""
+        return self._retrier.retries if self._retrier is not None else 0
+
     def set_assume_yes(self, param):
         self.assume_yes = param
 
+    def reset(self):
+        """Clears the options of the previous command so that one state can run many commands.
+        Clients in the client pool stay warm."""
+        self._account_name = None
+        self._account = None
+        self._chain = None
+        self._client = None
+        self.search_filters = []
+        self.assume_yes = False
+        self.use_cache = True
+        self.retries = None
+        self.retry_deadline = None
+        self._retrier = None
+        self._node_list_ttl = None
+
+    def _get_account_if_exists(self):
+        try:
+            return self.account
+        except In3CliError:
+            # The default account is optional for commands that only read from the chain.
+            if self._account_name is not None:
+                raise
+            return None
+
+
+def _first_set(*values):
+    return next((v for v in values if v is not None), None)
+
 
 def set_account(ctx, param, value):
     """Sets the account on the global state object when --account <name> is passed to commands
     decorated with @global_options."""
     if value:
-        ctx.ensure_object(CliState).account = get_account(value)
+        ctx.ensure_object(CliState).account_name = value
 
 
 def account_option(hidden=False):
@@ -88,6 +251,11 @@ def account_option(hidden=False):
     )
 
 
+def _set_no_cache(ctx, no_cache):
+    if no_cache:
+        ctx.ensure_object(CliState).use_cache = False
+
+
 def _set_chain(ctx, chain):
     if chain and ctx.obj:
         ctx.obj.chain = chain
@@ -104,6 +272,39 @@ chain_option = click.option(
 )
 
 
+def _set_state_value(name):
+    def callback(ctx, param, value):
+        if value is not None:
+            setattr(ctx.ensure_object(CliState), name, value)
+
+    return callback
+
+
+def retry_options(hidden=False):
+    def decorator(f):
+        f = click.option(
+            "--retries",
+            type=click.IntRange(min=0),
+            expose_value=False,
+            callback=_set_state_value("retries"),
+            hidden=hidden,
+            help="How often to retry a failed request. Defaults to the account's `retries` "
+            "setting, else 4.",
+        )(f)
+        f = click.option(
+            "--retry-deadline",
+            type=click.FloatRange(min=0),
+            expose_value=False,
+            callback=_set_state_value("retry_deadline"),
+            hidden=hidden,
+            help="Seconds after which to stop retrying a request. Defaults to the account's "
+            "`retry-deadline` setting, else 10.",
+        )(f)
+        return f
+
+    return decorator
+
+
 pass_state = click.make_pass_decorator(CliState, ensure=True)
 
 
@@ -111,6 +312,7 @@ def client_options(hidden=False):
     def decorator(f):
         f = account_option(hidden)(f)
         f = chain_option(f)
+        f = retry_options(hidden)(f)
         f = pass_state(f)
         return f
 
@@ -39,6 +39,16 @@ class OutputFormatter:
         if self.output_format in [OutputFormat.TABLE]:
             click.echo()
 
+    def echo_stream(self, output_iter):
+        """Echoes records as they are produced instead of waiting for all of them. Tables still
+        need every record to size their columns."""
+        if self.output_format == OutputFormat.TABLE:
+            self.echo(list(output_iter))
+            return
+        format_func = to_csv_rows if self.output_format == OutputFormat.CSV else to_json_rows
+        for output in format_func(output_iter):
+            click.echo(output, nl=False)
+
     def echo_via_pager(self, output):
         click.echo_via_pager(self._get_formatted_output(output))
 
@@ -73,6 +83,24 @@ def to_csv(output):
     return string_io.getvalue()
 
 
+def to_csv_rows(output_iter):
+    """Yields CSV lines for records as they come, with the header taken from the first record."""
+    fieldnames = None
+    for item in output_iter:
+        string_io = io.StringIO()
+        if fieldnames is None:
+            fieldnames = sorted(item.keys())
+            csv.DictWriter(string_io, fieldnames=fieldnames).writeheader()
+        writer = csv.DictWriter(string_io, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writerow(item)
+        yield string_io.getvalue()
+
+
+def to_json_rows(output_iter):
+    for item in output_iter:
+        yield to_json(item)
+
+
 def to_table(output, header):
     """Output is a list of records"""
     if not output:
@@ -0,0 +1,85 @@
+"""Helpers for running network requests concurrently while keeping output in order."""
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+DEFAULT_WORKERS = 8
+DEFAULT_BATCH_SIZE = 10
+
+
+def map_ordered(func, items, workers=DEFAULT_WORKERS, batch_size=1):
+    """Like `map()`, but calls `func` on the items from a pool of `workers` threads.
+
+    Items are handed out in batches of `batch_size` and results are yielded in input order as soon
+    as they are ready, so output can stream while later items are still being fetched. At most two
+    batches per worker are in flight at a time, which keeps memory flat for long inputs.
+    """
+    workers = max(1, workers)
+    batch_size = max(1, batch_size)
+    max_pending = workers * 2
+    batches = _batch(items, batch_size)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        try:
+            for batch in batches:
+                pending.append(executor.submit(_run_batch, func, batch))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def map_unordered(func, items, workers=DEFAULT_WORKERS):
+    """Like `map_ordered()`, but yields each result as soon as it is ready, in any order, so that
+    one slow item does not hold back the others."""
+    workers = max(1, workers)
+    max_pending = workers * 2
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        try:
+            for item in items:
+                pending.add(executor.submit(func, item))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def thread_local(factory):
+    """Returns a function that gives each thread its own object, created by `factory` on first use.
+    Use this for objects that are not thread-safe, such as clients."""
+    local = threading.local()
+
+    def get():
+        if not hasattr(local, "value"):
+            local.value = factory()
+        return local.value
+
+    return get
+
+
+def _run_batch(func, batch):
+    return [func(item) for item in batch]
+
+
+def _batch(items, batch_size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -1,14 +1,50 @@
+import time
 from getpass import getpass
 
-import keyring
 from in3cli import __PRODUCT_NAME__
 from in3cli.util import does_user_agree
 
 
+KEYRING_TIMING_ENV_VAR = "IN3CLI_KEYRING_TIMING"
+
+# Bumped whenever this process stores or deletes a private key, so that clients know to recover
+# their signers again.
+_key_version = 0
+
+
+class KeyringTimer:
+    """Counts the keyring lookups of this process and the total time they took."""
+
+    def __init__(self):
+        self.lookups = 0
+        self.seconds = 0.0
+
+    def add(self, seconds):
+        self.lookups += 1
+        self.seconds += seconds
+
+    def reset(self):
+        self.lookups = 0
+        self.seconds = 0.0
+
+
+keyring_timer = KeyringTimer()
+
+
+def get_key_version():
+    return _key_version
+
+
 def get_stored_private_key(account):
     """Gets your currently stored private key for the given account."""
+    import keyring
+
     service_name = _get_keyring_service_name(account.name)
-    return keyring.get_password(service_name, account.address)
+    start = time.perf_counter()
+    try:
+        return keyring.get_password(service_name, account.address)
+    finally:
+        keyring_timer.add(time.perf_counter() - start)
 
 
 def get_private_key_from_prompt():
@@ -18,18 +54,29 @@ def get_private_key_from_prompt():
 
 def set_private_key(account, new_key):
     """Sets your private key for the given account."""
+    import keyring
+
     service_name = _get_keyring_service_name(account.name)
     uses_file_storage = keyring.get_keyring().priority < 1
     if uses_file_storage and not _prompt_for_alternative_store():
         return
 
     keyring.set_password(service_name, account.address, new_key)
+    _bump_key_version()
 
 
 def delete_private_key(account):
     """Deletes the private key for the given account."""
+    import keyring
+
     service_name = _get_keyring_service_name(account.name)
     keyring.delete_password(service_name, account.address)
+    _bump_key_version()
+
+
+def _bump_key_version():
+    global _key_version
+    _key_version += 1
 
 
 def _get_keyring_service_name(account_name):
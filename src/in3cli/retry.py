@@ -0,0 +1,115 @@
+"""Retries requests that fail for reasons that may pass, such as a node timing out or a block that
+has not reached the node yet, with exponential backoff and jitter within an overall deadline."""
+import random
+import re
+import sys
+import threading
+import time
+
+from in3cli.error import In3CliChainTimeoutError
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_DEADLINE = 10.0  # Seconds
+DEFAULT_INITIAL_DELAY = 0.1  # Seconds
+DEFAULT_MAX_DELAY = 2.0  # Seconds
+# in3 raises `ClientException` for every error from its runtime and from nodes, and
+# `TransportException` for failed HTTP requests, so errors are told apart by their message. Messages
+# matching the permanent pattern fail the same way every time, such as invalid params, reverts or
+# nonces that were already used, and are never retried even when they also match the transient one.
+_PERMANENT_ERROR_PATTERN = re.compile(
+    r"invalid|revert|nonce too low|already known|known transaction|replacement transaction"
+    r"|insufficient funds|intrinsic gas|gas required exceeds|exceeds block gas limit"
+    r"|could not be found|not supported",
+    re.IGNORECASE,
+)
+# Messages of errors that come from the network, or from nodes that are overloaded or behind.
+_TRANSIENT_ERROR_PATTERN = re.compile(
+    r"time ?out|timed out|connect|reset by peer|broken pipe|temporarily|unavailable"
+    r"|too many requests|rate limit|\b(408|429|50[0-4])\b|no nodes|could not be send"
+    r"|not found or non-existent|not enough finality",
+    re.IGNORECASE,
+)
+
+
+class RetryPolicy:
+    """How often and how long to retry. The delay before retry `n` is drawn uniformly from zero up
+    to `initial_delay * 2 ** n`, capped at `max_delay`, so that retries right after a new block
+    are fast and concurrent requests do not retry in lockstep."""
+
+    def __init__(
+        self,
+        max_attempts=DEFAULT_MAX_ATTEMPTS,
+        deadline=DEFAULT_DEADLINE,
+        initial_delay=DEFAULT_INITIAL_DELAY,
+        max_delay=DEFAULT_MAX_DELAY,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.deadline = deadline
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+
+    def get_delay(self, retry_num, rand=random.random):
+        return rand() * min(self.max_delay, self.initial_delay * 2 ** retry_num)
+
+
+def is_transient(err):
+    """Whether the error may pass when retried. Only In3 errors with a message of a network or node
+    problem are, and failed HTTP requests unless their message says otherwise."""
+    # in3 is only loaded once a client exists, and without it no In3 error could have happened.
+    in3_exceptions = sys.modules.get("in3.exception")
+    if in3_exceptions is None:
+        return False
+    transport_error = getattr(in3_exceptions, "TransportException", None)
+    client_error = getattr(in3_exceptions, "ClientException", None)
+    is_transport_error = transport_error is not None and isinstance(err, transport_error)
+    if not is_transport_error and (client_error is None or not isinstance(err, client_error)):
+        return False
+    message = str(err)
+    if _PERMANENT_ERROR_PATTERN.search(message):
+        return False
+    return is_transport_error or bool(_TRANSIENT_ERROR_PATTERN.search(message))
+
+
+class Retrier:
+    """Runs functions with a retry policy and counts the retries across all of them. A single
+    instance may be shared between threads."""
+
+    def __init__(self, policy=None, clock=time.monotonic, sleep=time.sleep):
+        self.policy = policy or RetryPolicy()
+        self.retries = 0
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def run(self, func, waiting_for="a response"):
+        """Returns the first result of `func` that is not None. Transient errors and None results
+        are retried; other errors are raised right away.
+
+        Raises:
+            In3CliChainTimeoutError: When out of attempts or the next retry would pass the deadline.
+        """
+        start = self._clock()
+        retry_num = 0
+        last_error = None
+        while True:
+            try:
+                result = func()
+                if result is not None:
+                    return result
+            except Exception as err:
+                if not is_transient(err):
+                    raise
+                last_error = err
+            attempts = retry_num + 1
+            delay = self.policy.get_delay(retry_num)
+            elapsed = self._clock() - start
+            if attempts >= self.policy.max_attempts or elapsed + delay > self.policy.deadline:
+                raise In3CliChainTimeoutError(waiting_for, attempts, last_error)
+            self._sleep(delay)
+            retry_num += 1
+            self.add_retries(1)
+
+    def add_retries(self, count):
+        """Counts retries made elsewhere, such as in worker processes."""
+        with self._lock:
+            self.retries += count
@@ -0,0 +1,115 @@
+"""Scans a range of blocks for the transactions from or to a set of addresses.
+
+The range is split into chunks that are scanned concurrently. Each chunk is recorded in a
+checkpoint file once its transactions have been written, so an interrupted scan picks up where it
+left off.
+"""
+import hashlib
+import json
+import os
+
+from in3cli.parallel import map_ordered
+from in3cli.util import get_user_project_path
+from in3cli.util import write_file_atomically
+
+DEFAULT_CHUNK_SIZE = 100
+
+
+class AddressSet:
+    """Addresses to match transactions against, case-insensitively and in constant time."""
+
+    def __init__(self, addresses):
+        self.addresses = frozenset(address.lower() for address in addresses)
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def matches(self, tx):
+        # `to` is None for transactions that create contracts.
+        return (tx.From or "").lower() in self.addresses or (tx.to or "").lower() in self.addresses
+
+
+def get_chunks(from_block, to_block, chunk_size):
+    """Splits the range into `(from, to)` ranges of `chunk_size` blocks, the last maybe shorter."""
+    return [
+        (start, min(start + chunk_size - 1, to_block))
+        for start in range(from_block, to_block + 1, chunk_size)
+    ]
+
+
+def get_scan_key(chain, address_set, from_block, to_block, chunk_size):
+    """Identifies a scan, so that a checkpoint is only ever resumed by the same scan. Pass a
+    `to_block` of None for a scan up to the latest block, whose checkpoint keeps the block it was
+    resolved to."""
+    scan = [chain, sorted(address_set.addresses), from_block, to_block, chunk_size]
+    return hashlib.sha1(json.dumps(scan).encode("utf-8")).hexdigest()
+
+
+def get_checkpoint_path(scan_key):
+    return os.path.join(get_user_project_path("scans"), "{}.json".format(scan_key))
+
+
+class Checkpoint:
+    """The chunks of a scan that are done, saved to `path` after each one, and for a scan up to the
+    latest block, the `to_block` that it resolved to."""
+
+    def __init__(self, path, scan_key):
+        self.path = path
+        self.scan_key = scan_key
+        self.done = set()
+        self.to_block = None
+
+    @classmethod
+    def load(cls, path, scan_key):
+        """Loads the checkpoint at the path, or starts a new one if there is none.
+
+        Raises:
+            ValueError: When the file is a checkpoint of a different scan.
+        """
+        checkpoint = cls(path, scan_key)
+        try:
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return checkpoint
+        if data.get("scan") != scan_key:
+            raise ValueError("{} is the checkpoint of a different scan.".format(path))
+        checkpoint.done = set(data["done"])
+        checkpoint.to_block = data.get("to")
+        return checkpoint
+
+    def mark_done(self, chunk_start):
+        self.done.add(chunk_start)
+        data = {"scan": self.scan_key, "done": sorted(self.done), "to": self.to_block}
+        write_file_atomically(self.path, json.dumps(data))
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def scan(get_block, address_set, chunks, checkpoint, workers):
+    """Yields `(block, tx)` for every matching transaction in the chunks that the checkpoint does
+    not have yet, in block order. `get_block` takes a block number and returns the full block, and
+    is called from `workers` threads, one chunk each.
+
+    A chunk is marked done when the caller asks for the transaction after its last one, so the
+    caller must have written out every transaction it took by then. Pass a `checkpoint` of None
+    when the output is only written at the end.
+    """
+
+    def scan_chunk(chunk):
+        matches = []
+        for block_num in range(chunk[0], chunk[1] + 1):
+            block = get_block(block_num)
+            matches.extend((block, tx) for tx in block.transactions if address_set.matches(tx))
+        return chunk, matches
+
+    done = checkpoint.done if checkpoint is not None else set()
+    pending_chunks = [chunk for chunk in chunks if chunk[0] not in done]
+    for chunk, matches in map_ordered(scan_chunk, pending_chunks, workers):
+        yield from matches
+        if checkpoint is not None:
+            checkpoint.mark_done(chunk[0])
@@ -0,0 +1,250 @@
+"""Sends many payments from one account.
+
+Nonces are assigned locally instead of by the node for each transaction, and each payment's nonce is
+written to a journal before it is sent, along with the hash of its signed transaction. A send that
+may have reached a node without confirming it, such as one that timed out, is journaled as unknown.
+A resumed batch first reconciles the payments that were not confirmed and whose nonce is below the
+account's transaction count, since their nonce was used: a payment whose transaction was mined went
+out, and any other never will, because another transaction took its nonce, so it gets a new one.
+Every other payment that is not journaled as sent is sent again with the nonce it was given before,
+so a payment that did go out the first time is rejected by the chain instead of being paid twice.
+"""
+import csv
+import json
+import os
+import re
+import threading
+from collections import namedtuple
+
+from in3cli.error import In3CliChainTimeoutError
+from in3cli.export import ExportFormat
+from in3cli.retry import is_transient
+from in3cli.util import eth_to_wei
+
+_ADDRESS_PATTERN = re.compile(r"^0x[0-9a-fA-F]{40}$")
+# Errors that mean the nonce is taken, possibly by an earlier attempt at the same payment.
+_USED_NONCE_PATTERN = re.compile(
+    r"nonce too low|already known|known transaction|replacement transaction", re.IGNORECASE
+)
+
+Payment = namedtuple("Payment", ["row", "to", "value", "gas"])
+PlannedPayment = namedtuple("PlannedPayment", ["payment", "nonce", "is_new"])
+
+
+class JournalStatus:
+    ASSIGNED = "assigned"
+    SENT = "sent"
+    # The send may or may not have reached a node.
+    UNKNOWN = "unknown"
+    FAILED = "failed"
+    # Not sent, because a payment with a lower nonce failed.
+    SKIPPED = "skipped"
+
+
+def get_failure_status(err):
+    """Returns `JournalStatus.UNKNOWN` for an error after which the transaction may still have
+    reached a node, and `JournalStatus.FAILED` when it surely did not."""
+    if isinstance(err, In3CliChainTimeoutError) or is_transient(err):
+        return JournalStatus.UNKNOWN
+    if _USED_NONCE_PATTERN.search(str(err)):
+        return JournalStatus.UNKNOWN
+    return JournalStatus.FAILED
+
+
+def get_payments_format(path, payments_format=None):
+    """Returns the given format, or else CSV for `.csv` files and NDJSON for any other."""
+    if payments_format:
+        return payments_format.upper()
+    return ExportFormat.CSV if path.lower().endswith(".csv") else ExportFormat.NDJSON
+
+
+def read_payments(file, payments_format):
+    """Reads and validates every payment, with a `to` address, a `value` in ether and an optional
+    `gas` limit, before anything is sent.
+
+    Raises:
+        ValueError: When any row is not a valid payment.
+    """
+    if payments_format == ExportFormat.CSV:
+        records = csv.DictReader(file)
+    else:
+        records = (json.loads(line) for line in file if line.strip())
+    payments = []
+    for row, record in enumerate(records, start=1):
+        try:
+            payments.append(_to_payment(row, record))
+        except (KeyError, TypeError, ValueError) as err:
+            raise ValueError("Row {} is not a valid payment: {}".format(row, err))
+    return payments
+
+
+def _to_payment(row, record):
+    to = str(record["to"]).strip()
+    if not _ADDRESS_PATTERN.match(to):
+        raise ValueError("'{}' is not an address.".format(to))
+    value = eth_to_wei(record["value"])
+    if value < 0:
+        raise ValueError("the value must not be negative.")
+    gas = record.get("gas")
+    gas = int(gas) if gas not in (None, "") else None
+    return Payment(row, to, value, gas)
+
+
+def get_journal_path(payments_path):
+    return "{}.journal".format(payments_path)
+
+
+class Journal:
+    """The latest entry for each payment row, appended as JSON lines that are synced to disk
+    before `write()` returns. A single instance may be shared between threads."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._file = None
+
+    @classmethod
+    def load(cls, path):
+        journal = cls(path)
+        try:
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    # A line cut short by a crash never finished its write, so it is ignored.
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    journal.entries[entry["row"]] = entry
+        except FileNotFoundError:
+            pass
+        return journal
+
+    def get_max_nonce(self):
+        nonces = [entry["nonce"] for entry in self.entries.values()]
+        return max(nonces) if nonces else None
+
+    def write(self, payment, nonce, status, tx_hash=None, error=None):
+        entry = {
+            "row": payment.row,
+            "to": payment.to,
+            "value": payment.value,
+            "nonce": nonce,
+            "status": status,
+            "tx_hash": tx_hash,
+            "error": error,
+        }
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.entries[payment.row] = entry
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def reconcile(journal, confirmed_nonce, get_transaction):
+    """Checks the payments that were assigned or unknown and whose nonce is below the account's
+    transaction count at the latest block by looking up their journaled transaction with
+    `get_transaction`, which returns None for one the node does not know. A payment whose
+    transaction was mined is journaled as sent. Any other payment was not sent with that nonce,
+    since the nonce was used by another transaction, so it is journaled as failed and `plan()` gives
+    it a new nonce.
+
+    Returns:
+        (tuple): The rows journaled as sent and the rows journaled as failed.
+
+    Raises:
+        ValueError: When a payment may have been sent but has no transaction hash to check.
+    """
+    sent = []
+    failed = []
+    for entry in list(journal.entries.values()):
+        if entry["status"] not in (JournalStatus.ASSIGNED, JournalStatus.UNKNOWN):
+            continue
+        if entry["nonce"] >= confirmed_nonce:
+            continue
+        payment = Payment(entry["row"], entry["to"], entry["value"], None)
+        tx_hash = entry["tx_hash"]
+        if tx_hash is None and entry["status"] == JournalStatus.UNKNOWN:
+            raise ValueError(
+                "Row {} may have been sent, but {} has no transaction hash to check it with. "
+                "Check the account's transaction with nonce {}.".format(
+                    entry["row"], journal.path, entry["nonce"]
+                )
+            )
+        # A payment without a hash was never signed, so it cannot have been sent.
+        transaction = get_transaction(tx_hash) if tx_hash else None
+        if transaction is not None and transaction.blockHash:
+            journal.write(payment, entry["nonce"], JournalStatus.SENT, tx_hash)
+            sent.append(entry["row"])
+        else:
+            error = "Nonce {} was used by another transaction.".format(entry["nonce"])
+            journal.write(payment, entry["nonce"], JournalStatus.FAILED, tx_hash, error)
+            failed.append(entry["row"])
+    return sent, failed
+
+
+class NonceGate:
+    """Stops handing out nonces above one whose payment failed, since the chain would never
+    include their transactions before the lower nonce is used. A single instance may be shared
+    between threads."""
+
+    def __init__(self):
+        self.failed_nonce = None
+        self._lock = threading.Lock()
+
+    def fail(self, nonce):
+        with self._lock:
+            if self.failed_nonce is None or nonce < self.failed_nonce:
+                self.failed_nonce = nonce
+
+    def is_open(self, nonce):
+        with self._lock:
+            return self.failed_nonce is None or nonce < self.failed_nonce
+
+
+class NonceManager:
+    """Hands out consecutive nonces. A single instance may be shared between threads."""
+
+    def __init__(self, next_nonce):
+        self.next_nonce = next_nonce
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            nonce = self.next_nonce
+            self.next_nonce += 1
+            return nonce
+
+
+def plan(payments, journal, nonce_manager, confirmed_nonce):
+    """Returns the payments that are not sent yet with their nonces, in nonce order: the journaled
+    nonce for a payment that was tried before, unless that nonce is below the account's
+    transaction count at the latest block, else a new one. Call `reconcile()` first, so that the
+    payments sent with such a nonce are journaled as sent.
+
+    Raises:
+        ValueError: When the journal is of different payments.
+    """
+    planned = []
+    for payment in payments:
+        entry = journal.entries.get(payment.row)
+        if entry is not None and (entry["to"] != payment.to or entry["value"] != payment.value):
+            raise ValueError(
+                "Row {} does not match the journal {}. Was the payments file changed?".format(
+                    payment.row, journal.path
+                )
+            )
+        if entry is None or (
+            entry["status"] != JournalStatus.SENT and entry["nonce"] < confirmed_nonce
+        ):
+            planned.append(PlannedPayment(payment, nonce_manager.take(), True))
+        elif entry["status"] != JournalStatus.SENT:
+            planned.append(PlannedPayment(payment, entry["nonce"], False))
+    return sorted(planned, key=lambda planned_payment: planned_payment.nonce)
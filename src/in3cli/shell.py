@@ -0,0 +1,144 @@
+"""An interactive shell that runs commands with one shared state, so that the client, the account
+and the node list stay warm between commands."""
+import re
+import shlex
+import signal
+from collections import OrderedDict
+
+import click
+from in3cli.util import get_invoked_commands
+
+PROMPT = "in3> "
+_EXIT_COMMANDS = ("exit", "quit")
+_HISTORY_LENGTH = 1000
+_MAX_RECENT_VALUES = 100
+_RECENT_VALUE_PATTERN = re.compile(r"^(0x[0-9a-fA-F]{8,}|\S+\.eth)$")
+_ACCOUNT_OPTIONS = ("--account", "--name", "-n")
+
+
+class Shell:
+    def __init__(self, cli, state, history_path=None):
+        self.cli = cli
+        self.state = state
+        self.history_path = history_path
+        self._recent_values = OrderedDict()
+
+    @property
+    def recent_values(self):
+        """Hashes, addresses and ENS names used in earlier commands, most recent first."""
+        return list(reversed(self._recent_values))
+
+    def run(self):
+        """Reads and runs commands until the user exits."""
+        readline = self._setup_readline()
+        previous_handler = signal.signal(signal.SIGINT, signal.default_int_handler)
+        try:
+            while True:
+                try:
+                    line = input(PROMPT)
+                except EOFError:
+                    click.echo()
+                    break
+                except KeyboardInterrupt:
+                    click.echo()
+                    continue
+                if not self.run_line(line):
+                    break
+        finally:
+            signal.signal(signal.SIGINT, previous_handler)
+            if readline and self.history_path:
+                readline.write_history_file(self.history_path)
+
+    def run_line(self, line):
+        """Runs a single line. Returns False when the line asks to exit the shell."""
+        try:
+            args = shlex.split(line)
+        except ValueError as err:
+            click.echo("Error: {}".format(err), err=True)
+            return True
+        if not args:
+            return True
+        if args[0] in _EXIT_COMMANDS:
+            return False
+        invoked = get_invoked_commands(self.cli, args)
+        if invoked and invoked[0][0] == "shell":
+            click.echo("Already in the shell.", err=True)
+            return True
+
+        self._remember_values(args)
+        self.state.reset()
+        try:
+            self.cli.main(args=args, prog_name="in3", obj=self.state, standalone_mode=False)
+        except click.ClickException as err:
+            err.show()
+        except click.Abort:
+            click.echo("Aborted!", err=True)
+        except KeyboardInterrupt:
+            click.echo(err=True)
+        except SystemExit:
+            pass
+        return True
+
+    def get_completions(self, preceding_text, text):
+        """Returns the completions for the word `text`, which follows `preceding_text`."""
+        try:
+            tokens = shlex.split(preceding_text)
+        except ValueError:
+            return []
+        if tokens and tokens[-1] in _ACCOUNT_OPTIONS:
+            candidates = self._get_account_names()
+        else:
+            invoked = get_invoked_commands(self.cli, tokens)
+            command = invoked[-1][1] if invoked else self.cli
+            if text.startswith("-"):
+                candidates = [opt for param in command.params for opt in param.opts]
+            elif isinstance(command, click.MultiCommand):
+                candidates = command.list_commands(None)
+            else:
+                candidates = self.recent_values
+            if not tokens:
+                candidates = candidates + list(_EXIT_COMMANDS)
+        return [c for c in candidates if c.startswith(text)]
+
+    def _remember_values(self, args):
+        for arg in args:
+            if _RECENT_VALUE_PATTERN.match(arg):
+                self._recent_values.pop(arg, None)
+                self._recent_values[arg] = None
+        while len(self._recent_values) > _MAX_RECENT_VALUES:
+            self._recent_values.popitem(last=False)
+
+    @staticmethod
+    def _get_account_names():
+        from in3cli.account import get_all_accounts
+
+        try:
+            return [account.name for account in get_all_accounts()]
+        except Exception:
+            return []
+
+    def _setup_readline(self):
+        try:
+            import readline
+        except ImportError:
+            # Not available on every platform; the shell still works without history or completion.
+            return None
+
+        def completer(text, index):
+            preceding_text = readline.get_line_buffer()[: readline.get_begidx()]
+            completions = self.get_completions(preceding_text, text)
+            return completions[index] if index < len(completions) else None
+
+        readline.set_completer(completer)
+        readline.set_completer_delims(" \t\n")
+        if "libedit" in (readline.__doc__ or ""):
+            readline.parse_and_bind("bind ^I rl_complete")
+        else:
+            readline.parse_and_bind("tab: complete")
+        readline.set_history_length(_HISTORY_LENGTH)
+        if self.history_path:
+            try:
+                readline.read_history_file(self.history_path)
+            except OSError:
+                pass
+        return readline
@@ -1,21 +1,27 @@
+import calendar
 import csv
 import datetime
+import decimal
 import io
 import json
+import math
 import os
 import shutil
-import time
+import tempfile
 from collections import OrderedDict
 from os import path
 
 import click
-import in3.exception as in3err
-from in3cli.error import In3CliChainTimeoutError
 
 _PADDING_SIZE = 3
+_DATE_FORMATS = [
+    date_format + offset
+    for date_format in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d")
+    for offset in ("%z", "")
+]
 
 
-WEI_PER_ETH = 10000000000000000000.0
+WEI_PER_ETH = 10 ** 18
 WEI_PER_GWEI = 1000000000.0
 
 
@@ -28,7 +34,19 @@ def wei_to_eth(wei):
 
 
 def eth_to_wei(eth):
-    return eth * WEI_PER_ETH
+    """Converts an amount of ether, preferably given as a string, to a whole number of wei without
+    going through floats.
+
+    Raises:
+        ValueError: When the amount is not a number or not a whole number of wei.
+    """
+    try:
+        wei = decimal.Decimal(str(eth).strip()) * WEI_PER_ETH
+    except decimal.InvalidOperation:
+        raise ValueError("'{}' is not an amount of ether.".format(eth))
+    if not wei.is_finite() or wei != wei.to_integral_value():
+        raise ValueError("'{}' is not a whole number of wei.".format(eth))
+    return int(wei)
 
 
 def print_dict(d):
@@ -77,11 +95,39 @@ def print_dict_as_csv(obj_dict):
     click.echo(output)
 
 
+def get_percentile(sorted_values, percent):
+    """Returns the nearest-rank percentile of already sorted values, or None if there are none."""
+    if not sorted_values:
+        return None
+    rank = math.ceil(percent / 100.0 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
 def convert_timestamp_to_date_str(timestamp):
     date = datetime.datetime.utcfromtimestamp(timestamp)
     return date.strftime("%Y-%m-%d %H:%M:%S")
 
 
+def convert_date_str_to_timestamp(date_str):
+    """Parses a Unix timestamp or an ISO 8601 date, such as `2026-01-01`, `2026-01-01 12:00:00` or
+    `2026-01-01T12:00:00+02:00`. Dates without an offset are in UTC."""
+    date_str = date_str.strip()
+    if date_str.isdigit():
+        return int(date_str)
+    if date_str.endswith(("Z", "z")):
+        date_str = date_str[:-1] + "+0000"
+    elif len(date_str) > 6 and date_str[-6] in "+-" and date_str[-3] == ":":
+        date_str = date_str[:-3] + date_str[-2:]
+    for date_format in _DATE_FORMATS:
+        try:
+            date = datetime.datetime.strptime(date_str, date_format)
+        except ValueError:
+            continue
+        offset = date.utcoffset() or datetime.timedelta(0)
+        return calendar.timegm(date.replace(tzinfo=None).timetuple()) - int(offset.total_seconds())
+    raise ValueError("'{}' is not a Unix timestamp or an ISO 8601 date.".format(date_str))
+
+
 def does_user_agree(prompt):
     """Prompts the user and checks if they said yes. If command has the `yes_option` flag, and
     `-y/--yes` is passed, this will always return `True`.
@@ -106,6 +152,22 @@ def get_user_project_path(*subdirs):
     return result_path
 
 
+def write_file_atomically(file_path, text):
+    """Writes the file through a temporary file in the same directory that then replaces it, so
+    readers never see a partially written file."""
+    fd, temp_path = tempfile.mkstemp(dir=path.dirname(file_path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
 def to_bool(val):
     def _error():
         raise ValueError("{} not supported for to_bool() method.".format(type(val)))
@@ -214,17 +276,17 @@ def format_string_list_to_columns(string_list, max_width=None):
     click.echo()
 
 
-def run_with_timeout(func):
-    res = None
-    tries = 0
-    max_tries = 5
-    while res is None:
-        try:
-            res = func()
-        except in3err.ClientException:
-            time.sleep(1)
-            tries += 1
-            if tries == max_tries:
-                raise In3CliChainTimeoutError("block")
+def get_invoked_commands(command, args):
+    """Returns the `(name, command)` pairs for the (sub)commands that the given arguments invoke,
+    skipping options and their values."""
+    invoked = []
+    for arg in args:
+        if not isinstance(command, click.MultiCommand):
+            break
+        if arg.startswith("-"):
             continue
-    return res
+        sub_command = command.get_command(None, arg)
+        if sub_command is not None:
+            invoked.append((arg, sub_command))
+            command = sub_command
+    return invoked
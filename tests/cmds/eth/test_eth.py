@@ -1,6 +1,35 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from in3 import ClientException
+from in3.eth.model import Block
+
+from in3cli.chain_cache import ChainCache
 from in3cli.enums import Chain
+from in3cli.header_index import HeaderIndex
 from in3cli.main import cli
 from tests.conftest import TEST_BLOCK
+from tests.conftest import create_test_tx
+from tests.test_header_index import create_block as create_indexable_block
+
+
+@pytest.fixture
+def cached_state(cli_state, tmp_path):
+    cli_state.chain = Chain.MAINNET
+    cli_state.chain_cache = ChainCache(str(tmp_path / "chain.db"))
+    yield cli_state
+    cli_state.chain_cache.close()
+
+
+@pytest.fixture
+def indexed_state(cli_state, tmp_path):
+    cli_state.chain = Chain.MAINNET
+    cli_state.header_index = HeaderIndex(str(tmp_path / "headers"))
+    yield cli_state
+    cli_state.header_index.close()
 
 
 def test_show_gas_price(runner, cli_state):
@@ -10,6 +39,44 @@ def test_show_gas_price(runner, cli_state):
     assert res.output == "{} Gwei\n".format(expected_value)
 
 
+def _create_gas_block(block_num, **kwargs):
+    tx = create_test_tx()
+    tx.gasPrice = block_num * 10 ** 9
+    return Block(
+        **dict(
+            TEST_BLOCK.__dict__, number=block_num, transactions=[tx], gasUsed=block_num, gasLimit=10
+        )
+    )
+
+
+def test_gas_stats_prints_gas_price_percentiles_of_latest_blocks(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.block_number.return_value = 10
+    cli_state.client.eth.block_by_number.side_effect = _create_gas_block
+    res = runner.invoke(cli, "eth gas-stats -n 4 -f CSV", obj=cli_state)
+    rows = read_csv_rows(res.output)
+    assert rows[2] == {"Gas Price (Gwei)": "8.0", "Percentile": "P50"}
+    assert cli_state.client.eth.block_by_number.call_count == 4
+
+
+def test_gas_stats_when_histogram_prints_blocks_per_gas_used_range(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.block_by_number.side_effect = _create_gas_block
+    res = runner.invoke(cli, "eth gas-stats --to 10 -n 4 --report histogram -f CSV", obj=cli_state)
+    rows = read_csv_rows(res.output)
+    assert [row["Blocks"] for row in rows] == ["0"] * 7 + ["1", "1", "2"]
+    assert rows[0]["Gas Used"] == "0-10%"
+
+
+def test_gas_stats_when_blocks_prints_median_of_each_block(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.block_by_number.side_effect = _create_gas_block
+    res = runner.invoke(cli, "eth gas-stats --to 2 -n 2 --report blocks -f CSV", obj=cli_state)
+    rows = read_csv_rows(res.output)
+    assert [row["Median Gas Price (Gwei)"] for row in rows] == ["1.0", "2.0"]
+    assert [row["Gas Used (%)"] for row in rows] == ["10.0", "20.0"]
+
+
 def test_show_block_errors_when_given_both_num_and_hash(runner, cli_state):
     res = runner.invoke(cli, "eth show-block --block-num 123 --hash 456")
     assert (
@@ -37,6 +104,35 @@ def test_show_block_uses_hash(runner, cli_state, mock_block):
     assert_expected_block(res)
 
 
+def test_show_block_when_block_indexed_does_not_fetch_it(runner, indexed_state):
+    indexed_state.header_index.set_head(Chain.MAINNET, 1000)
+    indexed_state.header_index.put(Chain.MAINNET, create_indexable_block(123))
+    res = runner.invoke(cli, "eth show-block --block-num 123", obj=indexed_state)
+    assert "0x{:064x}".format(123) in res.output
+    assert not indexed_state.client.eth.block_by_number.called
+
+
+def test_show_block_when_latest_indexes_final_blocks_fetched_later(runner, indexed_state):
+    indexed_state.create_client.return_value = indexed_state.client
+    indexed_state.client.eth.block_number.return_value = 1000
+    indexed_state.client.eth.block_by_number.side_effect = lambda num, **kwargs: (
+        create_indexable_block(num)
+    )
+    runner.invoke(cli, "eth show-block", obj=indexed_state)
+    runner.invoke(cli, "eth list-blocks --from 900 --to 901", obj=indexed_state)
+    assert indexed_state.header_index.get(Chain.MAINNET, 900).number == 900
+    assert indexed_state.header_index.get(Chain.MAINNET, 1000) is None
+
+
+def test_list_blocks_when_blocks_indexed_does_not_fetch_them(runner, indexed_state):
+    indexed_state.header_index.set_head(Chain.MAINNET, 1000)
+    for block_num in (10, 11):
+        indexed_state.header_index.put(Chain.MAINNET, create_indexable_block(block_num))
+    res = runner.invoke(cli, "eth list-blocks --from 10 --to 11", obj=indexed_state)
+    assert "0x{:064x}".format(11) in res.output
+    assert not indexed_state.client.eth.block_by_number.called
+
+
 def test_show_balance_uses_given_address(runner, cli_state):
     expected_balance = 1098
     expected_address = "0x999888"
@@ -64,9 +160,216 @@ def test_show_balance_when_not_given_address_uses_account_address(runner, cli_st
     assert str(expected_balance) in res.output
 
 
+def test_show_balance_when_given_block_num_queries_at_it(runner, cli_state):
+    cli_state.client.eth.account.balance.return_value = 5
+    res = runner.invoke(cli, "eth show-balance 0x1 -b 100", obj=cli_state)
+    assert res.output == "5\n"
+    cli_state.client.eth.account.balance.assert_called_once_with("0x1", 100)
+
+
+def test_show_balance_when_many_addresses_prints_rows_in_order_once_per_address(
+    runner, cli_state
+):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.account.balance.side_effect = lambda address, at_block: int(address, 16)
+    res = runner.invoke(cli, "eth show-balance 0x2 0x1 0x2 -f CSV", obj=cli_state)
+    rows = read_csv_rows(res.output)
+    assert [row["Address"] for row in rows] == ["0x2", "0x1"]
+    assert [row["Balance (Wei)"] for row in rows] == ["2", "1"]
+
+
+def test_show_balance_when_block_num_is_latest_pins_every_query_to_one_block(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.block_number.return_value = 777
+    cli_state.client.eth.account.balance.return_value = 1
+    res = runner.invoke(
+        cli, "eth show-balance - -b latest -f CSV", input="0x1\n0x2\n", obj=cli_state
+    )
+    rows = read_csv_rows(res.output)
+    assert [row["Block"] for row in rows] == ["777", "777"]
+    for call in cli_state.client.eth.account.balance.call_args_list:
+        assert call[0][1] == 777
+
+
+def test_show_balance_when_many_addresses_pins_every_query_to_latest_block(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.block_number.return_value = 777
+    cli_state.client.eth.account.balance.return_value = 1
+    res = runner.invoke(cli, "eth show-balance 0x1 0x2 -f CSV", obj=cli_state)
+    rows = read_csv_rows(res.output)
+    assert [row["Block"] for row in rows] == ["777", "777"]
+    assert cli_state.client.eth.block_number.call_count == 1
+    for call in cli_state.client.eth.account.balance.call_args_list:
+        assert call[0][1] == 777
+
+
+def test_show_balance_when_all_accounts_includes_account_names(
+    mocker, runner, cli_state, account
+):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.account.balance.return_value = 1
+    account.address = "0xacc"
+    mocker.patch("in3cli.account.get_all_accounts").return_value = [account]
+    res = runner.invoke(cli, "eth show-balance 0x1 --all-accounts -f CSV", obj=cli_state)
+    rows = read_csv_rows(res.output)
+    assert [(row["Address"], row["Account"]) for row in rows] == [
+        ("0x1", ""),
+        ("0xacc", "testcliaccount"),
+    ]
+
+
+def test_show_balance_when_many_addresses_prints_errors_as_rows(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+
+    def get_balance(address, at_block):
+        if address == "bad":
+            raise ValueError("Invalid address")
+        return 1
+
+    cli_state.client.eth.account.balance.side_effect = get_balance
+    res = runner.invoke(cli, "eth show-balance bad 0x1 -f CSV", obj=cli_state)
+    rows = read_csv_rows(res.output)
+    assert [row["Error"] for row in rows] == ["Invalid address", ""]
+    assert rows[0]["Balance (Wei)"] == ""
+    assert res.exit_code == 0
+
+
+def test_block_at_prints_closest_block(runner, cli_state):
+    def get_block(block_num, **kwargs):
+        return Block(**dict(TEST_BLOCK.__dict__, number=block_num, timestamp=1000 + block_num * 10))
+
+    cli_state.client.eth.block_number.return_value = 1000
+    cli_state.client.eth.block_by_number.side_effect = get_block
+    res = runner.invoke(cli, "eth block-at --time 4004 -f CSV", obj=cli_state)
+    assert read_csv_rows(res.output) == [
+        {"Date": "1970-01-01 01:06:40", "Number": "300", "Timestamp": "4000"}
+    ]
+
+
+def test_block_at_when_time_is_invalid_errors(runner, cli_state):
+    res = runner.invoke(cli, "eth block-at --time yesterday", obj=cli_state)
+    assert res.exit_code == 2
+    assert "ISO 8601" in res.output
+
+
+def test_balance_history_writes_sampled_balances_with_changes(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.account.balance.side_effect = lambda address, block_num: block_num * 2
+    res = runner.invoke(
+        cli, "eth balance-history -a 0x1 --from 0 --to 5 --step 2 -f CSV", obj=cli_state
+    )
+    rows = read_csv_rows(res.output)
+    assert [row["Block"] for row in rows] == ["0", "2", "4", "5"]
+    assert [row["Change (Wei)"] for row in rows] == ["", "4", "4", "2"]
+
+
+def test_balance_history_when_changes_writes_change_blocks(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.account.balance.side_effect = lambda address, block_num: int(
+        block_num >= 37
+    )
+    res = runner.invoke(
+        cli, "eth balance-history -a 0x1 --from 0 --to 100 --step 10 --changes", obj=cli_state
+    )
+    rows = [json.loads(line) for line in res.output.splitlines()]
+    assert [row["Block"] for row in rows] == [0, 37]
+
+
+def _create_scan_block(block_num, **kwargs):
+    tx = create_test_tx("TX{}".format(block_num))
+    tx.From = "0xfrom" if block_num % 2 else "0xother"
+    return Block(**dict(TEST_BLOCK.__dict__, number=block_num, transactions=[tx]))
+
+
+def test_scan_prints_matching_transactions_and_removes_checkpoint(runner, cli_state, tmp_path):
+    cli_state.chain = Chain.MAINNET
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.block_by_number.side_effect = _create_scan_block
+    checkpoint = tmp_path / "scan.json"
+    res = runner.invoke(
+        cli,
+        "eth scan -a 0xFROM --from 0 --to 5 --chunk-size 2 --checkpoint {} -f CSV".format(
+            checkpoint
+        ),
+        obj=cli_state,
+    )
+    rows = read_csv_rows(res.output)
+    assert [(row["Hash"], row["Block Number"]) for row in rows] == [
+        ("TX1", "1"),
+        ("TX3", "3"),
+        ("TX5", "5"),
+    ]
+    assert not checkpoint.exists()
+
+
+def test_scan_resumes_from_checkpoint(runner, cli_state, tmp_path):
+    import in3cli.scan as scan_module
+
+    cli_state.chain = Chain.MAINNET
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.block_by_number.side_effect = _create_scan_block
+    address_set = scan_module.AddressSet(["0xfrom"])
+    scan_key = scan_module.get_scan_key(Chain.MAINNET, address_set, 0, 5, 2)
+    checkpoint = scan_module.Checkpoint(scan_module.get_checkpoint_path(scan_key), scan_key)
+    checkpoint.mark_done(0)
+    checkpoint.mark_done(2)
+    res = runner.invoke(
+        cli, "eth scan -a 0xfrom --from 0 --to 5 --chunk-size 2 -f CSV", obj=cli_state
+    )
+    assert "TX5" in res.output
+    assert "TX1" not in res.output
+    assert cli_state.client.eth.block_by_number.call_count == 2
+
+
+def test_scan_when_no_to_block_resumes_up_to_block_of_first_run(runner, cli_state):
+    import in3cli.scan as scan_module
+
+    cli_state.chain = Chain.MAINNET
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.block_by_number.side_effect = _create_scan_block
+    cli_state.client.eth.block_number.return_value = 9
+    address_set = scan_module.AddressSet(["0xfrom"])
+    scan_key = scan_module.get_scan_key(Chain.MAINNET, address_set, 0, None, 2)
+    checkpoint = scan_module.Checkpoint(scan_module.get_checkpoint_path(scan_key), scan_key)
+    checkpoint.to_block = 5
+    checkpoint.mark_done(0)
+    res = runner.invoke(cli, "eth scan -a 0xfrom --from 0 --chunk-size 2 -f CSV", obj=cli_state)
+    assert "TX3" in res.output
+    assert "TX5" in res.output
+    assert "TX7" not in res.output
+    assert not cli_state.client.eth.block_number.called
+
+
+def test_scan_when_table_format_does_not_checkpoint(mocker, runner, cli_state):
+    import in3cli.scan as scan_module
+
+    cli_state.chain = Chain.MAINNET
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.block_by_number.side_effect = _create_scan_block
+    mark_done = mocker.patch.object(scan_module.Checkpoint, "mark_done")
+    res = runner.invoke(cli, "eth scan -a 0xfrom --from 0 --to 5 --chunk-size 2", obj=cli_state)
+    assert "TX5" in res.output
+    assert not mark_done.called
+
+
+def test_scan_when_table_format_and_checkpoint_errors(runner, cli_state, tmp_path):
+    res = runner.invoke(
+        cli,
+        "eth scan -a 0xfrom --from 0 --to 5 --checkpoint {}".format(tmp_path / "scan.json"),
+        obj=cli_state,
+    )
+    assert res.exit_code == 2
+    assert "--checkpoint needs --format CSV or JSON" in res.output
+
+
+def test_scan_when_no_addresses_errors(runner, cli_state):
+    res = runner.invoke(cli, "eth scan --from 0 --to 5", obj=cli_state)
+    assert res.exit_code == 2
+
+
 def test_send_sends_expected_transaction(runner, cli_state):
     value_eth = 0.000123
-    expected_value = int(value_eth * 10000000000000000000.0)
+    expected_value = 123000000000000
     to_address = "0x45666"
     runner.invoke(cli, "eth send -t {} -v {}".format(to_address, value_eth), obj=cli_state)
     tx = cli_state.client.eth.account.send_transaction.call_args[0][1]
@@ -96,6 +399,572 @@ def test_send_when_using_mainnet_returns_etherscan_link_without_chain(runner, cl
     assert expected_url in res.output
 
 
+SEND_BATCH_TO = "0x" + "a" * 40
+
+
+def _write_payments(tmp_path, count):
+    path = tmp_path / "payouts.csv"
+    rows = ["{},{}".format(SEND_BATCH_TO, row) for row in range(1, count + 1)]
+    path.write_text("to,value\n" + "\n".join(rows) + "\n")
+    return path
+
+
+def _get_statuses_by_nonce(output):
+    return {row["Nonce"]: row["Status"] for row in read_csv_rows(output) if row["Status"]}
+
+
+def _read_journal(tmp_path):
+    import in3cli.send_batch as batch
+
+    return batch.Journal.load(str(tmp_path / "payouts.csv.journal")).entries
+
+
+def _setup_send_batch(cli_state, pending_nonce=5, confirmed_nonce=None):
+    from in3cli.client import SignedTransaction
+
+    confirmed_nonce = pending_nonce if confirmed_nonce is None else confirmed_nonce
+    cli_state.assume_yes = True
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.account.transaction_count.side_effect = lambda address, block: (
+        pending_nonce if block == "pending" else confirmed_nonce
+    )
+    cli_state.client.sign_transaction.side_effect = lambda sender, tx: SignedTransaction(
+        "0xRAW{}".format(tx.nonce), "0xTX{}".format(tx.nonce)
+    )
+    send_raw_transaction = cli_state.client.eth.account.send_raw_transaction
+    send_raw_transaction.side_effect = lambda raw: raw.replace("RAW", "TX")
+    return send_raw_transaction
+
+
+def _get_signed_nonces(cli_state):
+    return sorted(c[0][1].nonce for c in cli_state.client.sign_transaction.call_args_list)
+
+
+def _write_journal(payments_path, entries):
+    import in3cli.send_batch as batch
+
+    with open(str(payments_path)) as file:
+        payments = batch.read_payments(file, batch.ExportFormat.CSV)
+    journal = batch.Journal(batch.get_journal_path(str(payments_path)))
+    for row, nonce, status, tx_hash in entries:
+        journal.write(payments[row - 1], nonce, status, tx_hash)
+    journal.close()
+
+
+def test_send_batch_sends_each_row_with_local_nonces_and_journals_them(
+    runner, cli_state, tmp_path
+):
+    _setup_send_batch(cli_state)
+    payments = _write_payments(tmp_path, 3)
+    res = runner.invoke(
+        cli, "eth send-batch --file {} --workers 2 -f CSV".format(payments), obj=cli_state
+    )
+    rows = sorted(read_csv_rows(res.output), key=lambda row: int(row["Row"]))
+    assert [(row["Nonce"], row["Status"], row["Tx Hash"]) for row in rows] == [
+        ("5", "sent", "0xTX5"),
+        ("6", "sent", "0xTX6"),
+        ("7", "sent", "0xTX7"),
+    ]
+    journal = (tmp_path / "payouts.csv.journal").read_text()
+    assert journal.count('"status": "assigned"') == 6
+    assert journal.count('"status": "sent"') == 3
+
+
+def test_send_batch_journals_tx_hash_before_sending(runner, cli_state, tmp_path):
+    send_raw_transaction = _setup_send_batch(cli_state)
+
+    def send_raw(raw):
+        journaled.update(_read_journal(tmp_path)[1])
+        return raw
+
+    journaled = {}
+    send_raw_transaction.side_effect = send_raw
+    payments = _write_payments(tmp_path, 1)
+    runner.invoke(cli, "eth send-batch --file {} -f CSV".format(payments), obj=cli_state)
+    assert (journaled["status"], journaled["tx_hash"]) == ("assigned", "0xTX5")
+    send_raw_transaction.assert_called_once_with("0xRAW5")
+
+
+def test_send_batch_when_resumed_resends_unsent_rows_with_same_nonces(
+    runner, cli_state, tmp_path
+):
+    import in3cli.send_batch as batch
+
+    send_raw_transaction = _setup_send_batch(cli_state, pending_nonce=6)
+    payments_path = _write_payments(tmp_path, 3)
+    _write_journal(
+        payments_path,
+        [(1, 5, batch.JournalStatus.SENT, "0xTX5"), (2, 6, batch.JournalStatus.ASSIGNED, None)],
+    )
+    res = runner.invoke(
+        cli, "eth send-batch --file {} -f CSV".format(payments_path), obj=cli_state
+    )
+    rows = sorted(read_csv_rows(res.output), key=lambda row: int(row["Row"]))
+    assert [(row["Row"], row["Nonce"]) for row in rows] == [("2", "6"), ("3", "7")]
+    assert send_raw_transaction.call_count == 2
+
+
+def test_send_batch_when_send_fails_journals_failure_and_skips_higher_nonces(
+    runner, cli_state, tmp_path
+):
+    send_raw_transaction = _setup_send_batch(cli_state)
+
+    def send_raw(raw):
+        if raw == "0xRAW6":
+            raise ValueError("insufficient funds for gas * price + value")
+        return raw
+
+    send_raw_transaction.side_effect = send_raw
+    payments = _write_payments(tmp_path, 3)
+    res = runner.invoke(
+        cli, "eth send-batch --file {} --workers 1 -f CSV".format(payments), obj=cli_state
+    )
+    assert _get_statuses_by_nonce(res.output) == {"5": "sent", "6": "failed", "7": "skipped"}
+    assert "1 payments failed; 1 payments with higher nonces were not sent" in res.output
+    assert send_raw_transaction.call_count == 2
+    journal = _read_journal(tmp_path)
+    assert [journal[row]["status"] for row in (1, 2, 3)] == ["sent", "failed", "assigned"]
+
+
+def test_send_batch_when_signing_fails_journals_failure(runner, cli_state, tmp_path):
+    send_raw_transaction = _setup_send_batch(cli_state)
+    cli_state.client.sign_transaction.side_effect = ValueError("gas required exceeds allowance")
+    payments = _write_payments(tmp_path, 1)
+    res = runner.invoke(cli, "eth send-batch --file {} -f CSV".format(payments), obj=cli_state)
+    assert _get_statuses_by_nonce(res.output) == {"5": "failed"}
+    assert not send_raw_transaction.called
+    assert _read_journal(tmp_path)[1]["tx_hash"] is None
+
+
+def test_send_batch_when_nonce_already_used_journals_unknown_with_tx_hash(
+    runner, cli_state, tmp_path
+):
+    send_raw_transaction = _setup_send_batch(cli_state)
+    send_raw_transaction.side_effect = ClientException("nonce too low")
+    payments = _write_payments(tmp_path, 1)
+    res = runner.invoke(cli, "eth send-batch --file {} -f CSV".format(payments), obj=cli_state)
+    assert _get_statuses_by_nonce(res.output) == {"5": "unknown"}
+    assert "1 payments may or may not have been sent" in res.output
+    assert "failed" not in res.output
+    entry = _read_journal(tmp_path)[1]
+    assert (entry["status"], entry["tx_hash"]) == ("unknown", "0xTX5")
+
+
+def test_send_batch_when_resumed_marks_payments_with_mined_transactions_sent(
+    runner, cli_state, tmp_path
+):
+    import in3cli.send_batch as batch
+
+    _setup_send_batch(cli_state, pending_nonce=7, confirmed_nonce=6)
+    cli_state.client.eth.transaction_by_hash.return_value.blockHash = "0xBLOCK"
+    payments_path = _write_payments(tmp_path, 3)
+    _write_journal(
+        payments_path,
+        [
+            (1, 5, batch.JournalStatus.UNKNOWN, "0xTX5"),
+            (2, 6, batch.JournalStatus.UNKNOWN, "0xTX6"),
+            (3, 7, batch.JournalStatus.ASSIGNED, None),
+        ],
+    )
+    res = runner.invoke(
+        cli, "eth send-batch --file {} -f CSV".format(payments_path), obj=cli_state
+    )
+    assert "1 payments were already sent" in res.output
+    cli_state.client.eth.transaction_by_hash.assert_called_once_with("0xTX5")
+    assert _get_signed_nonces(cli_state) == [6, 7]
+    journal = _read_journal(tmp_path)
+    assert [journal[row]["status"] for row in (1, 2, 3)] == ["sent", "sent", "sent"]
+
+
+def test_send_batch_when_nonce_used_by_other_transaction_sends_with_new_nonce(
+    runner, cli_state, tmp_path
+):
+    import in3cli.send_batch as batch
+
+    _setup_send_batch(cli_state, pending_nonce=7, confirmed_nonce=7)
+    cli_state.client.eth.transaction_by_hash.side_effect = ClientException(
+        "Transaction not found or non-existent."
+    )
+    payments_path = _write_payments(tmp_path, 2)
+    _write_journal(
+        payments_path,
+        [
+            (1, 5, batch.JournalStatus.UNKNOWN, "0xTX5"),
+            (2, 6, batch.JournalStatus.SENT, "0xTX6"),
+        ],
+    )
+    res = runner.invoke(
+        cli, "eth send-batch --file {} -f CSV".format(payments_path), obj=cli_state
+    )
+    assert "1 payments were not sent, since other transactions used their nonces" in res.output
+    assert _get_signed_nonces(cli_state) == [7]
+    entry = _read_journal(tmp_path)[1]
+    assert (entry["nonce"], entry["status"], entry["tx_hash"]) == (7, "sent", "0xTX7")
+
+
+def test_send_batch_when_unknown_payment_has_no_tx_hash_sends_nothing(
+    runner, cli_state, tmp_path
+):
+    import in3cli.send_batch as batch
+
+    send_raw_transaction = _setup_send_batch(cli_state, pending_nonce=6)
+    payments_path = _write_payments(tmp_path, 1)
+    _write_journal(payments_path, [(1, 5, batch.JournalStatus.UNKNOWN, None)])
+    res = runner.invoke(cli, "eth send-batch --file {}".format(payments_path), obj=cli_state)
+    assert "Row 1 may have been sent" in res.output
+    assert not send_raw_transaction.called
+
+
+def test_send_batch_when_all_sent_sends_nothing(runner, cli_state, tmp_path):
+    send_raw_transaction = _setup_send_batch(cli_state)
+    payments = _write_payments(tmp_path, 1)
+    runner.invoke(cli, "eth send-batch --file {}".format(payments), obj=cli_state)
+    res = runner.invoke(cli, "eth send-batch --file {}".format(payments), obj=cli_state)
+    assert "already sent" in res.output
+    assert send_raw_transaction.call_count == 1
+
+
+def test_send_batch_when_payments_invalid_sends_nothing(runner, cli_state, tmp_path):
+    send_raw_transaction = _setup_send_batch(cli_state)
+    path = tmp_path / "payouts.csv"
+    path.write_text("to,value\n{},1\nnot-an-address,1\n".format(SEND_BATCH_TO))
+    res = runner.invoke(cli, "eth send-batch --file {}".format(path), obj=cli_state)
+    assert "Row 2" in res.output
+    assert not send_raw_transaction.called
+
+
+def _create_block(number):
+    return Block(**dict(TEST_BLOCK.__dict__, number=number, hash="HASH{}".format(number)))
+
+
+def test_list_blocks_prints_blocks_in_range_in_order(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.block_by_number.side_effect = lambda num, **kwargs: _create_block(num)
+    res = runner.invoke(
+        cli, "eth list-blocks --from 5 --to 9 --workers 3 --batch-size 2 -f CSV", obj=cli_state
+    )
+    lines = res.output.splitlines()
+    number_index = lines[0].split(",").index("Number")
+    assert len(lines) == 6
+    assert [line.split(",")[number_index] for line in lines[1:]] == ["5", "6", "7", "8", "9"]
+
+
+def test_list_blocks_when_no_to_uses_latest_block(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.block_number.return_value = 11
+    cli_state.client.eth.block_by_number.side_effect = lambda num, **kwargs: _create_block(num)
+    res = runner.invoke(cli, "eth list-blocks --from 10 -f JSON", obj=cli_state)
+    assert '"Number": 10' in res.output
+    assert '"Number": 11' in res.output
+
+
+def test_list_blocks_when_from_after_to_errors(runner, cli_state):
+    res = runner.invoke(cli, "eth list-blocks --from 10 --to 9", obj=cli_state)
+    assert "--from (10) must not be after --to (9)." in res.output
+
+
+def test_export_blocks_writes_ndjson_rows_in_order(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.block_by_number.side_effect = lambda num, **kwargs: _create_block(num)
+    res = runner.invoke(cli, "eth export-blocks --from 5 --to 9 --workers 3", obj=cli_state)
+    rows = [json.loads(line) for line in res.output.splitlines()]
+    assert [row["Number"] for row in rows] == [5, 6, 7, 8, 9]
+    assert rows[0]["Parent Hash"] == TEST_BLOCK.parentHash
+
+
+def test_export_blocks_when_txs_writes_transaction_rows(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.block_by_number.side_effect = lambda num, **kwargs: Block(
+        **dict(TEST_BLOCK.__dict__, number=num, transactions=[create_test_tx("TX{}".format(num))])
+    )
+    res = runner.invoke(cli, "eth export-blocks --from 1 --to 2 --txs -f CSV", obj=cli_state)
+    lines = res.output.splitlines()
+    assert lines[0].startswith("Block Number,Block Hash,Transaction Index,Hash,From")
+    assert lines[1].startswith("1,HASH,0,TX1,0xfrom")
+    assert lines[2].startswith("2,HASH,0,TX2,0xfrom")
+
+
+def test_export_blocks_writes_compressed_file(runner, cli_state, tmp_path):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.block_by_number.side_effect = lambda num, **kwargs: _create_block(num)
+    path = tmp_path / "blocks.csv.gz"
+    res = runner.invoke(
+        cli, "eth export-blocks --from 1 --to 3 -f CSV -o {}".format(path), obj=cli_state
+    )
+    assert "Exported 3 rows to {}.".format(path) in res.output
+    with gzip.open(str(path), "rt") as file:
+        assert len(file.read().splitlines()) == 4
+
+
+def test_export_blocks_when_from_after_to_errors(runner, cli_state):
+    res = runner.invoke(cli, "eth export-blocks --from 10 --to 9", obj=cli_state)
+    assert "--from (10) must not be after --to (9)." in res.output
+
+
+def test_export_blocks_when_processes_exports_sharded(mocker, runner, cli_state):
+    cli_state.client.eth.block_number.return_value = 100
+    cli_state.account_name = "acc"
+    cli_state.chain = Chain.KOVAN
+    export_sharded = mocker.patch("in3cli.block_export.export_sharded", return_value=101)
+    res = runner.invoke(
+        cli, "eth export-blocks --from 0 -p 4 -o blocks.csv.xz -f CSV", obj=cli_state
+    )
+    export_sharded.assert_called_once_with(
+        "acc",
+        Chain.KOVAN,
+        0,
+        100,
+        False,
+        "CSV",
+        "blocks.csv.xz",
+        "xz",
+        4,
+        8,
+        10,
+        False,
+        cli_state.retrier,
+        False,
+    )
+    assert "Exported 101 rows to blocks.csv.xz." in res.output
+
+
+def test_export_blocks_when_manifest_and_stdout_errors(runner, cli_state):
+    res = runner.invoke(cli, "eth export-blocks --from 0 --to 1 --manifest", obj=cli_state)
+    assert "--manifest requires --output to be a file." in res.output
+
+
+def test_show_block_when_follow_prints_blocks_as_ndjson(mocker, runner, cli_state):
+    blocks = [_create_block(5), _create_block(6)]
+    follow = mocker.patch("in3cli.follow.BlockFollower.follow", return_value=iter(blocks))
+    res = runner.invoke(cli, "eth show-block --follow -b 5", obj=cli_state)
+    rows = [json.loads(line) for line in res.output.splitlines()]
+    assert [row["Number"] for row in rows] == [5, 6]
+    assert rows[0]["Parent Hash"] == TEST_BLOCK.parentHash
+    follow.assert_called_once_with(5)
+
+
+def test_show_block_when_follow_interrupted_stops_cleanly(mocker, runner, cli_state):
+    import os
+    import signal
+
+    def follow(start_block_num):
+        yield _create_block(5)
+        os.kill(os.getpid(), signal.SIGINT)
+        yield _create_block(6)
+
+    mocker.patch("in3cli.follow.BlockFollower.follow", side_effect=follow)
+    previous_handler = signal.getsignal(signal.SIGINT)
+    res = runner.invoke(cli, "eth show-block --follow", obj=cli_state)
+    assert res.exit_code == 0
+    assert [json.loads(line)["Number"] for line in res.output.splitlines()] == [5]
+    assert signal.getsignal(signal.SIGINT) is previous_handler
+
+
+def test_show_block_when_follow_and_format_errors(runner, cli_state):
+    res = runner.invoke(cli, "eth show-block --follow -f JSON", obj=cli_state)
+    assert "cannot be used together: --format, --follow" in res.output
+
+
+def test_show_block_when_follow_and_txs_includes_transactions(mocker, runner, cli_state):
+    block = Block(**dict(TEST_BLOCK.__dict__, transactions=[create_test_tx("TX1")]))
+    mocker.patch("in3cli.follow.BlockFollower.follow", return_value=iter([block]))
+    res = runner.invoke(cli, "eth show-block --follow --txs", obj=cli_state)
+    row = json.loads(res.output)
+    assert [tx["Hash"] for tx in row["Transactions"]] == ["TX1"]
+
+
+def test_show_block_when_follow_fetches_blocks_with_given_txs(mocker, runner, cli_state):
+    follower = mocker.patch("in3cli.follow.BlockFollower")
+    follower.return_value.follow.return_value = iter([])
+    cli_state.client.eth.block_by_number.return_value = TEST_BLOCK
+    runner.invoke(cli, "eth show-block --follow --txs", obj=cli_state)
+    get_block = follower.call_args[0][1]
+    get_block(9)
+    cli_state.client.eth.block_by_number.assert_called_once_with(9, get_full_block=True)
+
+
+def test_show_block_when_txs_without_follow_errors(runner, cli_state):
+    res = runner.invoke(cli, "eth show-block --txs", obj=cli_state)
+    assert "--txs requires --follow." in res.output
+
+
+def test_show_block_when_follow_and_hash_errors(runner, cli_state):
+    res = runner.invoke(cli, "eth show-block --follow --hash 0x1", obj=cli_state)
+    assert "--hash" in res.output
+    assert "--follow" in res.output
+
+
+def test_show_block_when_final_block_cached_does_not_fetch_it(runner, cached_state):
+    cached_state.chain_cache.put_block(Chain.MAINNET, TEST_BLOCK, full=True, final=True)
+    res = runner.invoke(cli, "eth show-block --block-num 9", obj=cached_state)
+    assert_expected_block(res)
+    assert not cached_state.client.eth.block_by_number.called
+
+
+def test_show_block_caches_final_block(runner, cached_state):
+    cached_state.client.eth.block_number.return_value = 100
+    cached_state.client.eth.block_by_number.return_value = TEST_BLOCK
+    runner.invoke(cli, "eth show-block --block-num 9", obj=cached_state)
+    res = runner.invoke(cli, "eth show-block --block-num 9", obj=cached_state)
+    assert_expected_block(res)
+    assert cached_state.client.eth.block_by_number.call_count == 1
+
+
+def test_show_block_when_block_not_final_fetches_it_again(runner, cached_state):
+    cached_state.client.eth.block_number.return_value = 10
+    cached_state.client.eth.block_by_number.return_value = TEST_BLOCK
+    runner.invoke(cli, "eth show-block --block-num 9", obj=cached_state)
+    runner.invoke(cli, "eth show-block --block-num 9", obj=cached_state)
+    assert cached_state.client.eth.block_by_number.call_count == 2
+
+
+def test_show_block_when_hash_cached_does_not_fetch_it(runner, cached_state):
+    cached_state.client.eth.block_by_hash.return_value = TEST_BLOCK
+    runner.invoke(cli, "eth show-block --hash HASH", obj=cached_state)
+    res = runner.invoke(cli, "eth show-block --hash HASH", obj=cached_state)
+    assert_expected_block(res)
+    assert cached_state.client.eth.block_by_hash.call_count == 1
+
+
+def test_show_block_when_no_cache_given_disables_cache(runner, cached_state):
+    cached_state.chain_cache.put_block(Chain.MAINNET, TEST_BLOCK, full=True, final=True)
+    cached_state.client.eth.block_by_number.return_value = TEST_BLOCK
+    runner.invoke(cli, "eth show-block --block-num 9 --no-cache", obj=cached_state)
+    assert cached_state.use_cache is False
+
+
+def test_list_txs_prints_transactions(runner, cli_state):
+    block = Block(**dict(TEST_BLOCK.__dict__, transactions=[create_test_tx("TX1")] * 3))
+    cli_state.client.eth.block_by_number.return_value = block
+    res = runner.invoke(cli, "eth list-txs -b 9 -f CSV", obj=cli_state)
+    lines = res.output.splitlines()
+    assert lines[0] == "Amount,Block Hash,From,To"
+    assert len(lines) == 4
+    cli_state.client.eth.block_by_number.assert_called_once_with(9, get_full_block=True)
+
+
+def test_list_txs_when_hashes_only_fetches_light_block_and_prints_hashes(runner, cli_state):
+    block = Block(**dict(TEST_BLOCK.__dict__, transactions=["TX1", "TX2"]))
+    cli_state.client.eth.block_by_number.return_value = block
+    res = runner.invoke(cli, "eth list-txs -b 9 --hashes-only", obj=cli_state)
+    assert res.output == "TX1\nTX2\n"
+    cli_state.client.eth.block_by_number.assert_called_once_with(9, get_full_block=False)
+
+
+def test_list_txs_when_hashes_only_and_json_prints_hash_records(runner, cli_state):
+    block = Block(**dict(TEST_BLOCK.__dict__, transactions=["TX1"]))
+    cli_state.client.eth.block_by_number.return_value = block
+    res = runner.invoke(cli, "eth list-txs -b 9 --hashes-only -f JSON", obj=cli_state)
+    assert json.loads(res.output) == {"Hash": "TX1"}
+
+
+def test_list_txs_when_final_block_cached_does_not_fetch_it(runner, cached_state):
+    block = Block(**dict(TEST_BLOCK.__dict__, transactions=[create_test_tx("TX1")]))
+    cached_state.chain_cache.put_block(Chain.MAINNET, block, full=True, final=True)
+    res = runner.invoke(cli, "eth list-txs --block-num 9 -f CSV", obj=cached_state)
+    assert "0xfrom" in res.output
+    assert not cached_state.client.eth.block_by_number.called
+
+
+def test_show_tx_when_final_tx_cached_does_not_fetch_it(runner, cached_state):
+    cached_state.chain_cache.put_transaction(Chain.MAINNET, create_test_tx("TX1"), final=True)
+    res = runner.invoke(cli, "eth show-tx TX1", obj=cached_state)
+    assert "0xfrom" in res.output
+    assert not cached_state.client.eth.transaction_by_hash.called
+
+
+def test_show_tx_caches_tx_when_its_block_is_final(runner, cached_state):
+    cached_state.client.eth.transaction_by_hash.return_value = create_test_tx("TX1")
+    cached_state.client.eth.block_by_hash.return_value = TEST_BLOCK
+    cached_state.client.eth.block_number.return_value = 100
+    runner.invoke(cli, "eth show-tx TX1", obj=cached_state)
+    res = runner.invoke(cli, "eth show-tx TX1", obj=cached_state)
+    assert "0xfrom" in res.output
+    assert cached_state.client.eth.transaction_by_hash.call_count == 1
+
+
+def test_show_tx_when_block_of_tx_cached_does_not_fetch_block(runner, cached_state):
+    cached_state.chain_cache.put_block(Chain.MAINNET, TEST_BLOCK, full=False, final=False)
+    tx = create_test_tx("TX1")
+    tx.blockHash = TEST_BLOCK.hash
+    cached_state.client.eth.transaction_by_hash.return_value = tx
+    cached_state.client.eth.block_number.return_value = 100
+    runner.invoke(cli, "eth show-tx TX1", obj=cached_state)
+    res = runner.invoke(cli, "eth show-tx TX1", obj=cached_state)
+    assert "0xfrom" in res.output
+    assert not cached_state.client.eth.block_by_hash.called
+    assert cached_state.client.eth.transaction_by_hash.call_count == 1
+
+
+def test_show_tx_when_lookup_fails_otherwise_errors(runner, cli_state):
+    cli_state.client.eth.transaction_by_hash.side_effect = ClientException("Error connect")
+    res = runner.invoke(cli, "eth show-tx TX1", obj=cli_state)
+    assert "Error connect" in res.output
+
+
+def test_show_tx_when_many_hashes_prints_rows_in_input_order_once_per_hash(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.transaction_by_hash.side_effect = create_test_tx
+    res = runner.invoke(cli, "eth show-tx TX2 TX1 TX2 -f CSV --workers 2", obj=cli_state)
+    assert [row["Hash"] for row in read_csv_rows(res.output)] == ["TX2", "TX1"]
+    assert cli_state.client.eth.transaction_by_hash.call_count == 2
+
+
+def test_show_tx_reads_hashes_from_stdin(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.transaction_by_hash.side_effect = create_test_tx
+    res = runner.invoke(cli, "eth show-tx - -f CSV", input="TX1\n\nTX2\n", obj=cli_state)
+    rows = read_csv_rows(res.output)
+    assert [row["Hash"] for row in rows] == ["TX1", "TX2"]
+    assert rows[0]["From"] == "0xfrom"
+
+
+def test_show_tx_reads_hashes_from_file(runner, cli_state, tmp_path):
+    cli_state.create_client.return_value = cli_state.client
+    cli_state.client.eth.transaction_by_hash.side_effect = create_test_tx
+    hash_file = tmp_path / "hashes.txt"
+    hash_file.write_text("TX1\nTX2\n")
+    res = runner.invoke(
+        cli, "eth show-tx --file {} --unordered -f CSV".format(hash_file), obj=cli_state
+    )
+    rows = read_csv_rows(res.output)
+    assert sorted(row["Hash"] for row in rows) == ["TX1", "TX2"]
+
+
+def test_show_tx_when_many_hashes_prints_errors_as_rows(runner, cli_state):
+    cli_state.create_client.return_value = cli_state.client
+
+    def get_tx(tx_hash):
+        if tx_hash == "BAD":
+            raise ValueError("Invalid hash")
+        if tx_hash == "MISSING":
+            raise ClientException("Transaction not found or non-existent.")
+        return create_test_tx(tx_hash)
+
+    cli_state.client.eth.transaction_by_hash.side_effect = get_tx
+    res = runner.invoke(cli, "eth show-tx BAD MISSING TX1 -f CSV", obj=cli_state)
+    rows = read_csv_rows(res.output)
+    assert [row["Error"] for row in rows] == ["Invalid hash", "Transaction not found.", ""]
+    assert rows[0]["From"] == ""
+    assert res.exit_code == 0
+
+
+def test_show_tx_when_single_hash_not_found_errors(runner, cli_state):
+    cli_state.client.eth.transaction_by_hash.side_effect = ClientException(
+        "Transaction not found or non-existent."
+    )
+    res = runner.invoke(cli, "eth show-tx TX1", obj=cli_state)
+    assert "Transaction TX1 not found." in res.output
+
+
+def test_show_tx_when_no_hashes_errors(runner, cli_state):
+    res = runner.invoke(cli, "eth show-tx", obj=cli_state)
+    assert res.exit_code == 2
+
+
+def read_csv_rows(output):
+    return list(csv.DictReader(io.StringIO(output)))
+
 
 def assert_expected_block(res):
     assert "Number" in res.output
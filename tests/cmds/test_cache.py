@@ -0,0 +1,51 @@
+import pytest
+
+from in3cli.chain_cache import ChainCache
+from in3cli.enums import Chain
+from in3cli.header_index import HeaderIndex
+from in3cli.main import cli
+from tests.conftest import TEST_BLOCK
+from tests.test_header_index import create_block as create_indexable_block
+
+
+@pytest.fixture
+def chain_cache():
+    cache = ChainCache(max_size_mb=1)
+    yield cache
+    cache.close()
+
+
+def test_stats_when_empty_says_so(runner, chain_cache):
+    res = runner.invoke(cli, "cache stats")
+    assert "The cache is empty." in res.output
+
+
+def test_stats_prints_counts_per_chain(runner, chain_cache):
+    chain_cache.put_block(Chain.MAINNET, TEST_BLOCK, full=False, final=True)
+    res = runner.invoke(cli, "cache stats -f CSV")
+    lines = res.output.splitlines()
+    assert "Blocks,Chain,Provisional Blocks,Size (MB),Transactions" in lines
+    assert lines[-1].startswith("1,{},0,".format(Chain.MAINNET))
+
+
+def test_clear_when_given_chain_clears_only_that_chain(runner, chain_cache):
+    chain_cache.put_block(Chain.MAINNET, TEST_BLOCK, full=False, final=True)
+    chain_cache.put_block(Chain.KOVAN, TEST_BLOCK, full=False, final=True)
+    res = runner.invoke(cli, "cache clear --chain kovan")
+    assert "Cleared the cache for kovan." in res.output
+    assert list(chain_cache.get_stats()) == [Chain.MAINNET]
+
+
+def test_clear_clears_every_chain(runner, chain_cache):
+    chain_cache.put_block(Chain.MAINNET, TEST_BLOCK, full=False, final=True)
+    runner.invoke(cli, "cache clear")
+    assert chain_cache.get_stats() == {}
+
+
+def test_clear_clears_header_index(runner, chain_cache):
+    header_index = HeaderIndex()
+    header_index.set_head(Chain.MAINNET, 1000)
+    header_index.put(Chain.MAINNET, create_indexable_block(1))
+    header_index.close()
+    runner.invoke(cli, "cache clear")
+    assert HeaderIndex().get(Chain.MAINNET, 1) is None
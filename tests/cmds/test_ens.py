@@ -11,7 +11,7 @@ TEST_DOMAIN_NAME = "test.eth"
 
 
 def test_hash_returns_expected_address(runner, cli_state):
-    cli_state.client.ens_namehash.return_value = TEST_ADDRESS
+    cli_state.offline_client.ens_namehash.return_value = TEST_ADDRESS
     res = runner.invoke(cli, "ens hash {}".format(TEST_DOMAIN_NAME), obj=cli_state)
     assert TEST_ADDRESS in res.output
 
@@ -20,7 +20,7 @@ def test_hash_prints_format_error_when_not_given_top_level_domain(runner, cli_st
     def side_effect(*args, **kwargs):
         raise EnsDomainFormatException()
 
-    cli_state.client.ens_namehash.side_effect = side_effect
+    cli_state.offline_client.ens_namehash.side_effect = side_effect
     res = runner.invoke(cli, "ens hash TEST", obj=cli_state)
     assert str(EnsNameFormatError("TEST")) in res.output
 
@@ -31,7 +31,7 @@ def test_hash_prints_not_found_error_when_not_given_top_level_domain(runner, cli
     def side_effect(*args, **kwargs):
         raise ClientException(err_text)
 
-    cli_state.client.ens_namehash.side_effect = side_effect
+    cli_state.offline_client.ens_namehash.side_effect = side_effect
     res = runner.invoke(cli, "ens hash {}".format(TEST_DOMAIN_NAME), obj=cli_state)
     assert str(EnsNameNotFoundError(TEST_DOMAIN_NAME)) in res.output
 
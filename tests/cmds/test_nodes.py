@@ -0,0 +1,62 @@
+import pytest
+from in3 import NodeList
+
+from in3cli.enums import Chain
+from in3cli.main import cli
+from in3cli.node_probe import NodeProbeResult
+
+import tests.conftest as tconf
+
+
+@pytest.fixture
+def mock_probe_nodes(mocker):
+    return mocker.patch("in3cli.node_probe.probe_nodes")
+
+
+@pytest.fixture
+def probe_state(mocker, cli_state):
+    node_list = NodeList(
+        [tconf.create_test_node(tconf.TEST_URL_1), tconf.create_test_node(tconf.TEST_URL_2)],
+        tconf.TEST_ACCOUNT,
+        "reg_id",
+        999,
+        14,
+    )
+    cli_state.chain = Chain.MAINNET
+    cli_state.client.refresh_node_list = mocker.Mock(return_value=node_list)
+    cli_state.client.account.ignore_ssl_errors = False
+    return cli_state
+
+
+def test_probe_probes_every_node(runner, probe_state, mock_probe_nodes):
+    mock_probe_nodes.return_value = []
+    runner.invoke(cli, "nodes probe --samples 3 --workers 2", obj=probe_state)
+    mock_probe_nodes.assert_called_once_with(
+        [tconf.TEST_URL_1, tconf.TEST_URL_2], 3, 5, 2, False
+    )
+
+
+def test_probe_outputs_ranked_results(runner, probe_state, mock_probe_nodes):
+    mock_probe_nodes.return_value = [
+        NodeProbeResult(tconf.TEST_URL_2, 1.0, [10.0, 20.0]),
+        NodeProbeResult(tconf.TEST_URL_1, errors=2),
+    ]
+    res = runner.invoke(cli, "nodes probe -f CSV", obj=probe_state)
+    lines = res.output.splitlines()
+    assert lines[0] == "Connect (ms),Error Rate,Rank,URL,p50 (ms),p90 (ms),p99 (ms)"
+    assert lines[1] == "1.0,0%,1,{},10.0,20.0,20.0".format(tconf.TEST_URL_2)
+    assert lines[2] == ",100%,2,{},,,".format(tconf.TEST_URL_1)
+
+
+def test_probe_saves_results(mocker, runner, probe_state, mock_probe_nodes):
+    mock_probe_nodes.return_value = [NodeProbeResult(tconf.TEST_URL_1, 1.0, [5.0])]
+    saver = mocker.patch("in3cli.node_probe.save_results")
+    runner.invoke(cli, "nodes probe", obj=probe_state)
+    saver.assert_called_once_with(Chain.MAINNET, mock_probe_nodes.return_value)
+
+
+def test_probe_when_no_save_does_not_save(mocker, runner, probe_state, mock_probe_nodes):
+    mock_probe_nodes.return_value = []
+    saver = mocker.patch("in3cli.node_probe.save_results")
+    runner.invoke(cli, "nodes probe --no-save", obj=probe_state)
+    assert not saver.call_count
@@ -3,12 +3,14 @@ from click.testing import CliRunner
 from in3 import client
 from in3.eth.model import Account
 from in3.eth.model import Block
+from in3.eth.model import Transaction
 from in3.model import In3Node
 
 from in3cli.account import In3Account
 from in3cli.config import ConfigAccessor
 from in3cli.enums import Chain
 from in3cli.options import CliState
+from in3cli.retry import Retrier
 
 TEST_ADDRESS = "0x12222f5555f2d32c76cba645297bb2a939577777777777abb749200000000000"
 TEST_URL_1 = "www.example.com"
@@ -24,6 +26,16 @@ TEST_DEPOSIT_GWEI = 1000000099.0
 TEST_ACCOUNT = Account(TEST_ADDRESS, 0, None, None)
 
 
+@pytest.fixture(autouse=True)
+def user_home(monkeypatch, tmp_path):
+    """Keeps the config and caches that commands write under ~/.in3cli out of the real home."""
+    project_dir = tmp_path / "home" / ".in3cli"
+    project_dir.mkdir(parents=True)
+    (project_dir / "config.cfg").write_text("[Internal]\ndefault_account = __DEFAULT__\n")
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    return tmp_path / "home"
+
+
 @pytest.fixture
 def in3_mock(mocker):
     return mocker.MagicMock(spec=client)
@@ -62,6 +74,29 @@ def mock_block():
     return TEST_BLOCK
 
 
+def create_test_tx(tx_hash="TX", block_hash="HASH"):
+    return Transaction(
+        From="0xfrom",
+        to="0xto",
+        gas=21000,
+        gasPrice=1,
+        hash=tx_hash,
+        nonce=0,
+        transactionIndex=0,
+        blockHash=block_hash,
+        value=10 ** 18,
+        input="0x",
+        publicKey=None,
+        standardV=None,
+        raw=None,
+        creates=None,
+        chainId=1,
+        r=1,
+        s=2,
+        v=27,
+    )
+
+
 def create_test_node(url=None):
     return In3Node(
         url or TEST_URL_1,
@@ -116,6 +151,10 @@ def cli_state(mocker, in3_mock, account):
     mock_state._client = in3_mock
     mock_state.account = account
     mock_state.assume_yes = False
+    mock_state.chain_cache = None
+    mock_state.header_index = None
+    mock_state.retrier = Retrier()
+    mock_state.retry_count = 0
     return mock_state
 
 
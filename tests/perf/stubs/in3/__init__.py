@@ -0,0 +1,84 @@
+"""A stand-in for the native `in3` library, used by the startup benchmarks so that they measure
+the CLI itself and never touch the network."""
+from in3.eth.model import Account
+from in3.exception import ClientException  # noqa: F401
+from in3.exception import IN3BaseException  # noqa: F401
+from in3.model import In3Node
+from in3.model import NodeList
+
+
+class _Object:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class ClientConfig:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+_BLOCK = _Object(
+    author="0xauthor",
+    number=9,
+    hash="0xhash",
+    parentHash="0xparent",
+    nonce=1,
+    sha3Uncles=[],
+    logsBloom="0x0",
+    transactionsRoot="0xroot",
+    stateRoot="0xstate",
+    miner="0xminer",
+    difficulty=10,
+    totalDifficulty=100,
+    extraData="0x",
+    size=1000,
+    gasLimit=1000000,
+    gasUsed=1000,
+    timestamp=1234567889,
+    transactions=[],
+    uncles=[],
+)
+
+
+class _Eth:
+    def block_number(self):
+        return _BLOCK.number
+
+    def block_by_number(self, block_num, get_full_block=False):
+        return _BLOCK
+
+    def block_by_hash(self, block_hash, get_full_block=False):
+        return _BLOCK
+
+    def gas_price(self):
+        return 1
+
+
+class Client:
+    def __init__(self, chain="mainnet", in3_config=None, **kwargs):
+        self.eth = _Eth()
+
+    def refresh_node_list(self):
+        node = In3Node(
+            "https://in3.example.com",
+            Account("0xnode", 1),
+            0,
+            1000000000,
+            29,
+            3600,
+            1234567889,
+            2000,
+        )
+        return NodeList([node], Account("0xregistry", 1), "0xregistryid", 9, 1)
+
+    def ens_namehash(self, domain_name):
+        return "0xnamehash"
+
+    def ens_address(self, domain_name, registry=None):
+        return "0xaddress"
+
+    def ens_owner(self, domain_name, registry=None):
+        return "0xowner"
+
+    def ens_resolver(self, domain_name, registry=None):
+        return "0xresolver"
@@ -0,0 +1,3 @@
+class NewTransaction:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
@@ -0,0 +1,6 @@
+class Account:
+    def __init__(self, address, chain_id, secret=None, domain=None):
+        self.address = address
+        self.chain_id = chain_id
+        self.secret = secret
+        self.domain = domain
@@ -0,0 +1,10 @@
+class IN3BaseException(Exception):
+    pass
+
+
+class ClientException(IN3BaseException):
+    pass
+
+
+class EnsDomainFormatException(IN3BaseException):
+    pass
@@ -0,0 +1,19 @@
+class In3Node:
+    def __init__(self, url, address, index, deposit, props, timeout, registerTime, weight):
+        self.url = url
+        self.address = address
+        self.index = index
+        self.deposit = deposit
+        self.props = props
+        self.timeout = timeout
+        self.registerTime = registerTime
+        self.weight = weight
+
+
+class NodeList:
+    def __init__(self, nodes, contract, registryId, lastBlockNumber, totalServers):
+        self.nodes = nodes
+        self.contract = contract
+        self.registryId = registryId
+        self.lastBlockNumber = lastBlockNumber
+        self.totalServers = totalServers
@@ -0,0 +1,157 @@
+"""Cold-start benchmarks for each command path.
+
+Every command is run in a fresh interpreter against a stubbed `in3` module. Its import budget is
+always checked: it fails when it imports one of its forbidden modules, or more modules than its
+stored baseline times `module_budget_factor`, which does not depend on the machine. Timings do, so
+they are only checked when `IN3CLI_PERF` is set: each command is then measured for wall-clock time
+and for the cumulative import time reported by `-X importtime`, and fails when it goes over its
+budget, which is its stored baseline times `budget_factor`.
+
+To check the timings, run:
+
+    IN3CLI_PERF=1 pytest tests/perf
+
+To record new baselines after an intended change, run:
+
+    IN3CLI_UPDATE_BASELINES=1 pytest tests/perf
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import in3cli
+
+_PERF_DIR = os.path.dirname(__file__)
+_STUBS_DIR = os.path.join(_PERF_DIR, "stubs")
+_BASELINES_PATH = os.path.join(_PERF_DIR, "baselines.json")
+_SRC_DIR = os.path.dirname(os.path.dirname(in3cli.__file__))
+_RUNS = 3
+_PERF_ENV_VAR = "IN3CLI_PERF"
+_UPDATE_BASELINES_ENV_VAR = "IN3CLI_UPDATE_BASELINES"
+
+_TEST_CONFIG = """[Internal]
+default_account = bench
+
+[bench]
+address = 0x0000000000000000000000000000000000000001
+ignore-ssl-errors = False
+chain = mainnet
+"""
+
+_ENTRY_POINT = "from in3cli.main import main; main()"
+
+
+def _load_baselines():
+    with open(_BASELINES_PATH, encoding="utf-8") as file:
+        return json.load(file)
+
+
+_BASELINES = _load_baselines()
+
+
+@pytest.fixture(scope="module")
+def bench_env(tmp_path_factory):
+    home = tmp_path_factory.mktemp("home")
+    project_dir = home / ".in3cli"
+    project_dir.mkdir()
+    (project_dir / "config.cfg").write_text(_TEST_CONFIG)
+    env = dict(os.environ)
+    env["HOME"] = str(home)
+    env["PYTHONPATH"] = os.pathsep.join([_STUBS_DIR, _SRC_DIR])
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def _parse_import_times(stderr):
+    """Returns the total cumulative import time in microseconds and the imported module names."""
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # The header line.
+        stripped_name = name.strip()
+        modules.add(stripped_name)
+        if name.startswith(" ") and not name.startswith("  "):
+            # Only top-level imports; nested ones are already part of their parent's cumulative.
+            total_us += int(cumulative)
+    return total_us, modules
+
+
+def _run_command(args, env, expected_output):
+    cmd = [sys.executable, "-X", "importtime", "-c", _ENTRY_POINT] + args
+    start = time.perf_counter()
+    result = subprocess.run(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    wall_ms = (time.perf_counter() - start) * 1000
+    stderr = result.stderr.decode("utf-8", errors="replace")
+    errors = [line for line in stderr.splitlines() if not line.startswith("import time:")]
+    assert result.returncode == 0 and not errors, "\n".join(errors)
+    assert expected_output in result.stdout.decode("utf-8"), result.stdout
+    import_us, modules = _parse_import_times(stderr)
+    return wall_ms, import_us / 1000, modules
+
+
+def _measure(args, env, expected_output):
+    # Warm the bytecode cache so the first run does not skew the results.
+    _run_command(args, env, expected_output)
+    runs = [_run_command(args, env, expected_output) for _ in range(_RUNS)]
+    wall_ms = min(run[0] for run in runs)
+    import_ms = min(run[1] for run in runs)
+    return wall_ms, import_ms, runs[0][2]
+
+
+def _update_baseline(name, **values):
+    baselines = _load_baselines()
+    baselines["commands"][name].update(values)
+    with open(_BASELINES_PATH, "w", encoding="utf-8") as file:
+        json.dump(baselines, file, indent=4)
+        file.write("\n")
+
+
+@pytest.mark.parametrize("name", sorted(_BASELINES["commands"]))
+def test_command_stays_within_import_budget(bench_env, name):
+    baseline = _BASELINES["commands"][name]
+    _, _, modules = _run_command(baseline["args"], bench_env, baseline["expected_output"])
+    unexpected_modules = sorted(
+        m for m in modules for prefix in baseline["forbidden_imports"] if m.split(".")[0] == prefix
+    )
+    assert not unexpected_modules, "'{}' imported: {}".format(name, unexpected_modules)
+    if os.environ.get(_UPDATE_BASELINES_ENV_VAR):
+        _update_baseline(name, modules=len(modules))
+        return
+
+    budget = int(baseline["modules"] * _BASELINES["module_budget_factor"])
+    assert len(modules) <= budget, "'{}' imported {} modules; the budget is {}.".format(
+        name, len(modules), budget
+    )
+
+
+@pytest.mark.skipif(
+    not os.environ.get(_PERF_ENV_VAR) and not os.environ.get(_UPDATE_BASELINES_ENV_VAR),
+    reason="Set {} to check startup timings.".format(_PERF_ENV_VAR),
+)
+@pytest.mark.parametrize("name", sorted(_BASELINES["commands"]))
+def test_command_startup_is_within_budget(bench_env, name):
+    baseline = _BASELINES["commands"][name]
+    wall_ms, import_ms, _ = _measure(baseline["args"], bench_env, baseline["expected_output"])
+    if os.environ.get(_UPDATE_BASELINES_ENV_VAR):
+        _update_baseline(name, wall_ms=round(wall_ms, 1), import_ms=round(import_ms, 1))
+        return
+
+    factor = _BASELINES["budget_factor"]
+    assert import_ms <= baseline["import_ms"] * factor, (
+        "'{}' spent {:.1f} ms importing modules; the budget is {:.1f} ms.".format(
+            name, import_ms, baseline["import_ms"] * factor
+        )
+    )
+    assert wall_ms <= baseline["wall_ms"] * factor, (
+        "'{}' took {:.1f} ms to run; the budget is {:.1f} ms.".format(
+            name, wall_ms, baseline["wall_ms"] * factor
+        )
+    )
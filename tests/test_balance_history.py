@@ -0,0 +1,50 @@
+import threading
+
+import in3cli.balance_history as balance_history
+
+
+class FakeBalances:
+    """Balances that change at the given blocks, counting the lookups."""
+
+    def __init__(self, changes):
+        self.changes = changes
+        self.lookups = []
+        self._lock = threading.Lock()
+
+    def get_balance(self, block_num):
+        with self._lock:
+            self.lookups.append(block_num)
+        return sum(amount for changed_at, amount in self.changes.items() if changed_at <= block_num)
+
+
+def test_get_sample_block_nums_ends_with_to_block():
+    assert list(balance_history.get_sample_block_nums(0, 10, 4)) == [0, 4, 8, 10]
+
+
+def test_get_sample_block_nums_when_step_divides_range_does_not_repeat_to_block():
+    assert list(balance_history.get_sample_block_nums(0, 8, 4)) == [0, 4, 8]
+
+
+def test_iter_samples_yields_balances_in_order():
+    balances = FakeBalances({5: 100})
+    samples = balance_history.iter_samples(balances.get_balance, 0, 10, 4, workers=3)
+    assert list(samples) == [(0, 0), (4, 0), (8, 100), (10, 100)]
+
+
+def test_iter_changes_finds_exact_change_blocks():
+    balances = FakeBalances({3: 10, 517: -4, 518: 7, 999: 1})
+    changes = balance_history.iter_changes(balances.get_balance, 0, 1000, 100, workers=4)
+    assert list(changes) == [(0, 0), (3, 10), (517, 6), (518, 13), (999, 14)]
+
+
+def test_iter_changes_only_bisects_steps_that_changed():
+    balances = FakeBalances({517: 1})
+    list(balance_history.iter_changes(balances.get_balance, 0, 1000, 100, workers=4))
+    # 11 samples, and about log2(100) lookups to bisect the one step that changed.
+    assert len(balances.lookups) <= 11 + 7
+
+
+def test_iter_changes_when_balance_never_changes_yields_first_block():
+    balances = FakeBalances({})
+    changes = balance_history.iter_changes(balances.get_balance, 10, 20, 5, workers=2)
+    assert list(changes) == [(10, 0)]
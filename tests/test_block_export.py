@@ -0,0 +1,115 @@
+import json
+from multiprocessing.pool import ThreadPool
+
+import pytest
+from in3.eth.model import Block
+
+import in3cli.block_export as block_export
+import in3cli.model as model
+from in3cli.enums import Chain
+from in3cli.export import Compression
+from in3cli.export import ExportFormat
+from in3cli.header_index import HeaderIndex
+
+import tests.conftest as tconf
+from tests.test_header_index import create_block as create_indexable_block
+
+
+def _create_block(number):
+    return Block(**dict(tconf.TEST_BLOCK.__dict__, number=number, hash="HASH{}".format(number)))
+
+
+@pytest.fixture
+def mock_clients(mocker):
+    client = mocker.MagicMock()
+    client.eth.block_by_number.side_effect = lambda num, **kwargs: _create_block(num)
+    mocker.patch(
+        "in3cli.block_export._get_client_factory", return_value=lambda: client
+    )
+    mocker.patch("in3cli.block_export._create_pool", side_effect=ThreadPool)
+    return client
+
+
+def test_iter_rows_when_header_index_serves_indexed_blocks_and_indexes_others(
+    mock_clients, tmp_path
+):
+    header_index = HeaderIndex(str(tmp_path / "headers"))
+    header_index.set_head(Chain.MAINNET, 1000)
+    header_index.put(Chain.MAINNET, create_indexable_block(3))
+    mock_clients.eth.block_by_number.side_effect = lambda num, **kwargs: create_indexable_block(
+        num
+    )
+    rows = list(
+        block_export.iter_rows(
+            lambda: mock_clients.eth, 3, 4, False, 2, 1, None, header_index, Chain.MAINNET
+        )
+    )
+    assert rows == [
+        model.create_block_export_dict(create_indexable_block(3)),
+        model.create_block_export_dict(create_indexable_block(4)),
+    ]
+    mock_clients.eth.block_by_number.assert_called_once_with(4, get_full_block=False)
+    assert header_index.get(Chain.MAINNET, 4) is not None
+    header_index.close()
+
+
+def test_split_range_splits_into_contiguous_ranges():
+    assert block_export.split_range(1, 10, 3) == [(1, 4), (5, 8), (9, 10)]
+
+
+def test_split_range_respects_min_shard_size():
+    assert block_export.split_range(1, 10, 5, min_shard_size=5) == [(1, 5), (6, 10)]
+
+
+def test_split_range_when_more_shards_than_blocks_gives_one_block_each():
+    assert block_export.split_range(7, 8, 4) == [(7, 7), (8, 8)]
+
+
+def test_get_shard_path_adds_part_and_extensions():
+    path = block_export.get_shard_path("out/blocks.json", 3, ExportFormat.CSV, Compression.GZIP)
+    assert path == "out/blocks.part-00003.csv.gz"
+
+
+def test_iter_rows_yields_rows_in_order(mock_clients):
+    rows = block_export.iter_rows(lambda: mock_clients.eth, 3, 7, False, 3, 2)
+    assert [row["Number"] for row in rows] == [3, 4, 5, 6, 7]
+
+
+def test_export_sharded_merges_shards_in_order(mock_clients, tmp_path):
+    path = tmp_path / "blocks.csv"
+    row_count = block_export.export_sharded(
+        None, Chain.MAINNET, 1, 20, False, ExportFormat.CSV, str(path), Compression.NONE, 2, 2, 1
+    )
+    lines = path.read_text().splitlines()
+    assert row_count == 20
+    assert lines[0] == ",".join(block_export.get_fieldnames(False))
+    assert [int(line.split(",")[0]) for line in lines[1:]] == list(range(1, 21))
+    assert [p.name for p in tmp_path.iterdir() if p.name != "home"] == ["blocks.csv"]
+
+
+def test_export_sharded_when_manifest_leaves_shards_and_manifest(mock_clients, tmp_path):
+    path = tmp_path / "blocks.json"
+    block_export.export_sharded(
+        None,
+        Chain.MAINNET,
+        1,
+        10,
+        False,
+        ExportFormat.NDJSON,
+        str(path),
+        Compression.NONE,
+        1,
+        2,
+        5,
+        manifest=True,
+    )
+    manifest = json.loads(path.read_text())
+    assert manifest["from_block"] == 1
+    assert manifest["to_block"] == 10
+    assert [s["path"] for s in manifest["shards"]] == [
+        "blocks.part-00000.ndjson",
+        "blocks.part-00001.ndjson",
+    ]
+    assert [s["rows"] for s in manifest["shards"]] == [5, 5]
+    second_shard = (tmp_path / "blocks.part-00001.ndjson").read_text().splitlines()
+    assert [json.loads(line)["Number"] for line in second_shard] == [6, 7, 8, 9, 10]
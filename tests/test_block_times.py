@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from in3cli.block_times import BlockTimeIndex
+from in3cli.block_times import BlockTimeSearch
+from in3cli.enums import Chain
+
+
+class FakeChain:
+    """A chain with irregular block times, starting at timestamp 1000."""
+
+    def __init__(self, head=100000, seed=1):
+        rand = random.Random(seed)
+        self.timestamps = [1000]
+        for _ in range(head):
+            self.timestamps.append(self.timestamps[-1] + rand.choice((1, 5, 12, 13, 14, 40)))
+        self.head = head
+
+    def get_timestamp(self, block_num):
+        return self.timestamps[block_num]
+
+    def get_head_block_num(self):
+        return self.head
+
+    def find_closest(self, timestamp):
+        return min(
+            range(len(self.timestamps)), key=lambda n: (abs(self.timestamps[n] - timestamp), n)
+        )
+
+
+@pytest.fixture
+def chain():
+    return FakeChain()
+
+
+def _create_search(chain, index=None):
+    return BlockTimeSearch(chain.get_timestamp, chain.get_head_block_num, index, Chain.MAINNET)
+
+
+@pytest.mark.parametrize("offset", [0, 7, 123456, 654321, 1200000])
+def test_find_returns_closest_block(chain, offset):
+    timestamp = 1000 + offset
+    block_num, block_timestamp = _create_search(chain).find(timestamp)
+    assert block_num == chain.find_closest(timestamp)
+    assert block_timestamp == chain.timestamps[block_num]
+
+
+def test_find_when_before_first_block_returns_first_block(chain):
+    assert _create_search(chain).find(10) == (0, 1000)
+
+
+def test_find_when_after_latest_block_returns_latest_block(chain):
+    assert _create_search(chain).find(10 ** 10) == (chain.head, chain.timestamps[-1])
+
+
+def test_find_uses_far_fewer_requests_than_a_scan(chain):
+    search = _create_search(chain)
+    search.find(1000 + 654321)
+    assert search.requests < 40
+
+
+def test_find_when_index_has_learned_the_range_needs_few_requests(chain):
+    index = BlockTimeIndex()
+    _create_search(chain, index).find(1000 + 654321)
+    search = _create_search(chain, index)
+    block_num, _ = search.find(1000 + 654321 + 60)
+    assert block_num == chain.find_closest(1000 + 654321 + 60)
+    assert search.requests <= 4
+
+
+def test_find_does_not_index_blocks_that_are_not_final(chain):
+    index = BlockTimeIndex()
+    _create_search(chain, index).find(10 ** 10)
+    assert chain.head not in index.numbers
+
+
+def test_index_save_and_load_round_trips_and_merges(tmp_path):
+    path = str(tmp_path / "index.json")
+    first = BlockTimeIndex(path)
+    first.add(10, 100)
+    first.save()
+    second = BlockTimeIndex(path)
+    second.add(5, 50)
+    second.save()
+    loaded = BlockTimeIndex(path)
+    loaded._merge(loaded._read())
+    assert loaded.numbers == [5, 10]
+    assert loaded.find_bracket(70) == ((5, 50), (10, 100))
+
+
+def test_index_find_bracket_when_outside_known_range():
+    index = BlockTimeIndex()
+    index.add(10, 100)
+    assert index.find_bracket(50) == (None, (10, 100))
+    assert index.find_bracket(100) == ((10, 100), None)
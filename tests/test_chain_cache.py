@@ -0,0 +1,306 @@
+import sqlite3
+import threading
+
+import pytest
+from in3.eth.model import Block
+from in3.eth.model import Transaction
+
+from in3cli.chain_cache import ChainCache
+from in3cli.enums import Chain
+
+import tests.conftest as tconf
+
+
+def create_block(number=9, block_hash=None, parent_hash=None, transactions=None):
+    return Block(
+        **dict(
+            tconf.TEST_BLOCK.__dict__,
+            number=number,
+            hash=block_hash or "HASH{}".format(number),
+            parentHash=parent_hash or "HASH{}".format(number - 1),
+            transactions=transactions if transactions is not None else ["TRANS"],
+        )
+    )
+
+
+@pytest.fixture
+def chain_cache(tmp_path):
+    cache = ChainCache(str(tmp_path / "chain.db"), max_size_mb=1)
+    yield cache
+    cache.close()
+
+
+def test_get_block_by_hash_returns_cached_block(chain_cache):
+    chain_cache.put_block(Chain.MAINNET, create_block(), full=False, final=False)
+    block = chain_cache.get_block_by_hash(Chain.MAINNET, "HASH9")
+    assert isinstance(block, Block)
+    assert block.__dict__ == create_block().__dict__
+
+
+def test_get_block_by_hash_when_other_chain_returns_none(chain_cache):
+    chain_cache.put_block(Chain.MAINNET, create_block(), full=False, final=True)
+    assert chain_cache.get_block_by_hash(Chain.KOVAN, "HASH9") is None
+
+
+def test_get_block_by_number_when_not_final_returns_none(chain_cache):
+    chain_cache.put_block(Chain.MAINNET, create_block(), full=False, final=False)
+    assert chain_cache.get_block_by_number(Chain.MAINNET, 9) is None
+
+
+def test_get_block_by_number_when_final_returns_block(chain_cache):
+    chain_cache.put_block(Chain.MAINNET, create_block(), full=False, final=True)
+    assert chain_cache.get_block_by_number(Chain.MAINNET, 9).hash == "HASH9"
+
+
+def test_get_block_when_full_block_wanted_and_only_light_block_cached_returns_none(chain_cache):
+    chain_cache.put_block(Chain.MAINNET, create_block(), full=False, final=True)
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH9", full=True) is None
+    assert chain_cache.get_block_by_number(Chain.MAINNET, 9, full=True) is None
+
+
+def test_put_block_when_full_restores_transactions(chain_cache):
+    block = create_block(transactions=[tconf.create_test_tx("TX1"), tconf.create_test_tx("TX2")])
+    chain_cache.put_block(Chain.MAINNET, block, full=True, final=True)
+    actual = chain_cache.get_block_by_hash(Chain.MAINNET, "HASH9", full=True)
+    assert [tx.hash for tx in actual.transactions] == ["TX1", "TX2"]
+    assert isinstance(actual.transactions[0], Transaction)
+    assert actual.transactions[0].value == 10 ** 18
+
+
+def test_put_block_when_full_and_final_caches_transactions(chain_cache):
+    block = create_block(transactions=[tconf.create_test_tx("TX1")])
+    chain_cache.put_block(Chain.MAINNET, block, full=True, final=True)
+    assert chain_cache.get_transaction(Chain.MAINNET, "TX1").From == "0xfrom"
+
+
+def test_put_block_when_light_block_already_full_keeps_transactions(chain_cache):
+    block = create_block(transactions=[tconf.create_test_tx("TX1")])
+    chain_cache.put_block(Chain.MAINNET, block, full=True, final=False)
+    chain_cache.put_block(Chain.MAINNET, create_block(), full=False, final=True)
+    actual = chain_cache.get_block_by_number(Chain.MAINNET, 9, full=True)
+    assert actual.transactions[0].hash == "TX1"
+
+
+def test_get_transaction_when_not_final_returns_none(chain_cache):
+    chain_cache.put_transaction(Chain.MAINNET, tconf.create_test_tx("TX1"), final=False)
+    assert chain_cache.get_transaction(Chain.MAINNET, "TX1") is None
+
+
+def test_put_evicts_least_recently_used_entries_when_over_max_size(tmp_path):
+    padding = "0" * 200 * 1024
+    chain_cache = ChainCache(str(tmp_path / "chain.db"), max_size_mb=1)
+    for num in range(4):
+        block = create_block(num, "HASH{}".format(num))
+        block.extraData = padding
+        chain_cache.put_block(Chain.MAINNET, block, full=False, final=True)
+    # Using the oldest block makes the second oldest one the least recently used.
+    chain_cache.get_block_by_hash(Chain.MAINNET, "HASH0")
+    block = create_block(4, "HASH4")
+    block.extraData = padding * 2
+    chain_cache.put_block(Chain.MAINNET, block, full=False, final=True)
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH0") is not None
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH1") is None
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH4") is not None
+    assert chain_cache.get_stats()[Chain.MAINNET]["size"] <= 1024 * 1024
+
+
+def test_get_stats_returns_counts_per_chain(chain_cache):
+    block = create_block(transactions=[tconf.create_test_tx("TX1"), tconf.create_test_tx("TX2")])
+    chain_cache.put_block(Chain.MAINNET, block, full=True, final=True)
+    chain_cache.put_block(Chain.KOVAN, create_block(), full=False, final=True)
+    stats = chain_cache.get_stats()
+    assert stats[Chain.MAINNET]["blocks"] == 1
+    assert stats[Chain.MAINNET]["transactions"] == 2
+    assert stats[Chain.KOVAN]["transactions"] == 0
+    assert stats[Chain.KOVAN]["size"] > 0
+
+
+def test_clear_when_given_chain_only_clears_that_chain(chain_cache):
+    chain_cache.put_block(Chain.MAINNET, create_block(), full=False, final=True)
+    chain_cache.put_block(Chain.KOVAN, create_block(), full=False, final=True)
+    chain_cache.clear(Chain.KOVAN)
+    assert list(chain_cache.get_stats()) == [Chain.MAINNET]
+
+
+def test_clear_clears_every_chain(chain_cache):
+    chain_cache.put_block(Chain.MAINNET, create_block(), full=False, final=True)
+    chain_cache.clear()
+    assert chain_cache.get_stats() == {}
+
+
+def test_is_final_requires_confirmations_of_chain(chain_cache):
+    assert chain_cache.is_final(Chain.MAINNET, 36, 100)
+    assert not chain_cache.is_final(Chain.MAINNET, 37, 100)
+    assert chain_cache.is_final(Chain.KOVAN, 80, 100)
+    assert not chain_cache.is_final(Chain.KOVAN, 81, 100)
+
+
+def test_put_block_when_parent_does_not_link_evicts_fork(chain_cache):
+    for num in range(5, 9):
+        chain_cache.put_block(Chain.MAINNET, create_block(num), full=False, final=False)
+    chain_cache.put_block(Chain.MAINNET, create_block(3), full=False, final=True)
+    chain_cache.put_block(
+        Chain.MAINNET, create_block(7, "NEW7", parent_hash="NEW6"), full=False, final=False
+    )
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH5") is not None
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH6") is None
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH7") is None
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH8") is None
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "NEW7") is not None
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH3") is not None
+
+
+def test_put_block_when_child_does_not_link_evicts_fork(chain_cache):
+    chain_cache.put_block(Chain.MAINNET, create_block(5), full=False, final=False)
+    chain_cache.put_block(
+        Chain.MAINNET, create_block(4, "NEW4", parent_hash="HASH3"), full=False, final=False
+    )
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH5") is None
+
+
+def test_put_block_when_same_number_evicts_other_block_and_its_transactions(chain_cache):
+    block = create_block(5, transactions=[tconf.create_test_tx("TX1", "HASH5")])
+    chain_cache.put_block(Chain.MAINNET, block, full=True, final=False)
+    chain_cache.put_block(Chain.MAINNET, create_block(5, "NEW5"), full=False, final=True)
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH5") is None
+    assert chain_cache.get_stats()[Chain.MAINNET]["transactions"] == 0
+
+
+def test_put_block_when_provisional_block_conflicts_with_final_blocks_keeps_them(chain_cache):
+    for num in range(95, 105):
+        chain_cache.put_block(Chain.MAINNET, create_block(num), full=False, final=True)
+    chain_cache.put_block(
+        Chain.MAINNET, create_block(101, "ORPHAN", parent_hash="HASH100"), full=False, final=False
+    )
+    assert chain_cache.get_stats()[Chain.MAINNET]["blocks"] == 11
+    assert chain_cache.get_block_by_number(Chain.MAINNET, 101).hash == "HASH101"
+
+
+def test_put_block_when_fork_evicts_only_provisional_blocks_not_descending_from_block(
+    chain_cache,
+):
+    chain_cache.put_block(Chain.MAINNET, create_block(4), full=False, final=True)
+    for num in range(5, 7):
+        chain_cache.put_block(Chain.MAINNET, create_block(num), full=False, final=False)
+    for num in range(6, 8):
+        block = create_block(num, "NEW{}".format(num), parent_hash="NEW{}".format(num - 1))
+        chain_cache.put_block(Chain.MAINNET, block, full=False, final=False, evict_forks=False)
+    chain_cache.put_block(
+        Chain.MAINNET, create_block(5, "NEW5", parent_hash="HASH4"), full=False, final=False
+    )
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH4") is not None
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH5") is None
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH6") is None
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "NEW6") is not None
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "NEW7") is not None
+
+
+def test_put_block_when_not_evicting_forks_keeps_conflicting_blocks(chain_cache):
+    chain_cache.put_block(Chain.MAINNET, create_block(5), full=False, final=False)
+    chain_cache.put_block(
+        Chain.MAINNET, create_block(5, "UNCLE5"), full=False, final=False, evict_forks=False
+    )
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "HASH5") is not None
+    assert chain_cache.get_block_by_hash(Chain.MAINNET, "UNCLE5") is not None
+
+
+def test_put_block_when_blocks_link_keeps_them(chain_cache):
+    for num in range(5, 9):
+        chain_cache.put_block(Chain.MAINNET, create_block(num), full=False, final=False)
+    assert chain_cache.get_stats()[Chain.MAINNET]["blocks"] == 4
+
+
+def test_put_block_when_final_finalizes_linked_ancestors(chain_cache):
+    block = create_block(5, transactions=[tconf.create_test_tx("TX1", "HASH5")])
+    chain_cache.put_block(Chain.MAINNET, block, full=True, final=False)
+    chain_cache.put_block(Chain.MAINNET, create_block(6), full=False, final=False)
+    assert chain_cache.get_block_by_number(Chain.MAINNET, 5) is None
+    chain_cache.put_block(Chain.MAINNET, create_block(7), full=False, final=True)
+    assert chain_cache.get_block_by_number(Chain.MAINNET, 5).hash == "HASH5"
+    assert chain_cache.get_block_by_number(Chain.MAINNET, 6).hash == "HASH6"
+    assert chain_cache.get_transaction(Chain.MAINNET, "TX1") is not None
+    assert chain_cache.get_stats()[Chain.MAINNET]["provisional"] == 0
+
+
+def test_get_stats_counts_provisional_blocks(chain_cache):
+    chain_cache.put_block(Chain.MAINNET, create_block(5), full=False, final=True)
+    chain_cache.put_block(Chain.MAINNET, create_block(6), full=False, final=False)
+    assert chain_cache.get_stats()[Chain.MAINNET]["provisional"] == 1
+
+
+def test_init_when_cache_has_old_schema_recreates_it(tmp_path):
+    path = str(tmp_path / "chain.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE blocks (chain TEXT, hash TEXT)")
+    conn.commit()
+    conn.close()
+    chain_cache = ChainCache(path, max_size_mb=1)
+    chain_cache.put_block(Chain.MAINNET, create_block(), full=False, final=True)
+    assert chain_cache.get_block_by_number(Chain.MAINNET, 9) is not None
+
+
+def test_put_block_keeps_running_size_through_replaces_and_evictions(chain_cache):
+    block = create_block(5, transactions=[tconf.create_test_tx("TX1", "HASH5")])
+    chain_cache.put_block(Chain.MAINNET, block, full=True, final=False)
+    chain_cache.put_block(Chain.MAINNET, block, full=True, final=True)
+    chain_cache.put_block(Chain.MAINNET, create_block(5, "NEW5"), full=False, final=True)
+    total_size = sum(stats["size"] for stats in chain_cache.get_stats().values())
+    assert chain_cache._get_size() == total_size
+
+
+def test_put_block_when_final_finalizes_transactions_of_cached_provisional_block(chain_cache):
+    block = create_block(5, transactions=[tconf.create_test_tx("TX1", "HASH5")])
+    chain_cache.put_block(Chain.MAINNET, block, full=True, final=False)
+    chain_cache.put_block(Chain.MAINNET, create_block(5), full=False, final=True)
+    assert chain_cache.get_transaction(Chain.MAINNET, "TX1") is not None
+
+
+def test_get_and_put_when_database_locked_skip_cache(tmp_path):
+    path = str(tmp_path / "chain.db")
+    chain_cache = ChainCache(path, max_size_mb=1)
+    chain_cache.put_block(Chain.MAINNET, create_block(5), full=False, final=True)
+    other = sqlite3.connect(path, timeout=0)
+    other.execute("BEGIN EXCLUSIVE")
+    chain_cache._conn.execute("PRAGMA busy_timeout = 0")
+    try:
+        # Readers are not blocked under WAL, so only recording the access is skipped.
+        assert chain_cache.get_block_by_number(Chain.MAINNET, 5) is not None
+        chain_cache.put_block(Chain.MAINNET, create_block(6), full=False, final=True)
+        assert chain_cache.get_transaction(Chain.MAINNET, "TX1") is None
+    finally:
+        other.rollback()
+        other.close()
+    assert chain_cache.get_block_by_number(Chain.MAINNET, 5) is not None
+    assert chain_cache.get_block_by_number(Chain.MAINNET, 6) is None
+    chain_cache.close()
+
+
+def test_init_does_not_sync_on_every_commit(chain_cache):
+    assert chain_cache._conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+def test_put_transaction_when_locked_rolls_back_and_releases_lock(mocker, chain_cache):
+    def fail(*args, **kwargs):
+        chain_cache._conn.execute("BEGIN")
+        raise sqlite3.OperationalError("database is locked")
+
+    mocker.patch.object(chain_cache, "_put_transaction", side_effect=fail)
+    assert chain_cache.put_transaction(Chain.MAINNET, object(), True) is None
+    assert not chain_cache._conn.in_transaction
+    acquired = []
+
+    def acquire():
+        acquired.append(chain_cache._lock.acquire(blocking=False))
+        if acquired[0]:
+            chain_cache._lock.release()
+
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    thread.join()
+    assert acquired == [True]
+
+
+def test_get_block_number_returns_number_of_provisional_block(chain_cache):
+    chain_cache.put_block(Chain.MAINNET, create_block(9), full=False, final=False)
+    assert chain_cache.get_block_number(Chain.MAINNET, "HASH9") == 9
+    assert chain_cache.get_block_number(Chain.MAINNET, "OTHER") is None
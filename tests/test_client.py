@@ -0,0 +1,102 @@
+import pytest
+
+from in3cli.client import CliClient
+from in3cli.client import ETH_ACCOUNT_TTL
+from in3cli.client import ClientPool
+from in3cli.enums import Chain
+
+from .conftest import create_mock_account
+
+
+@pytest.fixture
+def recover(mocker):
+    return mocker.patch.object(CliClient, "recover_eth_account")
+
+
+@pytest.fixture
+def get_password(mocker):
+    mock = mocker.patch("keyring.get_password")
+    mock.return_value = "0xKEY"
+    return mock
+
+
+@pytest.fixture
+def client(get_password):
+    return CliClient(create_mock_account(), Chain.MAINNET)
+
+
+def test_eth_account_reads_private_key_and_recovers_once(client, recover, get_password):
+    assert client.eth_account is client.eth_account
+    assert get_password.call_count == 1
+    recover.assert_called_once_with("0xKEY")
+
+
+def test_eth_account_when_cleared_recovers_again(client, recover):
+    _ = client.eth_account
+    client.clear_eth_account()
+    _ = client.eth_account
+    assert recover.call_count == 2
+
+
+def test_eth_account_when_account_changes_recovers_with_new_account(
+    client, recover, get_password
+):
+    _ = client.eth_account
+    client.account = create_mock_account("other")
+    _ = client.eth_account
+    assert recover.call_count == 2
+    assert get_password.call_args[0][0].endswith("::other")
+
+
+def test_eth_account_when_private_key_stored_recovers_again(mocker, client, recover):
+    mocker.patch("keyring.set_password")
+    mocker.patch("keyring.get_keyring").return_value.priority = 10
+    import in3cli.private_key as private_key
+
+    _ = client.eth_account
+    private_key.set_private_key(client.account, "0xKEY")
+    _ = client.eth_account
+    assert recover.call_count == 2
+
+
+def test_eth_account_when_ttl_expires_recovers_again(mocker, client, recover):
+    monotonic = mocker.patch("in3cli.client.time.monotonic")
+    monotonic.return_value = 1000
+    _ = client.eth_account
+    monotonic.return_value = 1000 + ETH_ACCOUNT_TTL - 1
+    _ = client.eth_account
+    assert recover.call_count == 1
+    monotonic.return_value = 1000 + ETH_ACCOUNT_TTL
+    _ = client.eth_account
+    assert recover.call_count == 2
+
+
+def test_client_pool_keeps_signers_across_commands(mocker, recover, get_password):
+    mocker.patch("in3cli.client.node_cache.get_registry_config").return_value = None
+    pool = ClientPool()
+    _ = pool.get(create_mock_account(), Chain.MAINNET).eth_account
+    _ = pool.get(create_mock_account(), Chain.MAINNET).eth_account
+    assert get_password.call_count == 1
+    assert recover.call_count == 1
+
+
+def test_init_with_node_list_ttl_does_not_read_config(mocker, get_password):
+    get_ttl = mocker.patch("in3cli.node_cache.get_node_list_ttl")
+    get_config = mocker.patch("in3cli.client.node_cache.get_registry_config")
+    get_config.return_value = None
+    CliClient(create_mock_account(), Chain.MAINNET, 60)
+    get_config.assert_called_once_with(Chain.MAINNET, 60)
+    assert not get_ttl.call_count
+
+
+def test_sign_transaction_returns_raw_transaction_and_its_hash(client):
+    import in3.eth
+
+    sender = client.recover_eth_account("0x" + "11" * 32)
+    tx = in3.eth.NewTransaction(
+        to="0x" + "22" * 20, value=1, gasLimit=21000, nonce=5, gasPrice=10 ** 9
+    )
+    signed = client.sign_transaction(sender, tx)
+    # Signed with the chain ID of mainnet, 1, so that v is 37 or 38.
+    assert signed.raw.startswith("0xf86305843b9aca0082520894" + "22" * 20 + "018026a0")
+    assert signed.hash == "0x055f5890dd06f9da2cafeb24810f08d4e5b0d065d349429f29496eee5ca8668f"
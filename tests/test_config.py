@@ -6,6 +6,9 @@ from in3cli.enums import Chain
 from .conftest import MockSection
 from in3cli.config import ConfigAccessor
 from in3cli.config import NoConfigAccountError
+from in3cli.config import _LazyConfigAccessor
+from in3cli.config import load_config_parser
+from in3cli.error import In3CliError
 
 _TEST_ACCOUNT_NAME = "AccountA"
 _TEST_SECOND_ACCOUNT_NAME = "AccountB"
@@ -244,3 +247,97 @@ class TestConfigAccessor:
         assert accessor.get_account(_TEST_ACCOUNT_NAME)[
             ConfigAccessor.IGNORE_SSL_ERRORS_KEY
         ]
+
+
+_TEST_CONFIG = """[Internal]
+default_account = AccountA
+
+[AccountA]
+address = 0x123
+chain = goerli
+"""
+
+
+class TestLoadConfigParser:
+    @pytest.fixture
+    def mock_saver(self):
+        # Use the real `open()` for these tests.
+        return None
+
+    @pytest.fixture
+    def config_path(self, tmp_path):
+        path = tmp_path / "config.cfg"
+        path.write_text(_TEST_CONFIG)
+        return str(path)
+
+    def test_load_config_parser_reads_config_file(self, config_path):
+        parser = load_config_parser(config_path)
+        assert parser["AccountA"][ConfigAccessor.CHAIN_KEY] == Chain.GOERLI
+
+    def test_load_config_parser_when_file_unchanged_uses_snapshot(self, mocker, config_path):
+        load_config_parser(config_path)
+        read = mocker.patch("in3cli.config.ConfigParser.read")
+        parser = load_config_parser(config_path)
+        assert not read.call_count
+        assert parser["AccountA"][ConfigAccessor.ADDRESS_KEY] == "0x123"
+
+    def test_load_config_parser_when_file_changed_reparses(self, config_path):
+        load_config_parser(config_path)
+        with open(config_path, "a") as file:
+            file.write("ignore-ssl-errors = True\n")
+        parser = load_config_parser(config_path)
+        assert parser["AccountA"][ConfigAccessor.IGNORE_SSL_ERRORS_KEY] == "True"
+
+    def test_load_config_parser_writes_snapshot_atomically(self, mocker, config_path):
+        write = mocker.patch("in3cli.config.write_file_atomically")
+        load_config_parser(config_path)
+        write.assert_called_once()
+        assert write.call_args[0][0] == config_path + ".snapshot.json"
+
+    def test_load_config_parser_when_snapshot_cannot_be_written_reads_file(
+        self, mocker, config_path
+    ):
+        mocker.patch("in3cli.config.write_file_atomically").side_effect = PermissionError()
+        parser = load_config_parser(config_path)
+        assert parser["AccountA"][ConfigAccessor.CHAIN_KEY] == Chain.GOERLI
+
+    def test_load_config_parser_when_file_missing_returns_empty_parser(self, tmp_path):
+        parser = load_config_parser(str(tmp_path / "missing.cfg"))
+        assert not parser.sections()
+
+
+class TestLazyConfigAccessor:
+    def test_does_not_load_until_used(self, mocker):
+        loader = mocker.patch("in3cli.config.load_config_parser")
+        accessor = _LazyConfigAccessor()
+        assert not accessor.is_loaded
+        assert not loader.call_count
+
+    def test_loads_once_and_delegates(self, mocker, mock_config_parser):
+        mock_config_parser.sections.return_value = [_INTERNAL, _TEST_ACCOUNT_NAME]
+        loader = mocker.patch("in3cli.config.load_config_parser")
+        loader.return_value = mock_config_parser
+        accessor = _LazyConfigAccessor()
+        accessor.get_account(_TEST_ACCOUNT_NAME)
+        accessor.get_account(_TEST_ACCOUNT_NAME)
+        assert loader.call_count == 1
+        assert accessor.is_loaded
+
+
+@pytest.mark.parametrize("value", ["soon", "-1", "1.5"])
+def test_node_list_ttl_when_not_whole_number_raises_cli_error(tmp_path, value):
+    config_path = tmp_path / "config.cfg"
+    config_path.write_text("[Internal]\nnode_list_ttl = {}\n".format(value))
+    parser = ConfigParser()
+    parser.read(str(config_path))
+    accessor = ConfigAccessor(parser, str(config_path))
+    with pytest.raises(In3CliError, match="node_list_ttl"):
+        _ = accessor.node_list_ttl
+
+
+def test_node_list_ttl_returns_whole_number(tmp_path):
+    config_path = tmp_path / "config.cfg"
+    config_path.write_text("[Internal]\nnode_list_ttl = 60\n")
+    parser = ConfigParser()
+    parser.read(str(config_path))
+    assert ConfigAccessor(parser, str(config_path)).node_list_ttl == 60
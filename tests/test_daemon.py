@@ -0,0 +1,167 @@
+import os
+import threading
+
+import pytest
+
+import in3cli.daemon as daemon_module
+from in3cli.daemon import Daemon
+from in3cli.daemon import forward
+from in3cli.daemon import get_command_path
+from in3cli.main import cli
+
+from .conftest import create_mock_account
+
+
+@pytest.fixture
+def socket_path(mocker, tmp_path):
+    socket_path = str(tmp_path / "d.sock")
+    mocker.patch("in3cli.daemon.get_socket_path").return_value = socket_path
+    return socket_path
+
+
+@pytest.fixture(autouse=True)
+def mock_get_account(mocker):
+    mock = mocker.patch("in3cli.options.get_account")
+    mock.return_value = create_mock_account()
+    return mock
+
+
+@pytest.fixture
+def client_pool(mocker):
+    pool = mocker.MagicMock()
+    pool.get.return_value.eth.gas_price.return_value = 123
+    return pool
+
+
+@pytest.fixture
+def running_daemon(socket_path, client_pool):
+    daemon = Daemon(socket_path, client_pool)
+    thread = threading.Thread(target=daemon.serve)
+    thread.start()
+    for _ in range(100):
+        if daemon_module.is_running(socket_path):
+            break
+        threading.Event().wait(0.01)
+    yield daemon
+    daemon.stop()
+    thread.join()
+
+
+def test_forward_when_no_daemon_returns_none(socket_path):
+    assert forward(["eth", "show-gas-price"]) is None
+
+
+def test_forward_when_disabled_by_env_var_returns_none(monkeypatch, running_daemon):
+    monkeypatch.setenv(daemon_module.NO_DAEMON_ENV_VAR, "1")
+    assert forward(["eth", "show-gas-price"]) is None
+
+
+def test_forward_when_reading_stdin_returns_none(running_daemon):
+    assert forward(["eth", "show-tx", "-"]) is None
+
+
+def test_forward_runs_command_in_daemon(capsys, running_daemon, client_pool):
+    exit_code = forward(["eth", "show-gas-price"])
+    assert exit_code == 0
+    assert capsys.readouterr().out == "123 Gwei\n"
+    assert running_daemon.commands_run == 1
+
+
+def test_forward_reuses_clients_from_pool(running_daemon, client_pool):
+    forward(["eth", "show-gas-price"])
+    forward(["--chain", "goerli", "eth", "show-gas-price"])
+    assert client_pool.get.call_args_list[0][0][1] == "mainnet"
+    assert client_pool.get.call_args_list[1][0][1] == "goerli"
+
+
+def test_forward_when_local_only_command_returns_none(running_daemon):
+    assert forward(["account", "list"]) is None
+    assert running_daemon.commands_run == 0
+
+
+def test_forward_when_following_returns_none(running_daemon):
+    assert forward(["eth", "show-block", "--follow"]) is None
+    assert running_daemon.commands_run == 0
+
+
+def test_get_command_path_skips_options():
+    path = get_command_path(cli, ["--chain", "kovan", "eth", "show-block", "-b", "1"])
+    assert path == ("eth", "show-block")
+
+
+def test_run_returns_exit_code_of_usage_errors(client_pool):
+    response = Daemon("unused", client_pool).run(["eth", "not-a-command"])
+    assert response["exit_code"] == 2
+    assert "No such command" in response["stderr"]
+
+
+def test_handle_request_status_returns_pid_and_client_count(client_pool):
+    client_pool.__len__.return_value = 2
+    response = Daemon("unused", client_pool).handle_request({"type": "status"})
+    assert response["clients"] == 2
+    assert response["pid"]
+
+
+def test_serve_creates_socket_private_to_user(running_daemon, socket_path):
+    import os
+    import stat
+
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) & 0o077 == 0
+
+
+def test_status_is_answered_while_command_runs(running_daemon):
+    with running_daemon._run_lock:
+        assert daemon_module.is_running(running_daemon.socket_path)
+
+
+def test_forward_while_daemon_is_busy_returns_none(running_daemon):
+    with running_daemon._run_lock:
+        assert forward(["eth", "show-gas-price"]) is None
+    assert running_daemon.commands_run == 0
+
+
+def test_forward_when_daemon_does_not_respond_does_not_fall_back(capsys, socket_path):
+    import socket
+
+    def accept_and_close(server):
+        connection, _ = server.accept()
+        with connection, connection.makefile("rb") as reader:
+            reader.readline()
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+        server.listen(1)
+        thread = threading.Thread(target=accept_and_close, args=(server,))
+        thread.start()
+        assert forward(["eth", "show-gas-price"]) == 1
+        thread.join()
+    assert "The daemon did not finish the command" in capsys.readouterr().err
+
+
+def test_run_with_send_sends_output_as_it_is_written(client_pool):
+    messages = []
+    response = Daemon("unused", client_pool).run(["eth", "show-gas-price"], send=messages.append)
+    assert messages == [{"stdout": "123 Gwei\n"}]
+    assert response == {"handled": True, "exit_code": 0}
+
+
+def test_run_uses_forwarded_env(mocker, monkeypatch, client_pool):
+    monkeypatch.setenv("IN3CLI_DAEMON_ONLY", "1")
+    seen = {}
+
+    def record_env(*args, **kwargs):
+        seen["forwarded"] = os.environ.get("IN3CLI_FORWARDED")
+        seen["daemon_only"] = os.environ.get("IN3CLI_DAEMON_ONLY")
+
+    mocker.patch.object(cli, "main", side_effect=record_env)
+    Daemon("unused", client_pool).run(["eth", "show-gas-price"], env={"IN3CLI_FORWARDED": "1"})
+    assert seen == {"forwarded": "1", "daemon_only": None}
+    assert "IN3CLI_FORWARDED" not in os.environ
+    assert os.environ["IN3CLI_DAEMON_ONLY"] == "1"
+
+
+def test_forward_sends_in3cli_env(monkeypatch, running_daemon, mocker):
+    monkeypatch.setenv("IN3CLI_FORWARDED", "1")
+    run = mocker.spy(running_daemon, "run")
+    forward(["eth", "show-gas-price"])
+    assert run.call_args[0][2]["IN3CLI_FORWARDED"] == "1"
@@ -0,0 +1,142 @@
+import bz2
+import gzip
+import io
+import json
+import lzma
+import os
+import stat
+
+import pytest
+
+from in3cli.export import Compression
+from in3cli.export import ExportFormat
+from in3cli.export import RowWriter
+from in3cli.export import get_compression
+from in3cli.export import open_output
+
+FIELDNAMES = ("Number", "Hash")
+ROWS = [{"Number": 1, "Hash": "A"}, {"Number": 2, "Hash": "B"}]
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("blocks.csv", Compression.NONE),
+        ("blocks.csv.gz", Compression.GZIP),
+        ("blocks.ndjson.bz2", Compression.BZ2),
+        ("blocks.ndjson.XZ", Compression.XZ),
+        ("-", Compression.NONE),
+    ],
+)
+def test_get_compression_infers_compression_from_extension(path, expected):
+    assert get_compression(path) == expected
+
+
+def test_get_compression_when_given_compression_uses_it():
+    assert get_compression("blocks.csv", "GZIP") == Compression.GZIP
+
+
+def test_row_writer_when_csv_writes_fixed_header_and_rows():
+    stream = io.StringIO()
+    RowWriter(stream, ExportFormat.CSV, FIELDNAMES).write_all(ROWS + [{"Hash": "C"}])
+    assert stream.getvalue().splitlines() == ["Number,Hash", "1,A", "2,B", ",C"]
+
+
+def test_row_writer_when_csv_and_no_rows_writes_header():
+    stream = io.StringIO()
+    RowWriter(stream, ExportFormat.CSV, FIELDNAMES).write_all([])
+    assert stream.getvalue() == "Number,Hash\r\n"
+
+
+def test_row_writer_when_ndjson_writes_one_object_per_line():
+    stream = io.StringIO()
+    count = RowWriter(stream, ExportFormat.NDJSON, FIELDNAMES).write_all(iter(ROWS))
+    assert count == 2
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == ROWS
+
+
+def test_row_writer_flushes_every_flush_rows_rows(mocker):
+    stream = mocker.MagicMock()
+    writer = RowWriter(stream, ExportFormat.NDJSON, FIELDNAMES, flush_rows=2)
+    for row in ROWS * 2:
+        writer.write(row)
+    assert stream.flush.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "compression,opener",
+    [
+        (Compression.NONE, open),
+        (Compression.GZIP, gzip.open),
+        (Compression.BZ2, bz2.open),
+        (Compression.XZ, lzma.open),
+    ],
+)
+def test_open_output_writes_file_with_compression(tmp_path, compression, opener):
+    path = str(tmp_path / "blocks.out")
+    with open_output(path, compression) as stream:
+        stream.write("row\n")
+    with opener(path, "rt") as file:
+        assert file.read() == "row\n"
+
+
+def test_open_output_creates_file_with_mode_from_umask(tmp_path):
+    path = str(tmp_path / "blocks.csv")
+    previous_umask = os.umask(0o027)
+    try:
+        with open_output(path) as stream:
+            stream.write("row\n")
+    finally:
+        os.umask(previous_umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+
+def test_open_output_when_writing_fails_leaves_no_file(tmp_path):
+    export_dir = tmp_path / "export"
+    export_dir.mkdir()
+    with pytest.raises(ValueError):
+        with open_output(str(export_dir / "blocks.csv")) as stream:
+            stream.write("row\n")
+            raise ValueError()
+    assert list(export_dir.iterdir()) == []
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="Named pipes are not supported.")
+def test_open_output_writes_named_pipe_directly(tmp_path):
+    import threading
+
+    path = str(tmp_path / "blocks.pipe")
+    os.mkfifo(path)
+    received = []
+
+    def read_pipe():
+        with open(path) as pipe:
+            received.append(pipe.read())
+
+    reader = threading.Thread(target=read_pipe)
+    reader.start()
+    with open_output(path) as stream:
+        stream.write("row\n")
+    reader.join()
+    assert received == ["row\n"]
+    assert stat.S_ISFIFO(os.stat(path).st_mode)
+
+
+def test_open_output_when_directory_not_writable_writes_existing_file_directly(
+    mocker, tmp_path
+):
+    mocker.patch("in3cli.export.tempfile.mkstemp").side_effect = PermissionError()
+    path = tmp_path / "blocks.csv"
+    path.write_text("old\n")
+    with open_output(str(path)) as stream:
+        stream.write("row\n")
+    assert path.read_text() == "row\n"
+
+
+def test_open_output_when_directory_not_writable_and_file_missing_raises_error(
+    mocker, tmp_path
+):
+    mocker.patch("in3cli.export.tempfile.mkstemp").side_effect = PermissionError()
+    with pytest.raises(PermissionError):
+        with open_output(str(tmp_path / "blocks.csv")):
+            pass
@@ -0,0 +1,77 @@
+import pytest
+from in3.eth.model import Block
+
+from in3cli.enums import Chain
+from in3cli.follow import BlockFollower
+from in3cli.follow import MIN_POLL_INTERVAL
+
+import tests.conftest as tconf
+
+
+class FakeChain:
+    """A chain that produces a block every `block_time` seconds of fake time."""
+
+    def __init__(self, head=100, block_time=5.0, now=1000.0):
+        self.genesis_head = head
+        self.block_time = block_time
+        self.start = now
+        self.now = now
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def block_number(self):
+        return self.genesis_head + int((self.now - self.start) // self.block_time)
+
+    def get_block(self, number):
+        timestamp = self.start + (number - self.genesis_head) * self.block_time
+        return Block(**dict(tconf.TEST_BLOCK.__dict__, number=number, timestamp=timestamp))
+
+
+def _take(iterator, count):
+    return [next(iterator) for _ in range(count)]
+
+
+@pytest.fixture
+def chain():
+    return FakeChain()
+
+
+def _create_follower(chain, chain_name=Chain.KOVAN):
+    return BlockFollower(chain, chain.get_block, chain_name, chain.clock, chain.sleep)
+
+
+def test_follow_yields_latest_block_then_each_new_block(chain):
+    blocks = _take(_create_follower(chain).follow(), 4)
+    assert [b.number for b in blocks] == [100, 101, 102, 103]
+
+
+def test_follow_when_given_start_catches_up_in_order(chain):
+    blocks = _take(_create_follower(chain).follow(97), 5)
+    assert [b.number for b in blocks] == [97, 98, 99, 100, 101]
+
+
+def test_follow_adapts_block_time_to_observed_blocks(chain):
+    follower = _create_follower(chain)
+    _take(follower.follow(80), 40)
+    assert follower.block_time == pytest.approx(chain.block_time, abs=0.1)
+
+
+def test_follow_sleeps_until_next_block_is_due_instead_of_polling_often(chain):
+    follower = _create_follower(chain)
+    blocks = follower.follow(60)
+    # Catching up on old blocks measures the block time.
+    _take(blocks, 41)
+    polls = follower.polls
+    _take(blocks, 20)
+    assert follower.polls - polls <= 25
+    assert all(s >= MIN_POLL_INTERVAL for s in chain.sleeps)
+
+
+def test_get_poll_interval_when_no_blocks_seen_uses_fraction_of_default_block_time(chain):
+    assert _create_follower(chain, Chain.MAINNET).get_poll_interval() == pytest.approx(13 / 4)
@@ -0,0 +1,64 @@
+import pytest
+from in3.eth.model import Block
+
+from in3cli.gas_stats import GasStats
+
+import tests.conftest as tconf
+
+
+def _create_block(number, gas_prices, gas_used=50, gas_limit=100):
+    txs = []
+    for gas_price in gas_prices:
+        tx = tconf.create_test_tx()
+        tx.gasPrice = gas_price
+        txs.append(tx)
+    return Block(
+        **dict(
+            tconf.TEST_BLOCK.__dict__,
+            number=number,
+            transactions=txs,
+            gasUsed=gas_used,
+            gasLimit=gas_limit,
+        )
+    )
+
+
+def _create_stats(use_numpy):
+    stats = GasStats(use_numpy)
+    stats.add(_create_block(1, [5, 1, 3], gas_used=100))
+    stats.add(_create_block(2, [2, 4], gas_used=29))
+    stats.add(_create_block(3, [], gas_used=0))
+    return stats
+
+
+def test_add_returns_block_stats():
+    block_stats = GasStats(False).add(_create_block(7, [5, 1, 3], gas_used=25))
+    assert block_stats == (7, 3, 0.25, 3)
+
+
+def test_add_when_block_has_no_transactions_has_no_median():
+    assert GasStats(False).add(_create_block(7, [])).median_gas_price is None
+
+
+def test_get_percentiles_returns_nearest_rank_percentiles():
+    stats = _create_stats(False)
+    assert stats.get_percentiles((10, 50, 90, 100)) == [1, 3, 5, 5]
+    assert stats.tx_count == 5
+    assert stats.block_count == 3
+
+
+def test_get_percentiles_when_no_transactions_returns_nones():
+    assert GasStats(False).get_percentiles((50, 90)) == [None, None]
+
+
+def test_get_histogram_puts_full_blocks_in_last_bin():
+    assert _create_stats(False).get_histogram(4) == [1, 1, 0, 1]
+
+
+def test_numpy_path_gives_same_results_as_pure_python_path():
+    pytest.importorskip("numpy")
+    pure = _create_stats(False)
+    vectorized = _create_stats(True)
+    assert vectorized.numpy is not None
+    assert vectorized.get_percentiles() == pure.get_percentiles()
+    assert vectorized.get_histogram() == pure.get_histogram()
@@ -0,0 +1,110 @@
+import multiprocessing
+
+import pytest
+from in3.eth.model import Block
+
+from in3cli.enums import Chain
+from in3cli.header_index import HeaderIndex
+from in3cli.header_index import SEGMENT_SIZE
+
+import tests.conftest as tconf
+
+
+def create_block(number, tx_count=2):
+    return Block(
+        **dict(
+            tconf.TEST_BLOCK.__dict__,
+            number=number,
+            hash="0x{:064x}".format(number),
+            parentHash="0x{:064x}".format(number - 1),
+            miner="0x" + "ab" * 20,
+            author="0x" + "cd" * 20,
+            difficulty=2 ** 70,
+            totalDifficulty=2 ** 200,
+            transactions=["TX"] * tx_count,
+        )
+    )
+
+
+@pytest.fixture
+def header_index(tmp_path):
+    header_index = HeaderIndex(str(tmp_path / "headers"))
+    header_index.set_head(Chain.MAINNET, 1000)
+    yield header_index
+    header_index.close()
+
+
+def test_get_returns_header_that_was_put(header_index):
+    assert header_index.put(Chain.MAINNET, create_block(5))
+    header = header_index.get(Chain.MAINNET, 5)
+    assert header.number == 5
+    assert header.hash == "0x{:064x}".format(5)
+    assert header.parentHash == "0x{:064x}".format(4)
+    assert header.miner == "0x" + "ab" * 20
+    assert header.author == "0x" + "cd" * 20
+    assert header.difficulty == 2 ** 70
+    assert header.totalDifficulty == 2 ** 200
+    assert header.timestamp == tconf.TEST_BLOCK.timestamp
+    assert header.gasUsed == tconf.TEST_BLOCK.gasUsed
+    assert header.tx_count == 2
+    assert header_index.get_timestamp(Chain.MAINNET, 5) == tconf.TEST_BLOCK.timestamp
+
+
+def test_get_when_block_not_indexed_returns_none(header_index):
+    header_index.put(Chain.MAINNET, create_block(5))
+    assert header_index.get(Chain.MAINNET, 6) is None
+    assert header_index.get(Chain.MAINNET, SEGMENT_SIZE * 3) is None
+    assert header_index.get(Chain.GOERLI, 5) is None
+
+
+def test_put_when_block_not_final_skips_it(header_index):
+    assert not header_index.put(Chain.MAINNET, create_block(1000 - 63))
+    assert header_index.get(Chain.MAINNET, 1000 - 63) is None
+    assert header_index.put(Chain.MAINNET, create_block(1000 - 64))
+
+
+def test_put_when_block_has_values_that_do_not_fit_skips_it(header_index):
+    block = create_block(5)
+    block.hash = "HASH"
+    assert not header_index.put(Chain.MAINNET, block)
+
+
+def test_put_spans_segments(header_index):
+    header_index.set_head(Chain.MAINNET, SEGMENT_SIZE * 2)
+    header_index.put(Chain.MAINNET, create_block(SEGMENT_SIZE + 1))
+    assert header_index.get(Chain.MAINNET, SEGMENT_SIZE + 1).number == SEGMENT_SIZE + 1
+    assert header_index.get(Chain.MAINNET, 1) is None
+
+
+def test_set_head_only_moves_forward_and_persists(header_index):
+    header_index.set_head(Chain.MAINNET, 10)
+    reopened = HeaderIndex(header_index.path)
+    assert reopened.get_head(Chain.MAINNET) == 1000
+    assert reopened.get_head(Chain.GOERLI) == -1
+
+
+def _put_in_other_process(path, block_num):
+    header_index = HeaderIndex(path)
+    header_index.set_head(Chain.MAINNET, 1000)
+    header_index.put(Chain.MAINNET, create_block(block_num))
+    header_index.close()
+
+
+def test_records_written_by_other_processes_are_visible(header_index):
+    header_index.put(Chain.MAINNET, create_block(1))
+    process = multiprocessing.get_context("spawn").Process(
+        target=_put_in_other_process, args=(header_index.path, 2)
+    )
+    process.start()
+    process.join()
+    assert header_index.get(Chain.MAINNET, 2).number == 2
+
+
+def test_clear_when_given_chain_only_deletes_its_index(header_index):
+    header_index.set_head(Chain.GOERLI, 1000)
+    header_index.put(Chain.MAINNET, create_block(1))
+    header_index.put(Chain.GOERLI, create_block(1))
+    header_index.clear(Chain.GOERLI)
+    assert header_index.get(Chain.GOERLI, 1) is None
+    assert header_index.get(Chain.MAINNET, 1).number == 1
+    assert header_index.get_head(Chain.GOERLI) == -1
@@ -1,4 +1,9 @@
+import subprocess
+import sys
+
+import pytest
 from in3 import NodeList
+from in3cli.enums import Chain
 from in3cli.main import cli
 
 import tests.conftest as tconf
@@ -23,3 +28,88 @@ def test_list_nodes_csv_output(mocker, runner, cli_state):
     assert expected_row in res.output
     expected_row = expected_row.replace(tconf.TEST_URL_1, tconf.TEST_URL_2)
     assert expected_row in res.output
+
+
+@pytest.fixture
+def node_list_client(mocker, cli_state):
+    node_list = NodeList([tconf.create_test_node()], tconf.TEST_ACCOUNT, "reg_id", 999, 14)
+    cli_state.chain = Chain.MAINNET
+    cli_state.client.refresh_node_list = mocker.Mock()
+    cli_state.client.refresh_node_list.return_value = node_list
+    return cli_state.client
+
+
+def test_list_nodes_uses_cached_node_list(runner, cli_state, node_list_client):
+    runner.invoke(cli, "list-nodes", obj=cli_state)
+    res = runner.invoke(cli, "list-nodes", obj=cli_state)
+    assert node_list_client.refresh_node_list.call_count == 1
+    assert tconf.TEST_URL_1 in res.output
+
+
+def test_list_nodes_when_refresh_fetches_node_list(runner, cli_state, node_list_client):
+    runner.invoke(cli, "list-nodes", obj=cli_state)
+    runner.invoke(cli, "list-nodes --refresh", obj=cli_state)
+    assert node_list_client.refresh_node_list.call_count == 2
+
+
+def test_import_main_does_not_import_command_modules_or_in3():
+    code = (
+        "import sys, in3cli.main; "
+        "print(any(m == 'in3' or m.startswith(('in3.', 'in3cli.cmds')) for m in sys.modules))"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code])
+    assert output.strip() == b"False"
+
+
+def test_cli_lists_lazy_commands():
+    assert cli.list_commands(None) == [
+        "account",
+        "cache",
+        "daemon",
+        "ens",
+        "eth",
+        "list-nodes",
+        "nodes",
+        "shell",
+    ]
+
+
+def test_cli_get_command_loads_lazy_command():
+    from in3cli.cmds.eth.eth import eth
+
+    assert cli.get_command(None, "eth") is eth
+
+
+def test_cli_suggests_lazy_command_when_misspelled(runner, cli_state):
+    res = runner.invoke(cli, "etj", obj=cli_state)
+    assert "Did you mean eth?" in res.output
+
+
+def test_cli_when_command_retried_reports_retry_count(runner, cli_state):
+    cli_state.retry_count = 2
+    cli_state.client.eth.gas_price.return_value = 1
+    res = runner.invoke(cli, "eth show-gas-price", obj=cli_state)
+    assert "Retried 2 requests." in res.output
+
+
+def test_cli_when_nothing_retried_does_not_report(runner, cli_state):
+    cli_state.client.eth.gas_price.return_value = 1
+    res = runner.invoke(cli, "eth show-gas-price", obj=cli_state)
+    assert "Retried" not in res.output
+
+
+def test_cli_when_keyring_timing_enabled_reports_keyring_lookups(monkeypatch, runner, cli_state):
+    from in3cli.private_key import KEYRING_TIMING_ENV_VAR
+    from in3cli.private_key import keyring_timer
+
+    monkeypatch.setenv(KEYRING_TIMING_ENV_VAR, "1")
+    keyring_timer.reset()
+    cli_state.client.eth.gas_price.return_value = 1
+    res = runner.invoke(cli, "eth show-gas-price", obj=cli_state)
+    assert "Keyring lookups: 0 in 0.0 ms." in res.output
+
+
+def test_cli_when_keyring_timing_not_enabled_does_not_report(runner, cli_state):
+    cli_state.client.eth.gas_price.return_value = 1
+    res = runner.invoke(cli, "eth show-gas-price", obj=cli_state)
+    assert "Keyring lookups" not in res.output
@@ -0,0 +1,102 @@
+import time
+
+import pytest
+from in3 import NodeList
+
+import in3cli.node_cache as node_cache
+from in3cli.enums import Chain
+from in3cli.node_probe import NodeProbeResult
+from in3cli.node_probe import save_results
+
+import tests.conftest as tconf
+
+
+@pytest.fixture
+def node_list():
+    node_1 = tconf.create_test_node(tconf.TEST_URL_1)
+    node_2 = tconf.create_test_node(tconf.TEST_URL_2)
+    return NodeList([node_1, node_2], tconf.TEST_ACCOUNT, "reg_id", 999, 14)
+
+
+@pytest.fixture
+def config_ttl(mocker):
+    mock = mocker.patch("in3cli.config.config_accessor")
+    mock.node_list_ttl = None
+    return mock
+
+
+def test_load_node_list_when_nothing_saved_returns_none(config_ttl):
+    assert node_cache.load_node_list(Chain.MAINNET) is None
+
+
+def test_load_node_list_returns_saved_node_list(config_ttl, node_list):
+    node_cache.save_node_list(Chain.MAINNET, node_list)
+    actual = node_cache.load_node_list(Chain.MAINNET)
+    assert [n.url for n in actual.nodes] == [tconf.TEST_URL_1, tconf.TEST_URL_2]
+    assert actual.nodes[0].address.address == tconf.TEST_ADDRESS
+    assert actual.nodes[0].deposit == tconf.TEST_DEPOSIT_WEI
+    assert actual.nodes[0].registerTime == tconf.TEST_REGISTER_TIME
+    assert actual.registryId == "reg_id"
+
+
+def test_load_node_list_is_per_chain(config_ttl, node_list):
+    node_cache.save_node_list(Chain.MAINNET, node_list)
+    assert node_cache.load_node_list(Chain.GOERLI) is None
+
+
+def test_load_node_list_when_expired_returns_none(mocker, config_ttl, node_list):
+    node_cache.save_node_list(Chain.MAINNET, node_list)
+    mocker.patch("in3cli.node_cache.time.time").return_value = time.time() + 61
+    assert node_cache.load_node_list(Chain.MAINNET, ttl=60) is None
+
+
+def test_load_node_list_uses_configured_ttl(mocker, config_ttl, node_list):
+    config_ttl.node_list_ttl = 10
+    node_cache.save_node_list(Chain.MAINNET, node_list)
+    mocker.patch("in3cli.node_cache.time.time").return_value = time.time() + 11
+    assert node_cache.load_node_list(Chain.MAINNET) is None
+
+
+def test_load_node_list_when_file_is_corrupt_returns_none(config_ttl):
+    with open(node_cache.get_cache_path(Chain.MAINNET), "w") as file:
+        file.write("{not json")
+    assert node_cache.load_node_list(Chain.MAINNET) is None
+
+
+def test_get_registry_config_contains_node_urls_and_addresses(config_ttl, node_list):
+    node_cache.save_node_list(Chain.MAINNET, node_list)
+    config = node_cache.get_registry_config(Chain.MAINNET)
+    assert not config["needsUpdate"]
+    assert config["nodeList"][1] == {
+        "url": tconf.TEST_URL_2,
+        "address": tconf.TEST_ADDRESS,
+        "props": tconf.TEST_PROPS,
+    }
+
+
+def test_get_registry_config_when_nothing_saved_returns_none(config_ttl):
+    assert node_cache.get_registry_config(Chain.MAINNET) is None
+
+
+def test_get_registry_config_keeps_healthy_nodes_in_cached_order(config_ttl, node_list):
+    node_cache.save_node_list(Chain.MAINNET, node_list)
+    results = [
+        NodeProbeResult(tconf.TEST_URL_2, 1.0, [5.0]),
+        NodeProbeResult(tconf.TEST_URL_1, 1.0, [9.0]),
+    ]
+    save_results(Chain.MAINNET, results)
+    config = node_cache.get_registry_config(Chain.MAINNET)
+    assert [n["url"] for n in config["nodeList"]] == [tconf.TEST_URL_1, tconf.TEST_URL_2]
+
+
+def test_get_registry_config_leaves_out_nodes_that_failed_probe(config_ttl, node_list):
+    node_cache.save_node_list(Chain.MAINNET, node_list)
+    save_results(
+        Chain.MAINNET,
+        [
+            NodeProbeResult(tconf.TEST_URL_1, 1.0, [5.0]),
+            NodeProbeResult(tconf.TEST_URL_2, errors=3),
+        ],
+    )
+    config = node_cache.get_registry_config(Chain.MAINNET)
+    assert [n["url"] for n in config["nodeList"]] == [tconf.TEST_URL_1]
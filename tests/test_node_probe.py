@@ -0,0 +1,98 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import in3cli.node_probe as node_probe
+from in3cli.enums import Chain
+from in3cli.node_probe import NodeProbeResult
+
+
+def _create_handler(delay, status=200):
+    class _Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            time.sleep(delay)
+            body = json.dumps({"jsonrpc": "2.0", "id": 1, "result": "0x10"}).encode()
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return _Handler
+
+
+@pytest.fixture
+def start_node():
+    servers = []
+
+    def start(delay=0, status=200):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _create_handler(delay, status))
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return "http://127.0.0.1:{}/".format(server.server_address[1])
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_probe_node_measures_latency(start_node):
+    url = start_node(delay=0.05)
+    result = node_probe.probe_node(url, samples=3)
+    assert len(result.latencies_ms) == 3
+    assert result.get_latency_percentile(50) >= 50
+    assert result.connect_ms is not None
+    assert result.error_rate == 0
+
+
+def test_probe_node_counts_errors(start_node):
+    url = start_node(status=500)
+    result = node_probe.probe_node(url, samples=2)
+    assert result.errors == 2
+    assert not result.is_healthy
+
+
+def test_probe_node_when_unreachable_counts_all_samples_as_errors():
+    result = node_probe.probe_node("http://127.0.0.1:1/", samples=4, timeout=1)
+    assert result.errors == 4
+    assert result.connect_ms is None
+
+
+def test_probe_nodes_ranks_fastest_healthy_nodes_first(start_node):
+    slow = start_node(delay=0.2)
+    fast = start_node(delay=0)
+    failing = start_node(status=500)
+    results = node_probe.probe_nodes([failing, slow, fast], samples=2, workers=3)
+    assert [r.url for r in results] == [fast, slow, failing]
+
+
+def test_probe_nodes_probes_concurrently(start_node):
+    urls = [start_node(delay=0.2) for _ in range(4)]
+    start = time.perf_counter()
+    node_probe.probe_nodes(urls, samples=1, workers=4)
+    assert time.perf_counter() - start < 0.6
+
+
+def test_load_results_returns_saved_results():
+    results = [
+        NodeProbeResult("https://a", 1.0, [3.0, 2.0]),
+        NodeProbeResult("https://b", errors=1),
+    ]
+    node_probe.save_results(Chain.MAINNET, results)
+    loaded = node_probe.load_results(Chain.MAINNET, ttl=60)
+    assert [r.url for r in loaded] == ["https://a", "https://b"]
+    assert loaded[0].latencies_ms == [2.0, 3.0]
+
+
+def test_load_results_when_expired_returns_none(mocker):
+    node_probe.save_results(Chain.MAINNET, [NodeProbeResult("https://a", 1.0, [3.0])])
+    mocker.patch("in3cli.node_probe.time.time").return_value = time.time() + 61
+    assert node_probe.load_results(Chain.MAINNET, ttl=60) is None
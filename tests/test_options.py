@@ -0,0 +1,154 @@
+import pytest
+
+from in3cli.config import ConfigAccessor
+from in3cli.enums import Chain
+from in3cli.error import In3CliError
+from in3cli.options import CliState
+from in3cli.retry import DEFAULT_DEADLINE
+from in3cli.retry import DEFAULT_MAX_ATTEMPTS
+
+from .conftest import create_mock_account
+
+
+@pytest.fixture
+def mock_get_account(mocker):
+    mock = mocker.patch("in3cli.options.get_account")
+    mock.return_value = create_mock_account()
+    return mock
+
+
+@pytest.fixture
+def mock_cli_client(mocker):
+    return mocker.patch("in3cli.client.CliClient")
+
+
+@pytest.fixture
+def mock_get_node_list_ttl(mocker):
+    mock = mocker.patch("in3cli.node_cache.get_node_list_ttl")
+    mock.return_value = 60
+    return mock
+
+
+def test_init_does_not_get_account(mock_get_account):
+    CliState()
+    assert not mock_get_account.call_count
+
+
+def test_account_gets_account_once(mock_get_account):
+    state = CliState()
+    _ = state.account
+    _ = state.account
+    assert mock_get_account.call_count == 1
+
+
+def test_account_uses_account_name(mock_get_account):
+    state = CliState()
+    state.account_name = "other"
+    _ = state.account
+    mock_get_account.assert_called_once_with("other")
+
+
+def test_chain_when_not_set_uses_account_chain(mock_get_account):
+    state = CliState()
+    assert state.chain == Chain.MAINNET
+    assert mock_get_account.call_count == 1
+
+
+def test_chain_when_set_does_not_get_account(mock_get_account):
+    state = CliState()
+    state.chain = Chain.GOERLI
+    assert state.chain == Chain.GOERLI
+    assert not mock_get_account.call_count
+
+
+def test_chain_when_no_account_exists_uses_mainnet(mock_get_account):
+    mock_get_account.side_effect = In3CliError("No existing account.")
+    state = CliState()
+    assert state.chain == Chain.MAINNET
+
+
+def test_client_when_given_missing_account_name_raises(mock_get_account, mock_cli_client):
+    mock_get_account.side_effect = In3CliError("account 'foo' does not exist.")
+    state = CliState()
+    state.account_name = "foo"
+    with pytest.raises(In3CliError):
+        _ = state.client
+
+
+def test_client_creates_client_with_account_and_chain(
+    mock_get_account, mock_cli_client, mock_get_node_list_ttl
+):
+    state = CliState()
+    state.chain = Chain.GOERLI
+    _ = state.client
+    mock_cli_client.assert_called_once_with(mock_get_account.return_value, Chain.GOERLI, 60)
+
+
+def test_offline_client_does_not_get_account(
+    mock_get_account, mock_cli_client, mock_get_node_list_ttl
+):
+    state = CliState()
+    _ = state.offline_client
+    assert not mock_get_account.call_count
+    mock_cli_client.assert_called_once_with(None, Chain.MAINNET, 60)
+
+
+def test_create_client_reads_node_list_ttl_once(
+    mock_get_account, mock_cli_client, mock_get_node_list_ttl
+):
+    state = CliState()
+    _ = state.client
+    state.create_client()
+    state.create_client()
+    assert mock_get_node_list_ttl.call_count == 1
+
+
+def test_retrier_when_nothing_set_uses_default_policy(mock_get_account):
+    policy = CliState().retrier.policy
+    assert policy.max_attempts == DEFAULT_MAX_ATTEMPTS
+    assert policy.deadline == DEFAULT_DEADLINE
+
+
+def test_retrier_uses_account_settings(mock_get_account):
+    section = mock_get_account.return_value._account
+    section[ConfigAccessor.RETRIES_KEY] = "2"
+    section[ConfigAccessor.RETRY_DEADLINE_KEY] = "3.5"
+    policy = CliState().retrier.policy
+    assert policy.max_attempts == 3
+    assert policy.deadline == 3.5
+
+
+def test_retrier_when_options_set_overrides_account_settings(mock_get_account):
+    section = mock_get_account.return_value._account
+    section[ConfigAccessor.RETRIES_KEY] = "2"
+    state = CliState()
+    state.retries = 0
+    state.retry_deadline = 1
+    policy = state.retrier.policy
+    assert policy.max_attempts == 1
+    assert policy.deadline == 1
+
+
+def test_retry_count_when_retrier_not_used_is_zero(mock_get_account):
+    state = CliState()
+    assert state.retry_count == 0
+    assert not mock_get_account.call_count
+
+
+def test_reset_clears_retry_settings(mock_get_account):
+    state = CliState()
+    state.retries = 1
+    state.retrier.add_retries(2)
+    state.reset()
+    assert state.retries is None
+    assert state.retry_count == 0
+
+
+def test_reset_reads_node_list_ttl_again(
+    mock_get_account, mock_cli_client, mock_get_node_list_ttl
+):
+    state = CliState()
+    _ = state.client
+    state.reset()
+    _ = state.client
+    assert mock_get_node_list_ttl.call_count == 2
@@ -0,0 +1,76 @@
+import threading
+import time
+
+from in3cli.parallel import map_ordered
+from in3cli.parallel import map_unordered
+from in3cli.parallel import thread_local
+
+
+def test_map_ordered_yields_results_in_input_order():
+    def slow_for_even(item):
+        time.sleep(0.02 if item % 2 == 0 else 0)
+        return item * 10
+
+    assert list(map_ordered(slow_for_even, range(10), workers=4, batch_size=2)) == [
+        i * 10 for i in range(10)
+    ]
+
+
+def test_map_ordered_runs_concurrently():
+    start = time.perf_counter()
+    list(map_ordered(lambda _: time.sleep(0.1), range(8), workers=8))
+    assert time.perf_counter() - start < 0.5
+
+
+def test_map_ordered_bounds_items_in_flight():
+    started = []
+
+    def record(item):
+        started.append(item)
+        return item
+
+    results = map_ordered(record, range(1000), workers=2, batch_size=5)
+    next(results)
+    time.sleep(0.05)
+    assert len(started) <= 2 * 2 * 5 + 5
+    results.close()
+
+
+def test_map_ordered_when_empty_yields_nothing():
+    assert list(map_ordered(lambda x: x, [], workers=2)) == []
+
+
+def test_map_unordered_yields_fast_results_before_slow_ones():
+    def slow_for_zero(item):
+        time.sleep(0.2 if item == 0 else 0)
+        return item
+
+    results = list(map_unordered(slow_for_zero, range(4), workers=4))
+    assert sorted(results) == [0, 1, 2, 3]
+    assert results[-1] == 0
+
+
+def test_map_unordered_bounds_items_in_flight():
+    started = []
+
+    def record(item):
+        started.append(item)
+        time.sleep(0.01)
+        return item
+
+    results = map_unordered(record, range(1000), workers=2)
+    next(results)
+    time.sleep(0.05)
+    assert len(started) <= 2 * 2 + 2
+    results.close()
+
+
+def test_thread_local_creates_one_object_per_thread():
+    get = thread_local(object)
+    main_objects = [get(), get()]
+    other_objects = []
+    thread = threading.Thread(target=lambda: other_objects.append(get()))
+    thread.start()
+    thread.join()
+    assert main_objects[0] is main_objects[1]
+    assert other_objects[0] is not main_objects[0]
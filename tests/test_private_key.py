@@ -107,3 +107,24 @@ def test_set_private_key_when_using_file_fallback_and_user_rejects_does_not_save
 def test_prompt_for_private_key_calls_getpass(getpass_function):
     private_key.get_private_key_from_prompt()
     assert getpass_function.call_count
+
+
+def test_get_stored_private_key_times_lookup(account, keyring_private_key_getter):
+    private_key.keyring_timer.reset()
+    private_key.get_stored_private_key(account)
+    private_key.get_stored_private_key(account)
+    assert private_key.keyring_timer.lookups == 2
+    assert private_key.keyring_timer.seconds >= 0
+
+
+def test_set_private_key_changes_key_version(account, keyring_private_key_setter):
+    version = private_key.get_key_version()
+    private_key.set_private_key(account, "test_private_key")
+    assert private_key.get_key_version() != version
+
+
+def test_delete_private_key_changes_key_version(mocker, account):
+    mocker.patch("keyring.delete_password")
+    version = private_key.get_key_version()
+    private_key.delete_private_key(account)
+    assert private_key.get_key_version() != version
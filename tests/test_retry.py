@@ -0,0 +1,153 @@
+import pickle
+
+import pytest
+from in3.exception import ClientException
+from in3.exception import HashFormatException
+from in3.exception import TransportException
+
+from in3cli.error import In3CliChainTimeoutError
+from in3cli.retry import Retrier
+from in3cli.retry import RetryPolicy
+from in3cli.retry import is_transient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _create_retrier(clock, **kwargs):
+    return Retrier(RetryPolicy(**kwargs), clock, clock.sleep)
+
+
+def _fail_then_return(failures, result="RESULT"):
+    calls = []
+
+    def func():
+        calls.append(1)
+        if len(calls) <= len(failures):
+            failure = failures[len(calls) - 1]
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+        return result
+
+    return func, calls
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "408 - Request timeout",
+        "Error connect",
+        "No nodes found that match the criteria",
+        "No Nodes in the result",
+        "The request could not be send!",
+        "Request failed due to 503 - Service Unavailable",
+        "Request failed due to 429 - Too Many Requests",
+        "<urlopen error [Errno 111] Connection refused>",
+        "Block not found or non-existent.",
+        "Not enough finality blockheaders",
+    ],
+)
+def test_is_transient_when_network_or_node_error_returns_true(message):
+    assert is_transient(ClientException(message))
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "Invalid params",
+        "nonce too low",
+        "already known",
+        "replacement transaction underpriced",
+        "insufficient funds for gas * price + value",
+        "execution reverted",
+        "REVERT",
+        "The account could not be found!",
+        "resolver not registered",
+        "Request failed due to 500 - invalid argument 0: hex string without 0x prefix",
+    ],
+)
+def test_is_transient_when_permanent_error_returns_false(message):
+    assert not is_transient(ClientException(message))
+
+
+def test_is_transient_classifies_transport_errors():
+    assert is_transient(TransportException("Request failed with status: 502"))
+    assert is_transient(TransportException("Request failed with status: 301"))
+    assert not is_transient(TransportException("Request failed: invalid request"))
+
+
+def test_is_transient_when_not_in3_client_error_returns_false():
+    assert not is_transient(HashFormatException("timeout"))
+    assert not is_transient(ValueError("timeout"))
+
+
+def test_get_delay_grows_exponentially_up_to_max_delay():
+    policy = RetryPolicy(initial_delay=0.1, max_delay=1.0)
+    assert [policy.get_delay(n, lambda: 1.0) for n in range(5)] == [0.1, 0.2, 0.4, 0.8, 1.0]
+
+
+def test_get_delay_applies_jitter():
+    policy = RetryPolicy(initial_delay=0.1, max_delay=1.0)
+    assert policy.get_delay(2, lambda: 0.5) == pytest.approx(0.2)
+
+
+def test_run_retries_transient_errors_and_none_results(clock):
+    retrier = _create_retrier(clock)
+    func, calls = _fail_then_return([ClientException("timeout"), None])
+    assert retrier.run(func) == "RESULT"
+    assert len(calls) == 3
+    assert retrier.retries == 2
+    assert len(clock.sleeps) == 2
+
+
+def test_run_when_permanent_error_fails_without_retrying(clock):
+    retrier = _create_retrier(clock)
+    func, calls = _fail_then_return([HashFormatException("bad hash")])
+    with pytest.raises(HashFormatException):
+        retrier.run(func)
+    assert len(calls) == 1
+    assert retrier.retries == 0
+
+
+def test_run_when_out_of_attempts_raises_timeout_with_last_error(clock):
+    retrier = _create_retrier(clock, max_attempts=3)
+    func, calls = _fail_then_return([ClientException("Error connect")] * 5)
+    with pytest.raises(In3CliChainTimeoutError) as err:
+        retrier.run(func, "block 5")
+    assert len(calls) == 3
+    assert err.value.message == (
+        "Timed out waiting for block 5 after 3 attempts (last error: Error connect). "
+        "Please try again."
+    )
+
+
+def test_run_stops_before_passing_deadline(clock):
+    retrier = _create_retrier(clock, max_attempts=100, deadline=1.0, initial_delay=0.5)
+    func, calls = _fail_then_return([None] * 100)
+    with pytest.raises(In3CliChainTimeoutError):
+        retrier.run(func)
+    assert clock.now <= 1.0
+    assert len(calls) < 100
+
+
+def test_timeout_error_survives_pickling():
+    err = pickle.loads(pickle.dumps(In3CliChainTimeoutError("block 5", 2, ValueError("x"))))
+    assert err.message == (
+        "Timed out waiting for block 5 after 2 attempts (last error: x). Please try again."
+    )
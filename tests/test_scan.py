@@ -0,0 +1,96 @@
+import pytest
+from in3.eth.model import Block
+
+from in3cli.scan import AddressSet
+from in3cli.scan import Checkpoint
+from in3cli.scan import get_chunks
+from in3cli.scan import get_scan_key
+from in3cli.scan import scan
+
+import tests.conftest as tconf
+
+
+def _create_tx(tx_hash, sender, to):
+    tx = tconf.create_test_tx(tx_hash)
+    tx.From = sender
+    tx.to = to
+    return tx
+
+
+def _create_block(number):
+    txs = [
+        _create_tx("TX{}-1".format(number), "0xA{}".format(number % 3), "0xb"),
+        _create_tx("TX{}-2".format(number), "0xc", None),
+    ]
+    return Block(**dict(tconf.TEST_BLOCK.__dict__, number=number, transactions=txs))
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return Checkpoint(str(tmp_path / "checkpoint.json"), "KEY")
+
+
+def test_address_set_matches_from_or_to_case_insensitively():
+    address_set = AddressSet(["0xAB", "0xcd"])
+    assert address_set.matches(_create_tx("TX", "0xab", None))
+    assert address_set.matches(_create_tx("TX", "0x1", "0xCD"))
+    assert not address_set.matches(_create_tx("TX", "0x1", "0x2"))
+
+
+def test_get_chunks_splits_range_with_shorter_last_chunk():
+    assert get_chunks(5, 14, 4) == [(5, 8), (9, 12), (13, 14)]
+
+
+def test_get_scan_key_ignores_address_order_and_case():
+    key = get_scan_key("mainnet", AddressSet(["0xA", "0xb"]), 1, 2, 10)
+    assert key == get_scan_key("mainnet", AddressSet(["0xB", "0xa"]), 1, 2, 10)
+    assert key != get_scan_key("mainnet", AddressSet(["0xA", "0xb"]), 1, 3, 10)
+
+
+def test_scan_yields_matching_transactions_in_block_order(checkpoint):
+    matches = scan(_create_block, AddressSet(["0xa1"]), get_chunks(0, 9, 2), checkpoint, 3)
+    assert [tx.hash for _, tx in matches] == ["TX1-1", "TX4-1", "TX7-1"]
+    assert checkpoint.done == {0, 2, 4, 6, 8}
+
+
+def test_scan_skips_chunks_in_checkpoint(checkpoint):
+    fetched = []
+
+    def get_block(block_num):
+        fetched.append(block_num)
+        return _create_block(block_num)
+
+    checkpoint.mark_done(0)
+    matches = scan(get_block, AddressSet(["0xa1"]), get_chunks(0, 5, 2), checkpoint, 2)
+    assert [tx.hash for _, tx in matches] == ["TX4-1"]
+    assert sorted(fetched) == [2, 3, 4, 5]
+
+
+def test_scan_when_interrupted_only_checkpoints_chunks_that_were_taken(checkpoint):
+    matches = scan(_create_block, AddressSet(["0xa1"]), get_chunks(0, 9, 2), checkpoint, 1)
+    next(matches)
+    next(matches)
+    matches.close()
+    resumed = Checkpoint.load(checkpoint.path, "KEY")
+    assert resumed.done == {0, 2}
+
+
+def test_checkpoint_load_restores_to_block(checkpoint):
+    checkpoint.to_block = 42
+    checkpoint.mark_done(0)
+    assert Checkpoint.load(checkpoint.path, "KEY").to_block == 42
+
+
+def test_checkpoint_load_when_missing_starts_empty(tmp_path):
+    assert Checkpoint.load(str(tmp_path / "missing.json"), "KEY").done == set()
+
+
+def test_checkpoint_load_when_for_other_scan_raises_value_error(checkpoint):
+    checkpoint.mark_done(0)
+    with pytest.raises(ValueError):
+        Checkpoint.load(checkpoint.path, "OTHER")
+
+
+def test_scan_when_no_checkpoint_yields_every_match():
+    matches = scan(_create_block, AddressSet(["0xa1"]), get_chunks(0, 5, 2), None, 2)
+    assert [tx.hash for _, tx in matches] == ["TX1-1", "TX4-1"]
@@ -0,0 +1,189 @@
+import io
+
+import pytest
+
+from in3.exception import ClientException
+
+from in3cli.error import In3CliChainTimeoutError
+from in3cli.export import ExportFormat
+from in3cli.send_batch import Journal
+from in3cli.send_batch import JournalStatus
+from in3cli.send_batch import NonceGate
+from in3cli.send_batch import NonceManager
+from in3cli.send_batch import Payment
+from in3cli.send_batch import get_failure_status
+from in3cli.send_batch import get_payments_format
+from in3cli.send_batch import plan
+from in3cli.send_batch import reconcile
+from in3cli.send_batch import read_payments
+
+TO_A = "0x" + "a" * 40
+TO_B = "0x" + "b" * 40
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return Journal(str(tmp_path / "payments.csv.journal"))
+
+
+def test_get_payments_format_uses_extension_unless_given():
+    assert get_payments_format("payouts.CSV") == ExportFormat.CSV
+    assert get_payments_format("payouts.ndjson") == ExportFormat.NDJSON
+    assert get_payments_format("payouts.csv", "ndjson") == ExportFormat.NDJSON
+
+
+def test_read_payments_reads_csv_rows():
+    file = io.StringIO("to,value,gas\n{},0.5,21000\n{},1,\n".format(TO_A, TO_B))
+    payments = read_payments(file, ExportFormat.CSV)
+    assert payments == [
+        Payment(1, TO_A, 500000000000000000, 21000),
+        Payment(2, TO_B, 1000000000000000000, None),
+    ]
+
+
+def test_read_payments_reads_ndjson_lines():
+    file = io.StringIO('{{"to": "{}", "value": 1}}\n\n'.format(TO_A))
+    assert read_payments(file, ExportFormat.NDJSON) == [
+        Payment(1, TO_A, 1000000000000000000, None)
+    ]
+
+
+def test_read_payments_keeps_every_digit_of_value():
+    file = io.StringIO("to,value\n{},12.345678901234567891\n".format(TO_A))
+    assert read_payments(file, ExportFormat.CSV)[0].value == 12345678901234567891
+
+
+def test_read_payments_when_value_has_fractional_wei_raises_error():
+    file = io.StringIO("to,value\n{},0.0000000000000000001\n".format(TO_A))
+    with pytest.raises(ValueError):
+        read_payments(file, ExportFormat.CSV)
+
+
+def test_read_payments_when_row_invalid_raises_error_with_row():
+    file = io.StringIO("to,value\n{},1\n0x12,1\n".format(TO_A))
+    with pytest.raises(ValueError) as err:
+        read_payments(file, ExportFormat.CSV)
+    assert "Row 2" in str(err.value)
+
+
+def test_journal_load_keeps_latest_entry_and_ignores_cut_off_line(journal):
+    payment = Payment(1, TO_A, 10, None)
+    journal.write(payment, 7, JournalStatus.ASSIGNED)
+    journal.write(payment, 7, JournalStatus.SENT, "0xHASH")
+    journal.close()
+    with open(journal.path, "a") as file:
+        file.write('{"row": 2, "to": ')
+    loaded = Journal.load(journal.path)
+    assert list(loaded.entries) == [1]
+    assert loaded.entries[1]["status"] == JournalStatus.SENT
+    assert loaded.entries[1]["tx_hash"] == "0xHASH"
+    assert loaded.get_max_nonce() == 7
+
+
+def test_journal_load_when_no_file_is_empty(journal):
+    loaded = Journal.load(journal.path)
+    assert loaded.entries == {}
+    assert loaded.get_max_nonce() is None
+
+
+def test_nonce_manager_takes_consecutive_nonces():
+    nonce_manager = NonceManager(3)
+    assert [nonce_manager.take() for _ in range(3)] == [3, 4, 5]
+
+
+def test_nonce_gate_closes_above_lowest_failed_nonce():
+    nonce_gate = NonceGate()
+    assert nonce_gate.is_open(9)
+    nonce_gate.fail(7)
+    nonce_gate.fail(8)
+    assert nonce_gate.is_open(6)
+    assert not nonce_gate.is_open(7)
+    assert not nonce_gate.is_open(9)
+
+
+@pytest.mark.parametrize(
+    "err",
+    [
+        In3CliChainTimeoutError("payment 1", 3),
+        ClientException("408 - Request timeout"),
+        ClientException("nonce too low"),
+        ClientException("already known"),
+    ],
+)
+def test_get_failure_status_when_transaction_may_have_been_sent_returns_unknown(err):
+    assert get_failure_status(err) == JournalStatus.UNKNOWN
+
+
+@pytest.mark.parametrize(
+    "err",
+    [ClientException("insufficient funds for gas * price + value"), ValueError("bad")],
+)
+def test_get_failure_status_when_transaction_was_not_sent_returns_failed(err):
+    assert get_failure_status(err) == JournalStatus.FAILED
+
+
+def _get_transaction(mined_hashes, pending_hashes=()):
+    class Transaction:
+        def __init__(self, block_hash):
+            self.blockHash = block_hash
+
+    def get_transaction(tx_hash):
+        if tx_hash in mined_hashes:
+            return Transaction("0xBLOCK")
+        if tx_hash in pending_hashes:
+            return Transaction(None)
+        return None
+
+    return get_transaction
+
+
+def test_reconcile_marks_unconfirmed_payments_with_mined_transactions_sent(journal):
+    payments = [Payment(row, TO_A, row, None) for row in (1, 2, 3, 4)]
+    journal.write(payments[0], 5, JournalStatus.UNKNOWN, "0xTX5", "timeout")
+    journal.write(payments[1], 6, JournalStatus.ASSIGNED, "0xTX6")
+    journal.write(payments[2], 7, JournalStatus.FAILED, error="insufficient funds")
+    journal.write(payments[3], 8, JournalStatus.UNKNOWN, "0xTX8", "timeout")
+    assert reconcile(journal, 8, _get_transaction({"0xTX5", "0xTX6"})) == ([1, 2], [])
+    statuses = [journal.entries[row]["status"] for row in (1, 2, 3, 4)]
+    assert statuses == ["sent", "sent", "failed", "unknown"]
+    assert journal.entries[1]["tx_hash"] == "0xTX5"
+
+
+def test_reconcile_when_nonce_used_by_other_transaction_marks_payment_failed(journal):
+    payments = [Payment(row, TO_A, row, None) for row in (1, 2, 3)]
+    journal.write(payments[0], 5, JournalStatus.UNKNOWN, "0xTX5", "timeout")
+    journal.write(payments[1], 6, JournalStatus.UNKNOWN, "0xTX6", "timeout")
+    journal.write(payments[2], 7, JournalStatus.ASSIGNED)
+    get_transaction = _get_transaction(set(), {"0xTX5"})
+    assert reconcile(journal, 8, get_transaction) == ([], [1, 2, 3])
+    assert [journal.entries[row]["status"] for row in (1, 2, 3)] == ["failed"] * 3
+    assert journal.entries[1]["error"] == "Nonce 5 was used by another transaction."
+
+
+def test_reconcile_when_unknown_payment_has_no_hash_raises_error(journal):
+    journal.write(Payment(1, TO_A, 1, None), 5, JournalStatus.UNKNOWN, error="timeout")
+    with pytest.raises(ValueError, match="Row 1 may have been sent"):
+        reconcile(journal, 6, _get_transaction(set()))
+    assert journal.entries[1]["status"] == "unknown"
+
+
+def test_plan_skips_sent_rows_and_reuses_journaled_nonces(journal):
+    payments = [Payment(row, TO_A, row, None) for row in (1, 2, 3)]
+    journal.write(payments[0], 10, JournalStatus.SENT, "0xHASH")
+    journal.write(payments[1], 11, JournalStatus.FAILED, error="timeout")
+    planned = plan(payments, journal, NonceManager(12), 10)
+    assert [(p.payment.row, p.nonce, p.is_new) for p in planned] == [(2, 11, False), (3, 12, True)]
+
+
+def test_plan_gives_unsent_rows_with_used_nonces_new_nonces(journal):
+    payments = [Payment(row, TO_A, row, None) for row in (1, 2)]
+    journal.write(payments[0], 10, JournalStatus.FAILED, error="Nonce 10 was used")
+    journal.write(payments[1], 11, JournalStatus.ASSIGNED)
+    planned = plan(payments, journal, NonceManager(12), 11)
+    assert [(p.payment.row, p.nonce, p.is_new) for p in planned] == [(2, 11, False), (1, 12, True)]
+
+
+def test_plan_when_row_differs_from_journal_raises_error(journal):
+    journal.write(Payment(1, TO_A, 1, None), 0, JournalStatus.ASSIGNED)
+    with pytest.raises(ValueError):
+        plan([Payment(1, TO_B, 1, None)], journal, NonceManager(1), 0)
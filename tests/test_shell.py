@@ -0,0 +1,63 @@
+import pytest
+
+from in3cli.main import cli
+from in3cli.shell import Shell
+
+_TEST_HASH = "0x8f98a2c9064f6b76ef8bfcf8747677715d382ba76c2c1f4890ac4a917097a937"
+
+
+@pytest.fixture
+def shell(cli_state):
+    cli_state.client.eth.gas_price.return_value = 123
+    return Shell(cli, cli_state)
+
+
+def test_run_line_runs_command_with_shared_state(capsys, shell, cli_state):
+    shell.run_line("eth show-gas-price")
+    shell.run_line("eth show-gas-price")
+    assert capsys.readouterr().out == "123 Gwei\n123 Gwei\n"
+    assert cli_state.reset.call_count == 2
+
+
+def test_run_line_when_exit_returns_false(shell):
+    assert not shell.run_line("exit")
+
+
+def test_run_line_when_empty_returns_true(shell, cli_state):
+    assert shell.run_line("   ")
+    assert not cli_state.reset.call_count
+
+
+def test_run_line_when_usage_error_keeps_running(capsys, shell):
+    assert shell.run_line("eth show-blok")
+    assert "Did you mean show-block" in capsys.readouterr().err
+
+
+def test_run_line_when_shell_does_not_nest(capsys, shell):
+    assert shell.run_line("shell")
+    assert "Already in the shell." in capsys.readouterr().err
+
+
+def test_run_line_remembers_hashes_and_ens_names(shell):
+    shell.run_line("eth show-tx {}".format(_TEST_HASH))
+    shell.run_line("ens hash test.eth")
+    assert shell.recent_values == ["test.eth", _TEST_HASH]
+
+
+def test_get_completions_completes_commands(shell):
+    assert shell.get_completions("", "e") == ["ens", "eth", "exit"]
+    assert shell.get_completions("eth ", "show-b") == ["show-balance", "show-block"]
+
+
+def test_get_completions_completes_options(shell):
+    assert "--block-num" in shell.get_completions("eth show-block ", "--")
+
+
+def test_get_completions_completes_recent_values(shell):
+    shell.run_line("eth show-tx {}".format(_TEST_HASH))
+    assert shell.get_completions("eth show-tx ", "0x8f") == [_TEST_HASH]
+
+
+def test_get_completions_completes_account_names(mocker, shell, account):
+    mocker.patch("in3cli.account.get_all_accounts").return_value = [account]
+    assert shell.get_completions("eth show-balance --account ", "test") == [account.name]
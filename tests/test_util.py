@@ -1,7 +1,12 @@
 import json
 
+import pytest
+
 from in3cli.model import create_node_dict
+from in3cli.util import convert_date_str_to_timestamp
 from in3cli.util import convert_dict_to_json
+from in3cli.util import eth_to_wei
+from in3cli.util import wei_to_eth
 from in3cli.util import wei_to_gwei
 
 import tests.conftest as tconf
@@ -11,8 +16,43 @@ def test_wei_to_gwei():
     assert wei_to_gwei(1000000000000000000) == 1000000000
 
 
+def test_wei_to_eth():
+    assert wei_to_eth(1000000000000000000) == 1
+
+
+def test_eth_to_wei_keeps_every_digit():
+    assert eth_to_wei("0.1") == 100000000000000000
+    assert eth_to_wei("12.345678901234567891") == 12345678901234567891
+
+
+@pytest.mark.parametrize("eth", ["abc", "0.0000000000000000001", "inf"])
+def test_eth_to_wei_when_not_whole_number_of_wei_raises_error(eth):
+    with pytest.raises(ValueError):
+        eth_to_wei(eth)
+
+
 def test_convert_dict_to_json_works_for_nodes():
     node = tconf.create_test_node()
     node_dict = create_node_dict(node)
     json_dict = convert_dict_to_json(node_dict)
     assert json.loads(json_dict)
+
+
+@pytest.mark.parametrize(
+    "date_str",
+    [
+        "2026-01-01T00:00:00Z",
+        "2026-01-01",
+        "2026-01-01 00:00:00",
+        "2026-01-01T02:00:00+02:00",
+        "2025-12-31T19:00-0500",
+        "1767225600",
+    ],
+)
+def test_convert_date_str_to_timestamp(date_str):
+    assert convert_date_str_to_timestamp(date_str) == 1767225600
+
+
+def test_convert_date_str_to_timestamp_when_invalid_raises_value_error():
+    with pytest.raises(ValueError):
+        convert_date_str_to_timestamp("yesterday")